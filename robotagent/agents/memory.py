@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+
+from robotagent.utils.tokens import count_tokens
+
+_SUMMARY_PROMPT = (
+    "You maintain a running summary of a robot operator session.\n"
+    "Update the summary with the new turns. Keep object names, locations, "
+    "pending tasks and safety constraints; drop small talk.\n"
+    "Answer with the updated summary only, in at most {max_tokens} tokens.\n\n"
+    "Current summary:\n{summary}\n\nNew turns:\n{turns}"
+)
+
+
+class ConversationTurn:
+    __slots__ = ("content", "role", "tokens")
+
+    def __init__(self, role: str, content: str, tokens: int):
+        self.role = role
+        self.content = content
+        self.tokens = tokens
+
+    def render(self) -> str:
+        return f"{self.role}: {self.content}"
+
+
+class SessionMemory:
+    def __init__(self) -> None:
+        self.turns: deque[ConversationTurn] = deque()
+        self.pending: deque[ConversationTurn] = deque()
+        self.fold_lock = threading.Lock()
+        self.window_tokens = 0
+        self.summary = ""
+        self.summary_tokens = 0
+        self.history_tokens = 0
+        self.folded_turns = 0
+
+
+class ConversationMemory:
+    def __init__(
+        self,
+        summarizer: BaseChatModel | None = None,
+        *,
+        max_context_tokens: int = 2000,
+        max_summary_tokens: int = 400,
+        max_turns: int = 64,
+        max_sessions: int = 1024,
+        fold_batch: int = 4,
+        token_counter: Callable[[str], int] = count_tokens,
+    ):
+        if max_summary_tokens >= max_context_tokens:
+            raise ValueError("max_summary_tokens must be smaller than max_context_tokens")
+        self.summarizer = summarizer
+        self.max_context_tokens = max_context_tokens
+        self.max_summary_tokens = max_summary_tokens
+        self.max_turns = max_turns
+        self.max_sessions = max_sessions
+        self.fold_batch = max(1, fold_batch)
+        self.token_counter = token_counter
+        self._sessions: OrderedDict[str, SessionMemory] = OrderedDict()
+        self._lock = threading.RLock()
+        self._stats = {
+            "contexts_built": 0,
+            "context_tokens": 0,
+            "history_tokens": 0,
+            "tokens_saved": 0,
+            "summaries": 0,
+            "summary_failures": 0,
+            "sessions_evicted": 0,
+        }
+
+    def _session(self, session_id: str) -> SessionMemory:
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = SessionMemory()
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self._stats["sessions_evicted"] += 1
+        else:
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def add_turn(self, session_id: str, role: str, content: str) -> None:
+        content = str(content or "").strip()
+        if not content:
+            return
+        turn = ConversationTurn(role, content, self.token_counter(f"{role}: {content}"))
+        with self._lock:
+            session = self._session(session_id)
+            session.turns.append(turn)
+            session.window_tokens += turn.tokens
+            session.history_tokens += turn.tokens
+            evicted = self._enforce_budget(session)
+        if evicted:
+            self._fold(session)
+
+    def _window_budget(self, session: SessionMemory) -> int:
+        return self.max_context_tokens - min(session.summary_tokens, self.max_summary_tokens)
+
+    def _enforce_budget(self, session: SessionMemory) -> bool:
+        over_turns = len(session.turns) > self.max_turns
+        over_tokens = session.window_tokens > self._window_budget(session)
+        if not (over_turns or over_tokens):
+            return False
+        evicted: list[ConversationTurn] = []
+        while len(session.turns) > 1 and (
+            len(session.turns) > self.max_turns
+            or session.window_tokens > self._window_budget(session)
+            or len(evicted) < self.fold_batch
+        ):
+            turn = session.turns.popleft()
+            session.window_tokens -= turn.tokens
+            evicted.append(turn)
+        session.pending.extend(evicted)
+        return bool(evicted)
+
+    def _fold(self, session: SessionMemory) -> None:
+        with session.fold_lock:
+            with self._lock:
+                turns = list(session.pending)
+                previous = session.summary
+            if not turns:
+                return
+            rendered = "\n".join(turn.render() for turn in turns)
+            summary = None
+            if self.summarizer is not None:
+                prompt = _SUMMARY_PROMPT.format(
+                    max_tokens=self.max_summary_tokens,
+                    summary=previous or "(empty)",
+                    turns=rendered,
+                )
+                try:
+                    response = self.summarizer.invoke(prompt)
+                    summary = str(getattr(response, "content", "") or "").strip() or None
+                    outcome = "summaries"
+                except Exception:  # noqa: BLE001
+                    outcome = "summary_failures"
+                with self._lock:
+                    self._stats[outcome] += 1
+            if summary is None:
+                summary = f"{previous}\n{rendered}".strip()
+            summary = self._truncate(summary)
+            summary_tokens = self.token_counter(summary)
+            with self._lock:
+                for _ in turns:
+                    session.pending.popleft()
+                session.summary = summary
+                session.summary_tokens = summary_tokens
+                session.folded_turns += len(turns)
+
+    def _truncate(self, text: str) -> str:
+        if self.token_counter(text) <= self.max_summary_tokens:
+            return text
+        lines = text.splitlines()
+        while len(lines) > 1 and self.token_counter("\n".join(lines)) > self.max_summary_tokens:
+            lines.pop(0)
+        text = "\n".join(lines)
+        while text and self.token_counter(text) > self.max_summary_tokens:
+            text = text[len(text) // 8 + 1 :]
+        return text
+
+    def context(self, session_id: str) -> str:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return ""
+            self._sessions.move_to_end(session_id)
+            parts: list[str] = []
+            if session.summary:
+                parts.append(f"Conversation summary:\n{session.summary}")
+            recent = [*session.pending, *session.turns]
+            if recent:
+                parts.append("Recent turns:\n" + "\n".join(turn.render() for turn in recent))
+            pending_tokens = sum(turn.tokens for turn in session.pending)
+            context_tokens = session.summary_tokens + session.window_tokens + pending_tokens
+            self._stats["contexts_built"] += 1
+            self._stats["context_tokens"] += context_tokens
+            self._stats["history_tokens"] += session.history_tokens
+            self._stats["tokens_saved"] += max(0, session.history_tokens - context_tokens)
+            return "\n\n".join(parts)
+
+    def build_prompt(self, session_id: str, text: str) -> str:
+        context = self.context(session_id)
+        if not context:
+            return text
+        return f"{context}\n\nCurrent command:\n{text}"
+
+    def clear(self, session_id: str | None = None) -> None:
+        with self._lock:
+            if session_id is None:
+                self._sessions.clear()
+            else:
+                self._sessions.pop(session_id, None)
+
+    def session_stats(self, session_id: str) -> dict[str, int] | None:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            return {
+                "turns": len(session.turns),
+                "window_tokens": session.window_tokens,
+                "summary_tokens": session.summary_tokens,
+                "history_tokens": session.history_tokens,
+                "folded_turns": session.folded_turns,
+            }
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            stats: dict[str, Any] = dict(self._stats)
+            stats["sessions"] = len(self._sessions)
+        history = stats["history_tokens"]
+        stats["saved_ratio"] = stats["tokens_saved"] / history if history else 0.0
+        return stats
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from langchain_core.documents import Document
+
+from robotagent.storage.filters import MetadataFilter
+from robotagent.storage.vector_store import VectorStore
+
+_current: ContextVar[PrefetchHandle | None] = ContextVar("robotagent_prefetch", default=None)
+
+
+def current_prefetch() -> PrefetchHandle | None:
+    return _current.get()
+
+
+class PrefetchHandle:
+    def __init__(self, queries: Sequence[str], future: Future, cancelled: threading.Event, timeout: float):
+        self.queries = list(queries)
+        self.future = future
+        self.timeout = timeout
+        self._cancelled = cancelled
+        self._used = False
+
+    @property
+    def used(self) -> bool:
+        return self._used
+
+    def results(self, timeout: float | None = None) -> dict[str, list[Document]]:
+        self._used = True
+        try:
+            return self.future.result(timeout=self.timeout if timeout is None else timeout)
+        except Exception:  # noqa: BLE001
+            return {}
+
+    def documents(self, timeout: float | None = None) -> list[Document]:
+        seen: set[str] = set()
+        documents: list[Document] = []
+        for hits in self.results(timeout).values():
+            for doc in hits:
+                key = str(doc.id or doc.page_content)
+                if key not in seen:
+                    seen.add(key)
+                    documents.append(doc)
+        return documents
+
+    def render(self, timeout: float | None = None, max_documents: int = 8) -> str:
+        return "\n\n".join(doc.page_content for doc in self.documents(timeout)[:max_documents])
+
+    def cancel(self) -> bool:
+        self._cancelled.set()
+        return self.future.cancel()
+
+
+class RetrievalPrefetcher:
+    def __init__(
+        self,
+        vector_store: VectorStore,
+        *,
+        k: int = 4,
+        filter: MetadataFilter | None = None,
+        timeout: float = 2.0,
+        max_workers: int = 4,
+        entity_extractor: Callable[[str], Sequence[str]] | None = None,
+    ):
+        self.vector_store = vector_store
+        self.k = k
+        self.filter = filter
+        self.timeout = timeout
+        self.entity_extractor = entity_extractor
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="retrieval-prefetch")
+        self._lock = threading.Lock()
+        self._stats = {"started": 0, "used": 0, "cancelled": 0, "failed": 0}
+
+    def _record(self, **deltas: int) -> None:
+        with self._lock:
+            for key, value in deltas.items():
+                self._stats[key] += value
+
+    def queries(self, text: str) -> list[str]:
+        queries = [text.strip()] if text.strip() else []
+        if self.entity_extractor is not None:
+            for entity in self.entity_extractor(text):
+                if entity and entity not in queries:
+                    queries.append(entity)
+        return queries
+
+    def _run(self, queries: list[str], cancelled: threading.Event, **kwargs: Any) -> dict[str, list[Document]]:
+        if cancelled.is_set():
+            return {}
+        try:
+            results = self.vector_store.similarity_search_batch(queries, self.k, self.filter, **kwargs)
+        except Exception:
+            self._record(failed=1)
+            raise
+        return dict(zip(queries, results))
+
+    def start(self, text: str, **kwargs: Any) -> PrefetchHandle:
+        queries = self.queries(text)
+        cancelled = threading.Event()
+        if queries:
+            future = self._executor.submit(self._run, queries, cancelled, **kwargs)
+        else:
+            future = Future()
+            future.set_result({})
+        self._record(started=1)
+        return PrefetchHandle(queries, future, cancelled, self.timeout)
+
+    def finish(self, handle: PrefetchHandle) -> None:
+        if handle.used:
+            self._record(used=1)
+        else:
+            handle.cancel()
+            self._record(cancelled=1)
+
+    @contextmanager
+    def prefetch(self, text: str, **kwargs: Any) -> Iterator[PrefetchHandle]:
+        handle = self.start(text, **kwargs)
+        token = _current.set(handle)
+        try:
+            yield handle
+        finally:
+            _current.reset(token)
+            self.finish(handle)
+
+    def metrics(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
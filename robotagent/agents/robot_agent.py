@@ -3,14 +3,19 @@ from pathlib import Path
 from langchain_core.language_models import BaseChatModel
 
 from deepagents import create_deep_agent
+from robotagent.agents.memory import ConversationMemory
+from robotagent.agents.prefetch import RetrievalPrefetcher
 from robotagent.agents.subagent import (
-    create_execution_subagent,
-    create_intent_subagent,
-    create_perception_subagent,
+    ExecutionAgent,
+    IntentRecognitionAgent,
+    PerceptionAgent,
+    PlanCache,
 )
 from robotagent.configs.settings import AgentConfig, LLMOverrideSettings, get_settings
 from robotagent.models.chat_model import create_chat_model
 from robotagent.prompts import build_prompt
+from robotagent.skills import SkillIndex
+from robotagent.storage.vector_store import VectorStore
 
 class RobotAgent:
     def _override_is_empty(self, override: LLMOverrideSettings | None) -> bool:
@@ -67,6 +72,10 @@ class RobotAgent:
         model: str | BaseChatModel | None = None,
         *,
         model_path: str | None = None,
+        memory: ConversationMemory | None = None,
+        skills: SkillIndex | None = None,
+        retriever: VectorStore | None = None,
+        use_memory: bool | None = None,
         **kwargs,
     ):
         settings = get_settings()
@@ -103,22 +112,35 @@ class RobotAgent:
         perception_group, perception_path = subagent_prompt("perception")
         execution_group, execution_path = subagent_prompt("execution")
 
+        self.intent_agent = IntentRecognitionAgent(
+            subagent_model("intent"),
+            prompt_group=intent_group,
+            prompt_path=intent_path,
+        )
+        self.perception_agent = PerceptionAgent(
+            subagent_model("perception"),
+            prompt_group=perception_group,
+            prompt_path=perception_path,
+        )
+        execution_config = agents.get("execution") or AgentConfig()
+        self.plan_cache: PlanCache | None = None
+        if execution_config.plan_cache_size > 0:
+            self.plan_cache = PlanCache(
+                max_size=execution_config.plan_cache_size,
+                ttl=execution_config.plan_cache_ttl,
+                intent_fn=lambda text: self.intent_agent._heuristic_intent(text)[0],
+                entity_fn=lambda text: self.perception_agent._heuristic_perception(text)[0],
+            )
+        self.execution_agent = ExecutionAgent(
+            subagent_model("execution"),
+            prompt_group=execution_group,
+            prompt_path=execution_path,
+            plan_cache=self.plan_cache or False,
+        )
         subagents = [
-            create_intent_subagent(
-                subagent_model("intent"),
-                prompt_group=intent_group,
-                prompt_path=intent_path,
-            ),
-            create_perception_subagent(
-                subagent_model("perception"),
-                prompt_group=perception_group,
-                prompt_path=perception_path,
-            ),
-            create_execution_subagent(
-                subagent_model("execution"),
-                prompt_group=execution_group,
-                prompt_path=execution_path,
-            ),
+            self.intent_agent.as_subagent(),
+            self.perception_agent.as_subagent(),
+            self.execution_agent.as_subagent(),
         ]
         system_prompt = kwargs.pop("system_prompt", None)
         if system_prompt is None:
@@ -136,6 +158,31 @@ class RobotAgent:
                 system_prompt = (
                     "You are a robot control agent. Use subagents for intent, perception, and execution planning."
                 )
+        self.skills: SkillIndex | None = None
+        self.skills_top_k = main_config.skills_top_k
+        if main_config.use_skills:
+            self.skills = skills or SkillIndex.load()
+            descriptors = self.skills.descriptors()
+            if descriptors:
+                system_prompt = f"{system_prompt}\n\nAvailable skills:\n{descriptors}"
+        self.memory: ConversationMemory | None = None
+        use_memory = main_config.use_memory if use_memory is None else use_memory
+        if use_memory:
+            self.memory = memory or ConversationMemory(
+                subagent_model("memory"),
+                max_context_tokens=main_config.memory_max_tokens,
+                max_summary_tokens=main_config.memory_summary_tokens,
+                max_turns=main_config.memory_max_turns,
+                max_sessions=main_config.memory_max_sessions,
+            )
+        self.prefetcher: RetrievalPrefetcher | None = None
+        if retriever is not None:
+            self.prefetcher = RetrievalPrefetcher(
+                retriever,
+                k=main_config.prefetch_top_k,
+                timeout=main_config.prefetch_timeout,
+                entity_extractor=lambda text: self.perception_agent._heuristic_perception(text)[0],
+            )
         self.deep_agent = create_deep_agent(
             model=base_model,
             subagents=subagents,
@@ -143,5 +190,27 @@ class RobotAgent:
             **kwargs,
         )
 
-    def __call__(self, text: str) -> str:
-        return self.deep_agent(text)
+    def _with_skills(self, text: str, prompt: str) -> str:
+        if self.skills is None:
+            return prompt
+        selected = self.skills.render(text, self.skills_top_k)
+        if not selected:
+            return prompt
+        return f"{selected}\n\n{prompt}"
+
+    def warmup(self, text: str) -> None:
+        self.deep_agent(text)
+
+    def __call__(self, text: str, session_id: str | None = None) -> str:
+        if self.prefetcher is None:
+            return self._run(text, session_id)
+        with self.prefetcher.prefetch(text):
+            return self._run(text, session_id)
+
+    def _run(self, text: str, session_id: str | None = None) -> str:
+        if self.memory is None or session_id is None:
+            return self.deep_agent(self._with_skills(text, text))
+        result = self.deep_agent(self._with_skills(text, self.memory.build_prompt(session_id, text)))
+        self.memory.add_turn(session_id, "user", text)
+        self.memory.add_turn(session_id, "assistant", str(getattr(result, "content", result)))
+        return result
@@ -1,8 +1,13 @@
-from robotagent.agents.subagent.intent_agent import create_intent_subagent
-from robotagent.agents.subagent.perception_agent import create_perception_subagent
-from robotagent.agents.subagent.execution_agent import create_execution_subagent
+from robotagent.agents.subagent.intent_agent import IntentRecognitionAgent, create_intent_subagent
+from robotagent.agents.subagent.perception_agent import PerceptionAgent, create_perception_subagent
+from robotagent.agents.subagent.execution_agent import ExecutionAgent, create_execution_subagent
+from robotagent.agents.subagent.plan_cache import PlanCache
 
 __all__ = [
+    "ExecutionAgent",
+    "IntentRecognitionAgent",
+    "PerceptionAgent",
+    "PlanCache",
     "create_intent_subagent",
     "create_perception_subagent",
     "create_execution_subagent",
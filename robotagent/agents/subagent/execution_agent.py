@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 from typing import Any, TypedDict
 
 from langchain_core.language_models import BaseChatModel
@@ -7,6 +8,7 @@ from langgraph.graph import END, StateGraph
 
 from deepagents.middleware.subagents import SubAgent
 
+from robotagent.agents.prefetch import current_prefetch
 from robotagent.agents.subagent.common import (
     build_subagent,
     extract_json_object,
@@ -15,6 +17,9 @@ from robotagent.agents.subagent.common import (
     normalize_text,
     pick_first_str,
 )
+from robotagent.agents.subagent.intent_agent import IntentRecognitionAgent
+from robotagent.agents.subagent.perception_agent import PerceptionAgent
+from robotagent.agents.subagent.plan_cache import PlanCache
 from robotagent.prompts import build_prompt
 
 
@@ -32,10 +37,18 @@ class ExecutionAgent:
         *,
         prompt_group: str | None = None,
         prompt_path: str | None = None,
+        plan_cache: PlanCache | bool = False,
     ):
         self.model = model
         self.prompt_group = prompt_group
         self.prompt_path = prompt_path
+        if plan_cache is True:
+            plan_cache = PlanCache(
+                intent_fn=lambda text: IntentRecognitionAgent._heuristic_intent(text)[0],
+                entity_fn=lambda text: PerceptionAgent._heuristic_perception(text)[0],
+            )
+        self.plan_cache = plan_cache or None
+        self._prompt_digest: str | None = None
         self.graph = self._build_graph().compile()
 
     def _build_graph(self) -> StateGraph:
@@ -49,17 +62,39 @@ class ExecutionAgent:
         text = state.get("input", "")
         plan, actions = self._heuristic_plan(text)
         if self.model is not None:
-            model_result = self._model_plan(text)
-            if model_result is not None:
-                raw_plan = model_result.get("plan", plan)
-                raw_actions = model_result.get("actions", actions)
-                if isinstance(raw_plan, list):
-                    plan = [pick_first_str(item) for item in raw_plan if pick_first_str(item)]
-                if isinstance(raw_actions, list):
-                    actions = [pick_first_str(item) for item in raw_actions if pick_first_str(item)]
+            cached = self._cached_plan(text)
+            if cached is not None:
+                plan, actions = cached
+            else:
+                model_result = self._model_plan(text)
+                if model_result is not None:
+                    raw_plan = model_result.get("plan", plan)
+                    raw_actions = model_result.get("actions", actions)
+                    if isinstance(raw_plan, list):
+                        plan = [pick_first_str(item) for item in raw_plan if pick_first_str(item)]
+                    if isinstance(raw_actions, list):
+                        actions = [pick_first_str(item) for item in raw_actions if pick_first_str(item)]
+                    if self.plan_cache is not None:
+                        self.plan_cache.put(text, plan, actions)
         output = f"plan={plan}; actions={actions}"
         return {**state, "plan": plan, "actions": actions, "output": output}
 
+    def _cached_plan(self, text: str) -> tuple[list[str], list[str]] | None:
+        if self.plan_cache is None:
+            return None
+        self.plan_cache.ensure_version(self._prompt_version())
+        return self.plan_cache.get(text)
+
+    def _prompt_version(self) -> str:
+        if self._prompt_digest is None:
+            self._prompt_digest = hashlib.sha1(self._render_prompt("{input}").encode("utf-8")).hexdigest()
+        return self._prompt_digest
+
+    def reload_prompt(self) -> None:
+        self._prompt_digest = None
+        if self.plan_cache is not None:
+            self.plan_cache.ensure_version(self._prompt_version())
+
     def _model_plan(self, text: str) -> dict[str, Any] | None:
         prompt = self._build_prompt(text)
         try:
@@ -69,6 +104,16 @@ class ExecutionAgent:
         return extract_json_object(getattr(response, "content", "") or "")
 
     def _build_prompt(self, text: str) -> str:
+        prompt = self._render_prompt(text)
+        prefetch = current_prefetch()
+        if prefetch is None:
+            return prompt
+        context = prefetch.render()
+        if not context:
+            return prompt
+        return f"Reference context:\n{context}\n\n{prompt}"
+
+    def _render_prompt(self, text: str) -> str:
         if self.prompt_path:
             content = load_prompt_file(self.prompt_path)
             if content:
@@ -117,9 +162,11 @@ def create_execution_subagent(
     *,
     prompt_group: str | None = None,
     prompt_path: str | None = None,
+    plan_cache: PlanCache | bool = False,
 ) -> SubAgent:
     return ExecutionAgent(
         model=model,
         prompt_group=prompt_group,
         prompt_path=prompt_path,
+        plan_cache=plan_cache,
     ).as_subagent()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import re
+import threading
+from collections.abc import Callable, Hashable, Sequence
+
+from robotagent.agents.subagent.common import normalize_text
+from robotagent.utils.lru import LRUCache
+
+_SLOT = re.compile(r"\{slot(\d+)\}")
+
+
+def _entity_pattern(entity: str) -> re.Pattern:
+    escaped = re.escape(entity)
+    if entity.isascii():
+        escaped = rf"\b{escaped}\b"
+    return re.compile(escaped, re.IGNORECASE)
+
+
+def command_template(text: str, entities: Sequence[str]) -> tuple[str, list[str]]:
+    template = " ".join(normalize_text(text).split())
+    matches: dict[str, int] = {}
+    for entity in {entity.lower() for entity in entities if entity}:
+        match = _entity_pattern(entity).search(template)
+        if match is not None:
+            matches[entity] = match.start()
+    slots: list[str] = []
+    for entity in sorted(matches, key=lambda entity: (matches[entity], -len(entity))):
+        template, count = _entity_pattern(entity).subn(f"{{slot{len(slots)}}}", template)
+        if count:
+            slots.append(entity)
+    return template, slots
+
+
+def _parameterize(steps: Sequence[str], slots: Sequence[str]) -> list[str] | None:
+    patterns = [
+        (entity, _entity_pattern(entity), f"{{slot{index}}}")
+        for index, entity in sorted(enumerate(slots), key=lambda item: -len(item[1]))
+    ]
+    parameterized: list[str] = []
+    for step in steps:
+        for entity, pattern, slot in patterns:
+            step = pattern.sub(slot, step)
+            if entity in step.lower():
+                return None
+        parameterized.append(step)
+    return parameterized
+
+
+def _instantiate(steps: Sequence[str], slots: Sequence[str]) -> list[str]:
+    def fill(match: re.Match) -> str:
+        index = int(match.group(1))
+        return slots[index] if index < len(slots) else match.group(0)
+
+    return [_SLOT.sub(fill, step) for step in steps]
+
+
+class PlanCache:
+    def __init__(
+        self,
+        *,
+        max_size: int = 256,
+        ttl: float | None = 3600.0,
+        intent_fn: Callable[[str], str] | None = None,
+        entity_fn: Callable[[str], Sequence[str]] | None = None,
+    ):
+        self.intent_fn = intent_fn
+        self.entity_fn = entity_fn
+        self.version: Hashable | None = None
+        self._plans = LRUCache(max_size, ttl)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "skipped": 0, "invalidations": 0}
+
+    def _key(self, text: str) -> tuple[tuple[str, str], list[str]]:
+        intent = self.intent_fn(text) if self.intent_fn is not None else ""
+        entities = self.entity_fn(text) if self.entity_fn is not None else []
+        template, slots = command_template(text, entities)
+        return (intent, template), slots
+
+    def ensure_version(self, version: Hashable) -> None:
+        with self._lock:
+            if version == self.version:
+                return
+            if self.version is not None:
+                self._plans.clear()
+                self._stats["invalidations"] += 1
+            self.version = version
+
+    def get(self, text: str) -> tuple[list[str], list[str]] | None:
+        key, slots = self._key(text)
+        with self._lock:
+            entry = self._plans.get(key)
+            self._stats["hits" if entry is not None else "misses"] += 1
+        if entry is None:
+            return None
+        plan, actions = entry
+        return _instantiate(plan, slots), _instantiate(actions, slots)
+
+    def put(self, text: str, plan: Sequence[str], actions: Sequence[str]) -> None:
+        key, slots = self._key(text)
+        entry = (_parameterize(plan, slots), _parameterize(actions, slots))
+        with self._lock:
+            if entry[0] is None or entry[1] is None:
+                self._stats["skipped"] += 1
+                return
+            self._plans.put(key, entry)
+            self._stats["stores"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+
+    def metrics(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._stats, "llm_calls_saved": self._stats["hits"], "size": len(self._plans)}
@@ -45,7 +45,16 @@ class AgentConfig(BaseModel):
     prompt_group: str | None = None
     prompt_path: str | None = None
     use_skills: bool = True
+    skills_top_k: int = 2
     use_memory: bool = True
+    memory_max_tokens: int = 2000
+    memory_summary_tokens: int = 400
+    memory_max_turns: int = 64
+    memory_max_sessions: int = 1024
+    prefetch_top_k: int = 4
+    prefetch_timeout: float = 2.0
+    plan_cache_size: int = 256
+    plan_cache_ttl: float | None = 3600.0
     model: LLMOverrideSettings = Field(default_factory=LLMOverrideSettings)
 
 
@@ -65,6 +74,37 @@ class LangfuseSettings(BaseModel):
 class StorageSettings(BaseModel):
     vector_store: str = "milvus"
     milvus_uri: str | None = None
+    milvus_token: str | None = None
+    milvus_db_name: str | None = None
+    milvus_collection: str = "robotagent"
+    milvus_lite_path: str = "data/milvus.db"
+    milvus_index_type: str = "HNSW"
+    milvus_metric_type: str = "COSINE"
+    milvus_index_params: dict[str, Any] = Field(default_factory=lambda: {"M": 16, "efConstruction": 200})
+    milvus_search_params: dict[str, Any] = Field(default_factory=lambda: {"ef": 64})
+    milvus_insert_batch_size: int = 512
+    milvus_consistency_level: str = "Bounded"
+    milvus_timeout: float | None = 30.0
+
+
+class TavilySettings(BaseModel):
+    api_key: str | None = None
+    base_url: str | None = None
+    max_results: int = 5
+    search_depth: str = "basic"
+    cache_ttl: float = 600.0
+    stale_ttl: float = 86400.0
+    cache_size: int = 1024
+    max_concurrency: int = 4
+    timeout: float = 10.0
+
+
+class ServeSettings(BaseModel):
+    host: str = "127.0.0.1"
+    port: int = 8000
+    workers: int = 4
+    max_queue_size: int = 256
+    request_timeout: float = 120.0
 
 
 class ConfigFileSettings(BaseModel):
@@ -75,6 +115,8 @@ class ConfigFileSettings(BaseModel):
     prompt: str | None = None
     langfuse: str | None = None
     storage: str | None = None
+    tavily: str | None = None
+    serve: str | None = None
 
 
 class AppSettings(BaseSettings):
@@ -84,6 +126,8 @@ class AppSettings(BaseSettings):
     prompt: PromptSettings = PromptSettings()
     langfuse: LangfuseSettings = LangfuseSettings()
     storage: StorageSettings = StorageSettings()
+    tavily: TavilySettings = TavilySettings()
+    serve: ServeSettings = ServeSettings()
     config: ConfigFileSettings = ConfigFileSettings()
 
     model_config = SettingsConfigDict(
@@ -137,7 +181,7 @@ def _apply_agents(settings: AppSettings, data: dict[str, Any]) -> AppSettings:
 
 
 def _merge_from_mapping(settings: AppSettings, data: dict[str, Any]) -> AppSettings:
-    for section in ("system", "llm", "prompt", "langfuse", "storage"):
+    for section in ("system", "llm", "prompt", "langfuse", "storage", "tavily", "serve"):
         value = data.get(section)
         if isinstance(value, dict):
             settings = _apply_section(settings, section, value)
@@ -243,6 +287,17 @@ def _apply_env_overrides(settings: AppSettings) -> AppSettings:
         updated_langfuse = settings.langfuse.model_copy(update=langfuse_updates)
         settings = settings.model_copy(update={"langfuse": updated_langfuse})
 
+    tavily_updates: dict[str, Any] = {}
+    env = os.getenv("TAVILY_API_KEY")
+    if env:
+        tavily_updates["api_key"] = env
+    env = os.getenv("TAVILY_BASE_URL")
+    if env:
+        tavily_updates["base_url"] = env
+    if tavily_updates:
+        updated_tavily = settings.tavily.model_copy(update=tavily_updates)
+        settings = settings.model_copy(update={"tavily": updated_tavily})
+
     return settings
 
 
@@ -261,6 +316,10 @@ def _apply_file_overrides(settings: AppSettings) -> AppSettings:
         settings = _merge_from_file(settings, settings.config.langfuse, "langfuse")
     if settings.config.storage:
         settings = _merge_from_file(settings, settings.config.storage, "storage")
+    if settings.config.tavily:
+        settings = _merge_from_file(settings, settings.config.tavily, "tavily")
+    if settings.config.serve:
+        settings = _merge_from_file(settings, settings.config.serve, "serve")
     return settings
 
 
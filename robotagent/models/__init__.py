@@ -3,14 +3,18 @@ from .chat_model import (
     ChatModel,
     create_chat_model,
 )
+from .embedding_cache import CachedEmbeddingModel
+from .embedding_executor import EmbeddingExecutor
 from .embedding_model import (
     EmbeddingModel,
     create_embedding_model,
 )
 
 __all__ = [
+    "CachedEmbeddingModel",
     "ChatModel",
     "create_chat_model",
+    "EmbeddingExecutor",
     "EmbeddingModel",
     "create_embedding_model",
 ]
\ No newline at end of file
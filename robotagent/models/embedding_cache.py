@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from langchain.embeddings import Embeddings as EmbeddingModel
+
+from robotagent.models.embedding_model import embed_query_batch, has_symmetric_queries
+from robotagent.utils.lru import LRUCache
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key TEXT PRIMARY KEY,
+    dim INTEGER NOT NULL,
+    vector BLOB NOT NULL
+)
+"""
+
+
+def content_key(model_id: str, text: str) -> str:
+    digest = hashlib.sha256()
+    digest.update(model_id.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _pack(vector: Sequence[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> list[float]:
+    values = array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+class _SQLiteTier:
+    def __init__(self, path: str | Path, timeout: float = 30.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute(_SCHEMA)
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, list[float]]:
+        found: dict[str, list[float]] = {}
+        conn = self._connection()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                chunk,
+            )
+            for key, blob in rows:
+                found[key] = _unpack(blob)
+        return found
+
+    def put_many(self, items: dict[str, list[float]]) -> None:
+        if not items:
+            return
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, dim, vector) VALUES (?, ?, ?)",
+                [(key, len(vector), _pack(vector)) for key, vector in items.items()],
+            )
+
+    def count(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+
+class CachedEmbeddingModel(EmbeddingModel):
+    def __init__(
+        self,
+        embedding: EmbeddingModel,
+        model_id: str,
+        *,
+        cache_path: str | Path | None = None,
+        memory_size: int = 10_000,
+        symmetric_queries: bool | None = None,
+    ):
+        self.embedding = embedding
+        self.model_id = model_id
+        self.symmetric_queries = has_symmetric_queries(embedding) if symmetric_queries is None else symmetric_queries
+        self._memory = LRUCache(memory_size)
+        self._disk = _SQLiteTier(cache_path) if cache_path else None
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    def _count(self, **deltas: int) -> None:
+        with self._stats_lock:
+            for key, value in deltas.items():
+                self._stats[key] += value
+
+    def _lookup(self, keys: list[str]) -> dict[str, list[float]]:
+        found: dict[str, list[float]] = {}
+        for key in keys:
+            vector = self._memory.get(key)
+            if vector is not None:
+                found[key] = list(vector)
+        memory_hits = len(found)
+        missing = [key for key in keys if key not in found]
+        disk_hits = 0
+        if missing and self._disk is not None:
+            from_disk = self._disk.get_many(missing)
+            for key, vector in from_disk.items():
+                self._memory.put(key, tuple(vector))
+            found.update(from_disk)
+            disk_hits = len(from_disk)
+        self._count(memory_hits=memory_hits, disk_hits=disk_hits)
+        return found
+
+    def _store(self, items: dict[str, list[float]]) -> None:
+        for key, vector in items.items():
+            self._memory.put(key, tuple(vector))
+        if self._disk is not None:
+            self._disk.put_many(items)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys = [content_key(self.model_id, text) for text in texts]
+        unique = list(dict.fromkeys(keys))
+        found = self._lookup(unique)
+        missing = [key for key in unique if key not in found]
+        if missing:
+            first_text = dict(zip(keys, texts))
+            vectors = self.embedding.embed_documents([first_text[key] for key in missing])
+            computed = {key: list(vector) for key, vector in zip(missing, vectors)}
+            self._store(computed)
+            found.update(computed)
+        self._count(requests=len(texts), misses=len(missing))
+        return [list(found[key]) for key in keys]
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        keys = [content_key(f"{self.model_id}#query", text) for text in texts]
+        unique = list(dict.fromkeys(keys))
+        found = self._lookup(unique)
+        missing = [key for key in unique if key not in found]
+        if missing:
+            first_text = dict(zip(keys, texts))
+            if self.symmetric_queries:
+                vectors = self.embedding.embed_documents([first_text[key] for key in missing])
+            else:
+                vectors = embed_query_batch(self.embedding, [first_text[key] for key in missing])
+            computed = {key: list(vector) for key, vector in zip(missing, vectors)}
+            self._store(computed)
+            found.update(computed)
+        self._count(requests=len(texts), misses=len(missing))
+        return [list(found[key]) for key in keys]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_queries([text])[0]
+
+    def metrics(self) -> dict[str, Any]:
+        with self._stats_lock:
+            stats: dict[str, Any] = dict(self._stats)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        stats["memory_entries"] = len(self._memory)
+        return stats
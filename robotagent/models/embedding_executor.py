@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Literal
+
+from langchain.embeddings import Embeddings as EmbeddingModel
+
+from robotagent.models.embedding_model import has_symmetric_queries
+from robotagent.utils.tokens import count_tokens
+
+_SIZE_ERROR = re.compile(
+    r"too (long|large|big|many)|maximum (context|input|batch)|max(imum)?[ _]tokens|token limit|batch size|payload",
+    re.IGNORECASE,
+)
+_TRANSIENT_STATUS = {408, 409, 425}
+
+
+def _status_code(error: BaseException) -> int | None:
+    for source in (error, getattr(error, "response", None)):
+        for attribute in ("status_code", "status", "http_status"):
+            code = getattr(source, attribute, None)
+            if isinstance(code, int):
+                return code
+    return None
+
+
+def _retry_after(error: BaseException) -> float | None:
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return max(0.0, float(headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(error: BaseException) -> Literal["size", "rate_limit", "transient", "fatal"]:
+    status = _status_code(error)
+    name = type(error).__name__.lower()
+    if status == 413 or (status in (None, 400, 422) and _SIZE_ERROR.search(str(error))):
+        return "size"
+    if status == 429 or "ratelimit" in name:
+        return "rate_limit"
+    if status is not None:
+        return "transient" if status >= 500 or status in _TRANSIENT_STATUS else "fatal"
+    if isinstance(error, (TimeoutError, ConnectionError)) or "timeout" in name or "connection" in name:
+        return "transient"
+    return "fatal"
+
+
+class RateLimiter:
+    def __init__(self, requests_per_minute: float | None = None, tokens_per_minute: float | None = None):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests: deque[float] = deque()
+        self._tokens: deque[tuple[float, int]] = deque()
+        self._token_total = 0
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float) -> None:
+        while self._requests and now - self._requests[0] >= 60.0:
+            self._requests.popleft()
+        while self._tokens and now - self._tokens[0][0] >= 60.0:
+            self._token_total -= self._tokens.popleft()[1]
+
+    def acquire(self, tokens: int = 0) -> None:
+        if self.requests_per_minute is None and self.tokens_per_minute is None:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._prune(now)
+                wait_for = 0.0
+                if self.requests_per_minute is not None and len(self._requests) >= self.requests_per_minute:
+                    wait_for = max(wait_for, 60.0 - (now - self._requests[0]))
+                if (
+                    self.tokens_per_minute is not None
+                    and self._tokens
+                    and self._token_total + tokens > self.tokens_per_minute
+                ):
+                    wait_for = max(wait_for, 60.0 - (now - self._tokens[0][0]))
+                if wait_for <= 0:
+                    self._requests.append(now)
+                    self._tokens.append((now, tokens))
+                    self._token_total += tokens
+                    return
+            time.sleep(min(wait_for, 1.0))
+
+
+class EmbeddingExecutor(EmbeddingModel):
+    def __init__(
+        self,
+        embedding: EmbeddingModel,
+        *,
+        max_batch_tokens: int = 8192,
+        min_batch_tokens: int = 256,
+        initial_batch_tokens: int | None = None,
+        max_batch_size: int = 256,
+        max_concurrency: int = 4,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        target_latency: float = 2.0,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        token_counter: Callable[[str], int] = count_tokens,
+        symmetric_queries: bool | None = None,
+    ):
+        if min_batch_tokens > max_batch_tokens:
+            raise ValueError("min_batch_tokens must not exceed max_batch_tokens")
+        self.embedding = embedding
+        self.symmetric_queries = has_symmetric_queries(embedding) if symmetric_queries is None else symmetric_queries
+        self.max_batch_tokens = max_batch_tokens
+        self.min_batch_tokens = min_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.max_concurrency = max(1, max_concurrency)
+        self.target_latency = target_latency
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.token_counter = token_counter
+        self.rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self._budget = float(initial_batch_tokens or max(min_batch_tokens, max_batch_tokens // 4))
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "texts": 0,
+            "tokens": 0,
+            "splits": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "failures": 0,
+            "latency_total": 0.0,
+        }
+
+    @property
+    def batch_tokens(self) -> int:
+        return int(self._budget)
+
+    def _adapt(self, latency: float, tokens: int, failed: bool = False) -> None:
+        with self._lock:
+            if failed:
+                self._budget = max(self.min_batch_tokens, self._budget * 0.5)
+                return
+            if tokens < self._budget * 0.5:
+                return
+            if latency > self.target_latency:
+                self._budget = max(self.min_batch_tokens, self._budget * 0.7)
+            elif latency < self.target_latency * 0.5:
+                self._budget = min(self.max_batch_tokens, self._budget * 1.25)
+
+    def _record(self, **deltas: float) -> None:
+        with self._lock:
+            for key, value in deltas.items():
+                self._stats[key] += value
+
+    def _next_batch(self, order: deque[int], counts: list[int]) -> list[int]:
+        budget = self.batch_tokens
+        batch: list[int] = []
+        used = 0
+        while order and len(batch) < self.max_batch_size:
+            cost = counts[order[0]]
+            if batch and used + cost > budget:
+                break
+            batch.append(order.popleft())
+            used += cost
+        return batch
+
+    def _call(self, texts: list[str], tokens: int) -> list[list[float]]:
+        self.rate_limiter.acquire(tokens)
+        started = time.perf_counter()
+        vectors = self.embedding.embed_documents(texts)
+        latency = time.perf_counter() - started
+        if len(vectors) != len(texts):
+            msg = f"Embedding provider returned {len(vectors)} vectors for {len(texts)} texts"
+            raise RuntimeError(msg)
+        self._record(requests=1, texts=len(texts), tokens=tokens, latency_total=latency)
+        self._adapt(latency, tokens)
+        return vectors
+
+    def _run_batch(self, texts: list[str], counts: list[int]) -> list[list[float]]:
+        tokens = sum(counts)
+        attempt = 0
+        while True:
+            try:
+                return self._call(texts, tokens)
+            except Exception as e:
+                kind = classify_error(e)
+                if kind == "size" and len(texts) > 1:
+                    self._adapt(0.0, tokens, failed=True)
+                    self._record(splits=1)
+                    mid = len(texts) // 2
+                    return self._run_batch(texts[:mid], counts[:mid]) + self._run_batch(texts[mid:], counts[mid:])
+                if kind not in ("rate_limit", "transient") or attempt >= self.max_retries:
+                    self._record(failures=1)
+                    msg = f"Embedding failed after {attempt} retries: {e}"
+                    raise RuntimeError(msg) from e
+                attempt += 1
+                delay = self.retry_backoff * (2 ** (attempt - 1))
+                if kind == "rate_limit":
+                    delay = max(delay, _retry_after(e) or 0.0)
+                    self._record(rate_limited=1)
+                self._record(retries=1)
+                time.sleep(delay)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        counts = [max(1, self.token_counter(text)) for text in texts]
+        order = deque(range(len(texts)))
+        results: list[list[float] | None] = [None] * len(texts)
+        pending: dict[Future, list[int]] = {}
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="embed") as pool:
+            try:
+                while order or pending:
+                    while order and len(pending) < self.max_concurrency:
+                        batch = self._next_batch(order, counts)
+                        future = pool.submit(
+                            self._run_batch,
+                            [texts[i] for i in batch],
+                            [counts[i] for i in batch],
+                        )
+                        pending[future] = batch
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        batch = pending.pop(future)
+                        for index, vector in zip(batch, future.result()):
+                            results[index] = vector
+            finally:
+                for future in pending:
+                    future.cancel()
+        return results  # type: ignore[return-value]
+
+    def embed_query(self, text: str) -> list[float]:
+        self.rate_limiter.acquire(self.token_counter(text))
+        self._record(requests=1, texts=1)
+        return self.embedding.embed_query(text)
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            stats: dict[str, Any] = dict(self._stats)
+            stats["batch_tokens"] = int(self._budget)
+        requests = stats["requests"]
+        stats["mean_latency_s"] = stats.pop("latency_total") / requests if requests else 0.0
+        return stats
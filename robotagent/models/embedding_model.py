@@ -1,15 +1,60 @@
+from collections.abc import Mapping, Sequence
+from pathlib import Path
 from typing import Any
 
 from langchain.embeddings import init_embeddings
 from langchain.embeddings import Embeddings as EmbeddingModel
 
+_SYMMETRIC_EMBEDDINGS = {"AzureOpenAIEmbeddings", "MistralAIEmbeddings", "OllamaEmbeddings", "OpenAIEmbeddings"}
+
+
+def has_symmetric_queries(embedding: EmbeddingModel) -> bool:
+    symmetric = getattr(embedding, "symmetric_queries", None)
+    if isinstance(symmetric, bool):
+        return symmetric
+    return type(embedding).__name__ in _SYMMETRIC_EMBEDDINGS
+
+
+def embed_query_batch(embedding: EmbeddingModel, texts: Sequence[str]) -> list[list[float]]:
+    if not texts:
+        return []
+    embed_queries = getattr(embedding, "embed_queries", None)
+    if callable(embed_queries):
+        return embed_queries(list(texts))
+    if has_symmetric_queries(embedding):
+        return embedding.embed_documents(list(texts))
+    return [embedding.embed_query(text) for text in texts]
+
+
 def create_embedding_model(
         model: str,
         provider: str | None = None,
+        *,
+        cache_path: str | Path | None = None,
+        cache_size: int | None = None,
+        executor: bool | Mapping[str, Any] = False,
         **kwargs: Any,
 ) -> EmbeddingModel:
-    return init_embeddings(
+    embedding = init_embeddings(
         model=model,
         provider=provider,
         **kwargs
     )
+    if executor:
+        from robotagent.models.embedding_executor import EmbeddingExecutor
+
+        embedding = EmbeddingExecutor(embedding, **(executor if isinstance(executor, Mapping) else {}))
+    if cache_path is None and (cache_size or 0) <= 0:
+        return embedding
+    if cache_size is None:
+        cache_size = 10_000
+
+    from robotagent.models.embedding_cache import CachedEmbeddingModel
+
+    model_id = f"{provider}:{model}" if provider else model
+    return CachedEmbeddingModel(
+        embedding,
+        model_id,
+        cache_path=cache_path,
+        memory_size=cache_size,
+    )
@@ -2,10 +2,26 @@ from .document_loader import (
     Document,
     DocumentLoader,
 )
+from .indexer import (
+    FingerprintStore,
+    IncrementalIndexer,
+)
+from .pipeline import (
+    IngestionPipeline,
+    IngestionStats,
+)
+from .streaming_splitter import StreamingTextSplitter
 from .text_splitter import TextSplitter
+from .token_splitter import TokenBudgetTextSplitter
 
 __all__ = [
     "Document",
     "DocumentLoader",
+    "FingerprintStore",
+    "IncrementalIndexer",
+    "IngestionPipeline",
+    "IngestionStats",
+    "StreamingTextSplitter",
     "TextSplitter",
+    "TokenBudgetTextSplitter",
 ]
\ No newline at end of file
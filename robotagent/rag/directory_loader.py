@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any
+
+from langchain_community.document_loaders import (
+    BSHTMLLoader,
+    CSVLoader,
+    JSONLoader,
+)
+from langchain_community.document_loaders.base import BaseLoader
+from langchain_core.documents import Document
+
+_EXTENSION_KINDS = {
+    ".csv": "csv",
+    ".json": "json",
+    ".jsonl": "jsonl",
+    ".html": "html",
+    ".htm": "html",
+}
+
+
+def _load_file(path: str, kind: str, options: dict[str, Any]) -> list[Document]:
+    if kind == "csv":
+        loader: BaseLoader = CSVLoader(file_path=path, **options)
+    elif kind in ("json", "jsonl"):
+        kwargs = {"jq_schema": ".", "text_content": False, **options}
+        if kind == "jsonl":
+            kwargs.setdefault("json_lines", True)
+        loader = JSONLoader(file_path=path, **kwargs)
+    elif kind == "html":
+        loader = BSHTMLLoader(file_path=path, **options)
+    else:
+        msg = f"Unsupported file type: {path}"
+        raise ValueError(msg)
+    return loader.load()
+
+
+class DirectoryLoader(BaseLoader):
+    def __init__(
+        self,
+        path: str | Path,
+        glob: str = "**/*",
+        *,
+        max_workers: int | None = None,
+        max_pending: int | None = None,
+        csv_kwargs: dict[str, Any] | None = None,
+        json_kwargs: dict[str, Any] | None = None,
+        html_kwargs: dict[str, Any] | None = None,
+        raise_on_error: bool = False,
+    ) -> None:
+        self.path = Path(path)
+        self.glob = glob
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 2
+        self.options = {
+            "csv": dict(csv_kwargs or {}),
+            "json": dict(json_kwargs or {}),
+            "jsonl": dict(json_kwargs or {}),
+            "html": dict(html_kwargs or {}),
+        }
+        self.raise_on_error = raise_on_error
+        self._reset_report()
+
+    def _reset_report(self) -> None:
+        self.files_total = 0
+        self.files_loaded = 0
+        self.files_skipped = 0
+        self.documents = 0
+        self.errors: list[tuple[str, str]] = []
+        self._started: float | None = None
+        self._finished: float | None = None
+
+    def _iter_files(self) -> Iterator[tuple[str, str]]:
+        for path in self.path.glob(self.glob):
+            if not path.is_file():
+                continue
+            kind = _EXTENSION_KINDS.get(path.suffix.lower())
+            if kind is None:
+                self.files_skipped += 1
+                continue
+            yield str(path), kind
+
+    def lazy_load(self) -> Iterator[Document]:
+        if not self.path.is_dir():
+            msg = f"Directory not found: {self.path}"
+            raise FileNotFoundError(msg)
+        self._reset_report()
+        self._started = time.perf_counter()
+        pending: dict[Future, str] = {}
+        pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            files = self._iter_files()
+            exhausted = False
+            while pending or not exhausted:
+                while not exhausted and len(pending) < self.max_pending:
+                    item = next(files, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    path, kind = item
+                    self.files_total += 1
+                    pending[pool.submit(_load_file, path, kind, self.options[kind])] = path
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = pending.pop(future)
+                    try:
+                        docs = future.result()
+                    except Exception as e:
+                        self.errors.append((path, f"{type(e).__name__}: {e}"))
+                        if self.raise_on_error:
+                            msg = f"Failed to load {path}: {e}"
+                            raise RuntimeError(msg) from e
+                        continue
+                    self.files_loaded += 1
+                    self.documents += len(docs)
+                    yield from docs
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            self._finished = time.perf_counter()
+
+    def report(self) -> dict[str, Any]:
+        if self._started is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._finished or time.perf_counter()) - self._started
+        return {
+            "files_total": self.files_total,
+            "files_loaded": self.files_loaded,
+            "files_failed": len(self.errors),
+            "files_skipped": self.files_skipped,
+            "documents": self.documents,
+            "elapsed_s": elapsed,
+            "files_per_s": self.files_loaded / elapsed if elapsed > 0 else 0.0,
+            "documents_per_s": self.documents / elapsed if elapsed > 0 else 0.0,
+            "errors": list(self.errors),
+        }
@@ -1,6 +1,7 @@
+from collections.abc import Callable, Iterator, Sequence
 from os import PathLike
 from pathlib import Path
-from typing import Callable, Dict, Iterator, Optional, Self, Sequence, Union
+from typing import Any, Self
 
 from langchain_community.document_loaders import (
     BSHTMLLoader,
@@ -10,6 +11,9 @@ from langchain_community.document_loaders import (
 from langchain_community.document_loaders.base import BaseLoader
 from langchain_core.documents import Document
 
+from robotagent.rag.directory_loader import DirectoryLoader
+from robotagent.rag.fast_loaders import ChunkedCSVLoader, JSONLinesLoader
+
 
 class DocumentLoader:
     def __init__(
@@ -21,11 +25,11 @@ class DocumentLoader:
     @classmethod
     def from_csv(
         cls,
-        file_path: Union[str, Path],
-        source_column: Optional[str] = None,
+        file_path: str | Path,
+        source_column: str | None = None,
         metadata_columns: Sequence[str] = (),
-        csv_args: Optional[Dict] = None,
-        encoding: Optional[str] = None,
+        csv_args: dict | None = None,
+        encoding: str | None = None,
         autodetect_encoding: bool = False,
         *,
         content_columns: Sequence[str] = (),
@@ -44,11 +48,11 @@ class DocumentLoader:
     @classmethod
     def from_json(
         cls,
-        file_path: Union[str, PathLike],
+        file_path: str | PathLike,
         jq_schema: str,
-        content_key: Optional[str] = None,
-        is_content_key_jq_parsable: Optional[bool] = False,
-        metadata_func: Optional[Callable[[Dict, Dict], Dict]] = None,
+        content_key: str | None = None,
+        is_content_key_jq_parsable: bool | None = False,
+        metadata_func: Callable[[dict, dict], dict] | None = None,
         text_content: bool = True,
         json_lines: bool = False,
     ) -> Self:
@@ -63,12 +67,52 @@ class DocumentLoader:
         )
         return cls(loader)
 
+    @classmethod
+    def from_jsonl(
+        cls,
+        file_path: str | PathLike,
+        content_key: str | None = None,
+        metadata_keys: Sequence[str] = (),
+        *,
+        skip_invalid: bool = True,
+    ) -> Self:
+        loader = JSONLinesLoader(
+            file_path=file_path,
+            content_key=content_key,
+            metadata_keys=metadata_keys,
+            skip_invalid=skip_invalid,
+        )
+        return cls(loader)
+
+    @classmethod
+    def from_csv_chunked(
+        cls,
+        file_path: str | Path,
+        source_column: str | None = None,
+        metadata_columns: Sequence[str] = (),
+        csv_args: dict | None = None,
+        encoding: str | None = None,
+        *,
+        content_columns: Sequence[str] = (),
+        batch_size: int = 1024,
+    ) -> Self:
+        loader = ChunkedCSVLoader(
+            file_path=file_path,
+            source_column=source_column,
+            metadata_columns=metadata_columns,
+            csv_args=csv_args,
+            encoding=encoding,
+            content_columns=content_columns,
+            batch_size=batch_size,
+        )
+        return cls(loader)
+
     @classmethod
     def from_html(
         cls,
-        file_path: Union[str, Path],
-        open_encoding: Union[str, None] = None,
-        bs_kwargs: Union[dict, None] = None,
+        file_path: str | Path,
+        open_encoding: str | None = None,
+        bs_kwargs: dict | None = None,
         get_text_separator: str = "",
     ) -> Self:
         loader = BSHTMLLoader(
@@ -79,6 +123,37 @@ class DocumentLoader:
         )
         return cls(loader)
 
+    @classmethod
+    def from_directory(
+        cls,
+        path: str | Path,
+        glob: str = "**/*",
+        *,
+        max_workers: int | None = None,
+        max_pending: int | None = None,
+        csv_kwargs: dict | None = None,
+        json_kwargs: dict | None = None,
+        html_kwargs: dict | None = None,
+        raise_on_error: bool = False,
+    ) -> Self:
+        loader = DirectoryLoader(
+            path=path,
+            glob=glob,
+            max_workers=max_workers,
+            max_pending=max_pending,
+            csv_kwargs=csv_kwargs,
+            json_kwargs=json_kwargs,
+            html_kwargs=html_kwargs,
+            raise_on_error=raise_on_error,
+        )
+        return cls(loader)
+
+    def report(self) -> dict[str, Any] | None:
+        report = getattr(self._loader, "report", None)
+        if callable(report):
+            return report()
+        return None
+
     def load(self) -> list[Document]:
         try:
             docs: list[Document] = self._loader.load()
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import csv
+import json
+import mmap
+from collections.abc import Iterator, Sequence
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from langchain_community.document_loaders.base import BaseLoader
+from langchain_core.documents import Document
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - optional dependency
+    _loads = json.loads
+
+_MISSING = object()
+
+
+def _parse_key_path(key_path: str | None) -> tuple[str | int, ...]:
+    if not key_path:
+        return ()
+    parts: list[str | int] = []
+    for part in key_path.strip(".").split("."):
+        parts.append(int(part) if part.lstrip("-").isdigit() else part)
+    return tuple(parts)
+
+
+def _select(data: Any, path: tuple[str | int, ...]) -> Any:
+    for part in path:
+        if isinstance(part, int) and isinstance(data, list):
+            if -len(data) <= part < len(data):
+                data = data[part]
+                continue
+            return _MISSING
+        if isinstance(data, dict) and str(part) in data:
+            data = data[str(part)]
+            continue
+        return _MISSING
+    return data
+
+
+def _to_text(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+class JSONLinesLoader(BaseLoader):
+    def __init__(
+        self,
+        file_path: str | Path,
+        content_key: str | None = None,
+        metadata_keys: Sequence[str] = (),
+        *,
+        skip_invalid: bool = True,
+    ) -> None:
+        self.file_path = Path(file_path)
+        self.content_path = _parse_key_path(content_key)
+        self.metadata_paths = {key: _parse_key_path(key) for key in metadata_keys}
+        self.skip_invalid = skip_invalid
+
+    def _iter_lines(self) -> Iterator[tuple[int, bytes]]:
+        with self.file_path.open("rb") as handle:
+            if self.file_path.stat().st_size == 0:
+                return
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                size = len(mm)
+                pos = 0
+                line_no = 0
+                while pos < size:
+                    end = mm.find(b"\n", pos)
+                    if end < 0:
+                        end = size
+                    line = mm[pos:end]
+                    pos = end + 1
+                    line_no += 1
+                    if line.strip():
+                        yield line_no, line
+
+    def lazy_load(self) -> Iterator[Document]:
+        source = str(self.file_path)
+        for seq_num, (line_no, line) in enumerate(self._iter_lines(), start=1):
+            try:
+                data = _loads(line)
+            except ValueError as e:
+                if self.skip_invalid:
+                    continue
+                msg = f"Invalid JSON on line {line_no} of {source}: {e}"
+                raise ValueError(msg) from e
+            content = _select(data, self.content_path)
+            if content is _MISSING or content is None:
+                continue
+            metadata: dict[str, Any] = {"source": source, "seq_num": seq_num}
+            for key, path in self.metadata_paths.items():
+                value = _select(data, path)
+                if value is not _MISSING:
+                    metadata[key] = value
+            yield Document(page_content=_to_text(content), metadata=metadata)
+
+
+class ChunkedCSVLoader(BaseLoader):
+    def __init__(
+        self,
+        file_path: str | Path,
+        source_column: str | None = None,
+        metadata_columns: Sequence[str] = (),
+        csv_args: dict | None = None,
+        encoding: str | None = None,
+        *,
+        content_columns: Sequence[str] = (),
+        batch_size: int = 1024,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.file_path = Path(file_path)
+        self.source_column = source_column
+        self.metadata_columns = tuple(metadata_columns)
+        self.content_columns = tuple(content_columns)
+        self.csv_args = csv_args or {}
+        self.encoding = encoding or "utf-8"
+        self.batch_size = batch_size
+
+    def _columns(self, header: list[str]) -> tuple[list[tuple[int, str]], list[tuple[int, str]], int | None]:
+        positions = {name: i for i, name in enumerate(header)}
+        for name in (*self.metadata_columns, *self.content_columns, *filter(None, [self.source_column])):
+            if name not in positions:
+                msg = f"Column '{name}' not found in CSV file {self.file_path}"
+                raise ValueError(msg)
+        if self.content_columns:
+            content = [(positions[name], name.strip()) for name in self.content_columns]
+        else:
+            skipped = set(self.metadata_columns)
+            content = [(i, name.strip()) for i, name in enumerate(header) if name not in skipped]
+        metadata = [(positions[name], name) for name in self.metadata_columns]
+        source = positions[self.source_column] if self.source_column else None
+        return content, metadata, source
+
+    def lazy_batches(self) -> Iterator[list[Document]]:
+        default_source = str(self.file_path)
+        with self.file_path.open(newline="", encoding=self.encoding) as handle:
+            csv_args = dict(self.csv_args)
+            fieldnames = csv_args.pop("fieldnames", None)
+            restkey = csv_args.pop("restkey", None)
+            restval = csv_args.pop("restval", None)
+            reader = csv.reader(handle, **csv_args)
+            header = list(fieldnames) if fieldnames is not None else next(reader, None)
+            if header is None:
+                return
+            content, metadata, source = self._columns(header)
+            missing = "" if restval is None else str(restval)
+            row_num = 0
+            while True:
+                rows = list(islice(reader, self.batch_size))
+                if not rows:
+                    break
+                batch: list[Document] = []
+                for row in rows:
+                    width = len(row)
+                    text = "\n".join(
+                        f"{name}: {row[i].strip() if i < width else missing}" for i, name in content
+                    )
+                    if restkey is not None and width > len(header):
+                        text += f"\n{restkey}: {','.join(value.strip() for value in row[len(header) :])}"
+                    meta: dict[str, Any] = {
+                        "source": row[source] if source is not None and source < width else default_source,
+                        "row": row_num,
+                    }
+                    for i, name in metadata:
+                        meta[name] = row[i] if i < width else restval
+                    batch.append(Document(page_content=text, metadata=meta))
+                    row_num += 1
+                yield batch
+
+    def lazy_load(self) -> Iterator[Document]:
+        for batch in self.lazy_batches():
+            yield from batch
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Literal
+
+from langchain_core.documents import Document
+
+from robotagent.rag.text_splitter import TextSplitter
+from robotagent.storage.vector_store import VectorStore
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS sources (
+        source TEXT PRIMARY KEY,
+        fingerprint TEXT NOT NULL,
+        updated_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS chunks (
+        id TEXT PRIMARY KEY,
+        source TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS chunks_source ON chunks (source)",
+)
+
+
+def _metadata_json(metadata: dict[str, Any]) -> str:
+    return json.dumps(metadata, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def chunk_fingerprint(source: str, document: Document) -> str:
+    digest = hashlib.sha256()
+    for part in (source, document.page_content, _metadata_json(document.metadata)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class FingerprintStore:
+    def __init__(self, path: str | Path = ":memory:"):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+
+    def source_fingerprint(self, source: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT fingerprint FROM sources WHERE source = ?", (source,)).fetchone()
+        return row[0] if row else None
+
+    def chunk_ids(self, source: str) -> set[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT id FROM chunks WHERE source = ?", (source,))
+            return {row[0] for row in rows}
+
+    def sources(self) -> set[str]:
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT source FROM sources")}
+
+    def replace(self, source: str, fingerprint: str, chunk_ids: Iterable[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM chunks WHERE source = ?", (source,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO chunks (id, source) VALUES (?, ?)",
+                [(chunk_id, source) for chunk_id in chunk_ids],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sources (source, fingerprint, updated_at) VALUES (?, ?, ?)",
+                (source, fingerprint, time.time()),
+            )
+
+    def remove(self, source: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM chunks WHERE source = ?", (source,))
+            self._conn.execute("DELETE FROM sources WHERE source = ?", (source,))
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class IncrementalIndexer:
+    def __init__(
+        self,
+        vector_store: VectorStore,
+        splitter: TextSplitter | None = None,
+        *,
+        record_path: str | Path = ":memory:",
+        source_key: str = "source",
+        batch_size: int = 256,
+    ):
+        self.vector_store = vector_store
+        self.splitter = splitter
+        self.records = FingerprintStore(record_path)
+        self.source_key = source_key
+        self.batch_size = batch_size
+
+    def _source(self, document: Document) -> str:
+        source = document.metadata.get(self.source_key)
+        if source is None:
+            msg = f"Document is missing the '{self.source_key}' metadata key required for incremental indexing"
+            raise ValueError(msg)
+        return str(source)
+
+    def _delete(self, ids: Iterable[str]) -> int:
+        ids = list(ids)
+        for start in range(0, len(ids), self.batch_size):
+            self.vector_store.delete(ids=ids[start : start + self.batch_size])
+        return len(ids)
+
+    def index(
+        self,
+        documents: Iterable[Document],
+        *,
+        cleanup: Literal["incremental", "full"] = "incremental",
+    ) -> dict[str, int]:
+        result = {
+            "sources_seen": 0,
+            "sources_unchanged": 0,
+            "sources_changed": 0,
+            "sources_deleted": 0,
+            "chunks_added": 0,
+            "chunks_skipped": 0,
+            "chunks_deleted": 0,
+        }
+        seen: set[str] = set()
+        digests: dict[str, Any] = {}
+        previous: dict[str, set[str]] = {}
+        current: dict[str, set[str]] = {}
+        pending: list[Document] = []
+
+        def flush() -> None:
+            if not pending:
+                return
+            ids = [doc.id for doc in pending]
+            self.vector_store.add_documents(list(pending), ids=ids)
+            result["chunks_added"] += len(pending)
+            pending.clear()
+
+        def index_source(source: str, docs: list[Document]) -> None:
+            result["sources_seen"] += 1
+            digest = hashlib.sha256()
+            for doc in docs:
+                digest.update(chunk_fingerprint(source, doc).encode("ascii"))
+            stored = self.records.source_fingerprint(source)
+            if stored is not None and stored == digest.hexdigest():
+                result["sources_unchanged"] += 1
+                result["chunks_skipped"] += len(self.records.chunk_ids(source))
+                return
+            digests[source] = digest
+            previous[source] = self.records.chunk_ids(source)
+            current[source] = set()
+
+            chunks = self.splitter.split_documents(docs) if self.splitter is not None else docs
+            for chunk in chunks:
+                chunk_id = chunk_fingerprint(source, chunk)
+                if chunk_id in current[source]:
+                    continue
+                current[source].add(chunk_id)
+                if chunk_id in previous[source]:
+                    result["chunks_skipped"] += 1
+                    continue
+                pending.append(
+                    Document(id=chunk_id, page_content=chunk.page_content, metadata=dict(chunk.metadata))
+                )
+                if len(pending) >= self.batch_size:
+                    flush()
+
+        group_source: str | None = None
+        group: list[Document] = []
+        for document in documents:
+            source = self._source(document)
+            if source != group_source:
+                if group_source is not None:
+                    index_source(group_source, group)
+                if source in seen:
+                    msg = f"Documents for source {source!r} are not contiguous; group the input by source"
+                    raise ValueError(msg)
+                seen.add(source)
+                group_source, group = source, []
+            group.append(document)
+        if group_source is not None:
+            index_source(group_source, group)
+        flush()
+
+        for source, digest in digests.items():
+            stale = previous[source] - current[source]
+            result["chunks_deleted"] += self._delete(stale)
+            self.records.replace(source, digest.hexdigest(), current[source])
+            result["sources_changed"] += 1
+
+        if cleanup == "full":
+            for source in self.records.sources() - seen:
+                result["chunks_deleted"] += self._delete(self.records.chunk_ids(source))
+                self.records.remove(source)
+                result["sources_deleted"] += 1
+        return result
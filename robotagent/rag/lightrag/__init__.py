@@ -0,0 +1,13 @@
+from .engine import (
+    LightRAG,
+    RetrievalContext,
+)
+from .extractor import EntityExtractor
+from .graph import KnowledgeGraph
+
+__all__ = [
+    "EntityExtractor",
+    "KnowledgeGraph",
+    "LightRAG",
+    "RetrievalContext",
+]
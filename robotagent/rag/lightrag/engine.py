@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Literal
+
+from langchain_core.documents import Document
+from langchain_core.language_models import BaseChatModel
+
+from robotagent.models.embedding_model import EmbeddingModel
+from robotagent.rag.lightrag.extractor import EntityExtractor
+from robotagent.rag.lightrag.graph import Entity, KnowledgeGraph, Relation
+from robotagent.rag.text_splitter import TextSplitter
+from robotagent.storage.vector_store import VectorStore
+from robotagent.utils.tokens import count_tokens
+
+QueryMode = Literal["local", "global", "hybrid", "naive"]
+
+_JSON_BLOCK = re.compile(r"\{.*\}", re.DOTALL)
+_PERSISTENT_STORE_TYPES = ("flat", "ivf")
+_CHUNKS_FILE = "chunk_ids.json"
+
+_KEYWORDS_PROMPT = (
+    "Extract search keywords from the question for a robotics knowledge graph.\n"
+    'Return only JSON: {{"high_level_keywords": [...], "low_level_keywords": [...]}}.\n'
+    "High-level keywords name broad themes or procedures; low-level keywords name concrete "
+    "entities such as parts, objects, locations and error codes.\n\n"
+    "Question: {question}"
+)
+
+_ANSWER_PROMPT = (
+    "Answer the question using only the knowledge below. "
+    "Say so if the knowledge does not contain the answer.\n\n"
+    "{context}\n\nQuestion: {question}"
+)
+
+
+def _chunk_id(text: str) -> str:
+    return "chunk-" + hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+class RetrievalContext:
+    def __init__(
+        self,
+        entities: list[Entity],
+        relations: list[Relation],
+        chunks: list[Document],
+        graph: KnowledgeGraph,
+    ):
+        self.entities = entities
+        self.relations = relations
+        self.chunks = chunks
+        self.graph = graph
+
+    def _relation_line(self, relation: Relation) -> str:
+        source = self.graph.entity(relation.source).name
+        target = self.graph.entity(relation.target).name
+        keywords = ", ".join(relation.keywords)
+        return f"{source} -> {target} [{keywords}]: {relation.description}"
+
+    def render(self, max_tokens: int = 4000) -> str:
+        budget = {"entities": max_tokens // 4, "relations": max_tokens // 4}
+        budget["chunks"] = max_tokens - budget["entities"] - budget["relations"]
+        sections = [
+            ("Entities", "entities", [entity.render() for entity in self.entities]),
+            ("Relations", "relations", [self._relation_line(relation) for relation in self.relations]),
+            ("Sources", "chunks", [chunk.page_content for chunk in self.chunks]),
+        ]
+        parts: list[str] = []
+        for title, key, lines in sections:
+            used = 0
+            kept: list[str] = []
+            for line in lines:
+                tokens = count_tokens(line)
+                if used + tokens > budget[key]:
+                    break
+                kept.append(f"- {line}")
+                used += tokens
+            if kept:
+                parts.append(f"## {title}\n" + "\n".join(kept))
+        return "\n\n".join(parts)
+
+
+class LightRAG:
+    def __init__(
+        self,
+        model: BaseChatModel,
+        embedding: EmbeddingModel,
+        *,
+        splitter: TextSplitter | None = None,
+        working_dir: str | Path | None = None,
+        vector_store_type: str = "flat",
+        extractor: EntityExtractor | None = None,
+        batch_size: int = 4,
+        max_concurrency: int = 4,
+        top_k: int = 10,
+        max_context_tokens: int = 4000,
+        keyword_extraction: bool = True,
+    ):
+        self.model = model
+        self.embedding = embedding
+        self.splitter = splitter
+        self.working_dir = Path(working_dir) if working_dir is not None else None
+        self.extractor = extractor or EntityExtractor(model, batch_size=batch_size, max_concurrency=max_concurrency)
+        self.top_k = top_k
+        self.max_context_tokens = max_context_tokens
+        self.keyword_extraction = keyword_extraction
+        graph_dir = self._path("graph")
+        if graph_dir is not None and KnowledgeGraph.exists(graph_dir):
+            self.graph = KnowledgeGraph.load(graph_dir)
+        else:
+            self.graph = KnowledgeGraph()
+        self.chunks = self._store(vector_store_type, "chunks")
+        self.entities = self._store(vector_store_type, "entities")
+        self.relations = self._store(vector_store_type, "relations")
+        self._chunk_ids: set[str] = set()
+        chunk_file = self._path(_CHUNKS_FILE)
+        if chunk_file is not None and chunk_file.exists():
+            self._chunk_ids = set(json.loads(chunk_file.read_text(encoding="utf-8")))
+
+    def _path(self, name: str) -> Path | None:
+        return self.working_dir / name if self.working_dir is not None else None
+
+    def _store(self, vector_store_type: str, name: str) -> VectorStore:
+        kwargs: dict[str, Any] = {}
+        path = self._path(name)
+        if path is not None and vector_store_type in _PERSISTENT_STORE_TYPES:
+            kwargs["path"] = path
+        return VectorStore(vector_store_type, self.embedding, **kwargs)
+
+    def _split(self, documents: Iterable[Document | str]) -> list[Document]:
+        docs = [doc if isinstance(doc, Document) else Document(page_content=str(doc)) for doc in documents]
+        return self.splitter.split_documents(docs) if self.splitter is not None else docs
+
+    def insert(self, documents: Iterable[Document | str]) -> dict[str, int]:
+        result = {"chunks_added": 0, "chunks_skipped": 0, "entities_updated": 0, "relations_updated": 0}
+        pending: dict[str, Document] = {}
+        for chunk in self._split(documents):
+            chunk_id = _chunk_id(chunk.page_content)
+            if chunk_id in self._chunk_ids or chunk_id in pending:
+                result["chunks_skipped"] += 1
+                continue
+            pending[chunk_id] = chunk
+        if not pending:
+            return result
+
+        ids = list(pending)
+        self.chunks.add_texts(
+            [pending[chunk_id].page_content for chunk_id in ids],
+            metadatas=[dict(pending[chunk_id].metadata) for chunk_id in ids],
+            ids=ids,
+        )
+        extracted = self.extractor.extract([(chunk_id, pending[chunk_id].page_content) for chunk_id in ids])
+
+        known_entities = self.graph.num_entities
+        changed_entities: set[int] = set()
+        changed_relations: set[int] = set()
+        for chunk_id, items in extracted.items():
+            if chunk_id not in pending:
+                continue
+            for item in items["entities"]:
+                entity, changed = self.graph.upsert_entity(
+                    str(item["name"]),
+                    str(item.get("type") or ""),
+                    str(item.get("description") or ""),
+                    chunk_id,
+                )
+                if changed:
+                    changed_entities.add(entity.id)
+            for item in items["relations"]:
+                keywords = item.get("keywords") or []
+                if isinstance(keywords, str):
+                    keywords = [part.strip() for part in keywords.split(",")]
+                added = self.graph.add_relation(
+                    str(item["source"]),
+                    str(item["target"]),
+                    str(item.get("description") or ""),
+                    keywords,
+                    float(item.get("weight") or 1.0),
+                    chunk_id,
+                )
+                if added is None:
+                    continue
+                relation, changed = added
+                if changed:
+                    changed_relations.add(relation.id)
+
+        changed_entities.update(range(known_entities, self.graph.num_entities))
+        self._index_entities(changed_entities)
+        self._index_relations(changed_relations)
+        self._chunk_ids.update(ids)
+        result["chunks_added"] = len(ids)
+        result["entities_updated"] = len(changed_entities)
+        result["relations_updated"] = len(changed_relations)
+        return result
+
+    def _index_entities(self, entity_ids: Iterable[int]) -> None:
+        entities = [self.graph.entity(entity_id) for entity_id in sorted(entity_ids)]
+        if entities:
+            self.entities.add_texts(
+                [f"{entity.name}\n{entity.description}" for entity in entities],
+                metadatas=[{"entity_id": entity.id} for entity in entities],
+                ids=[f"entity-{entity.id}" for entity in entities],
+            )
+
+    def _index_relations(self, relation_ids: Iterable[int]) -> None:
+        relations = [self.graph.relation(relation_id) for relation_id in sorted(relation_ids)]
+        if relations:
+            self.relations.add_texts(
+                [
+                    f"{self.graph.entity(relation.source).name} {self.graph.entity(relation.target).name} "
+                    f"{', '.join(relation.keywords)}\n{relation.description}"
+                    for relation in relations
+                ],
+                metadatas=[{"relation_id": relation.id} for relation in relations],
+                ids=[f"relation-{relation.id}" for relation in relations],
+            )
+
+    def _keywords(self, question: str) -> tuple[str, str]:
+        if not self.keyword_extraction:
+            return question, question
+        try:
+            response = self.model.invoke(_KEYWORDS_PROMPT.format(question=question))
+            match = _JSON_BLOCK.search(str(getattr(response, "content", response) or ""))
+            data = json.loads(match.group(0)) if match else {}
+        except Exception:  # noqa: BLE001
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        high = ", ".join(str(item) for item in data.get("high_level_keywords") or [])
+        low = ", ".join(str(item) for item in data.get("low_level_keywords") or [])
+        return high or question, low or question
+
+    def _chunks_by_frequency(self, counts: Counter[str], limit: int) -> list[Document]:
+        ids = [chunk_id for chunk_id, _ in counts.most_common(limit)]
+        if not ids:
+            return []
+        found = {doc.id: doc for doc in self.chunks.store.get_by_ids(ids)}
+        return [found[chunk_id] for chunk_id in ids if chunk_id in found]
+
+    def _local(self, keywords: str, top_k: int) -> tuple[list[Entity], list[Relation], Counter[str]]:
+        hits = self.entities.similarity_search(keywords, k=top_k)
+        entities = [self.graph.entity(int(doc.metadata["entity_id"])) for doc in hits]
+        selected = {entity.id for entity in entities}
+        scored: dict[int, float] = {}
+        chunks: Counter[str] = Counter()
+        for entity in entities:
+            chunks.update(entity.chunk_ids)
+            neighbors, edges = self.graph.neighbors(entity.id)
+            for neighbor, edge in zip(neighbors.tolist(), edges.tolist()):
+                relation = self.graph.relation(edge)
+                bonus = 2.0 if neighbor in selected else 1.0
+                scored[edge] = max(scored.get(edge, 0.0), relation.weight * bonus)
+        order = sorted(scored, key=lambda edge: scored[edge], reverse=True)[: top_k * 2]
+        relations = [self.graph.relation(edge) for edge in order]
+        for relation in relations:
+            chunks.update(relation.chunk_ids)
+        return entities, relations, chunks
+
+    def _global(self, keywords: str, top_k: int) -> tuple[list[Entity], list[Relation], Counter[str]]:
+        hits = self.relations.similarity_search(keywords, k=top_k)
+        relations = [self.graph.relation(int(doc.metadata["relation_id"])) for doc in hits]
+        entity_ids: list[int] = []
+        chunks: Counter[str] = Counter()
+        for relation in relations:
+            chunks.update(relation.chunk_ids)
+            for entity_id in (relation.source, relation.target):
+                if entity_id not in entity_ids:
+                    entity_ids.append(entity_id)
+        entities = [self.graph.entity(entity_id) for entity_id in entity_ids[: top_k * 2]]
+        return entities, relations, chunks
+
+    def retrieve(self, question: str, mode: QueryMode = "hybrid", top_k: int | None = None) -> RetrievalContext:
+        top_k = top_k or self.top_k
+        if mode == "naive":
+            return RetrievalContext([], [], self.chunks.similarity_search(question, k=top_k), self.graph)
+        if mode not in ("local", "global", "hybrid"):
+            msg = f"Unsupported query mode: {mode}. Supported modes are: local, global, hybrid, naive"
+            raise ValueError(msg)
+        high, low = self._keywords(question)
+        entities: list[Entity] = []
+        relations: list[Relation] = []
+        chunks: Counter[str] = Counter()
+        if mode in ("local", "hybrid"):
+            local_entities, local_relations, local_chunks = self._local(low, top_k)
+            entities.extend(local_entities)
+            relations.extend(local_relations)
+            chunks.update(local_chunks)
+        if mode in ("global", "hybrid"):
+            global_entities, global_relations, global_chunks = self._global(high, top_k)
+            seen_entities = {entity.id for entity in entities}
+            seen_relations = {relation.id for relation in relations}
+            entities.extend(entity for entity in global_entities if entity.id not in seen_entities)
+            relations.extend(relation for relation in global_relations if relation.id not in seen_relations)
+            chunks.update(global_chunks)
+        return RetrievalContext(entities, relations, self._chunks_by_frequency(chunks, top_k), self.graph)
+
+    def query(self, question: str, mode: QueryMode = "hybrid", top_k: int | None = None) -> str:
+        context = self.retrieve(question, mode, top_k).render(self.max_context_tokens)
+        prompt = _ANSWER_PROMPT.format(context=context or "(no knowledge found)", question=question)
+        response = self.model.invoke(prompt)
+        return str(getattr(response, "content", response) or "").strip()
+
+    def save(self) -> Path:
+        if self.working_dir is None:
+            raise ValueError("LightRAG was created without a working_dir")
+        self.working_dir.mkdir(parents=True, exist_ok=True)
+        self.graph.save(self.working_dir / "graph")
+        for name in ("chunks", "entities", "relations"):
+            getattr(self, name).save(str(self.working_dir / name))
+        (self.working_dir / _CHUNKS_FILE).write_text(json.dumps(sorted(self._chunk_ids)), encoding="utf-8")
+        return self.working_dir
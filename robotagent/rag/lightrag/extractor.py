@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+import re
+import threading
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+
+_JSON_BLOCK = re.compile(r"\{.*\}", re.DOTALL)
+
+_EXTRACTION_PROMPT = (
+    "Extract the entities and relations mentioned in each text chunk of a robotics knowledge base.\n"
+    "Entity types: {entity_types}.\n"
+    "Return only JSON of the form "
+    '{{"chunks": [{{"id": "<chunk id>", '
+    '"entities": [{{"name": "...", "type": "...", "description": "..."}}], '
+    '"relations": [{{"source": "...", "target": "...", "description": "...", '
+    '"keywords": ["..."], "weight": 1.0}}]}}]}}.\n'
+    "Use the entity names exactly as they appear in the text.\n\n"
+    "{chunks}"
+)
+
+DEFAULT_ENTITY_TYPES = ("robot", "component", "object", "location", "task", "procedure", "parameter", "error")
+
+
+def parse_extraction(text: str) -> dict[str, dict[str, list[dict[str, Any]]]] | None:
+    match = _JSON_BLOCK.search(text or "")
+    if not match:
+        return None
+    try:
+        data = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return None
+    chunks = data.get("chunks") if isinstance(data, dict) else None
+    if not isinstance(chunks, list):
+        return None
+    result: dict[str, dict[str, list[dict[str, Any]]]] = {}
+    for item in chunks:
+        if not isinstance(item, dict) or "id" not in item:
+            continue
+        entities = [entity for entity in item.get("entities") or [] if isinstance(entity, dict) and entity.get("name")]
+        relations = [
+            relation
+            for relation in item.get("relations") or []
+            if isinstance(relation, dict) and relation.get("source") and relation.get("target")
+        ]
+        result[str(item["id"])] = {"entities": entities, "relations": relations}
+    return result
+
+
+class EntityExtractor:
+    def __init__(
+        self,
+        model: BaseChatModel,
+        *,
+        batch_size: int = 4,
+        max_concurrency: int = 4,
+        max_chunk_chars: int = 4000,
+        entity_types: Sequence[str] = DEFAULT_ENTITY_TYPES,
+    ):
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_chunk_chars = max_chunk_chars
+        self.entity_types = tuple(entity_types)
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "chunks": 0, "failures": 0, "splits": 0}
+
+    def _record(self, **deltas: int) -> None:
+        with self._lock:
+            for key, value in deltas.items():
+                self._stats[key] += value
+
+    def _prompt(self, chunks: Sequence[tuple[str, str]]) -> str:
+        rendered = "\n\n".join(
+            f"[chunk id={chunk_id}]\n{text[: self.max_chunk_chars]}" for chunk_id, text in chunks
+        )
+        return _EXTRACTION_PROMPT.format(entity_types=", ".join(self.entity_types), chunks=rendered)
+
+    def _extract_batch(self, chunks: list[tuple[str, str]]) -> dict[str, dict[str, list[dict[str, Any]]]]:
+        self._record(requests=1, chunks=len(chunks))
+        try:
+            response = self.model.invoke(self._prompt(chunks))
+            parsed = parse_extraction(str(getattr(response, "content", response) or ""))
+        except Exception:  # noqa: BLE001
+            parsed = None
+        expected = {chunk_id for chunk_id, _ in chunks}
+        if parsed is not None and expected <= set(parsed):
+            return {chunk_id: parsed[chunk_id] for chunk_id in expected}
+        if len(chunks) > 1:
+            self._record(splits=1)
+            result = dict(parsed or {})
+            for chunk in chunks:
+                if chunk[0] not in result:
+                    result.update(self._extract_batch([chunk]))
+            return {chunk_id: result[chunk_id] for chunk_id in expected if chunk_id in result}
+        self._record(failures=1)
+        return dict(parsed or {})
+
+    def extract(self, chunks: Sequence[tuple[str, str]]) -> dict[str, dict[str, list[dict[str, Any]]]]:
+        chunks = list(chunks)
+        batches = [chunks[start : start + self.batch_size] for start in range(0, len(chunks), self.batch_size)]
+        results: dict[str, dict[str, list[dict[str, Any]]]] = {}
+        if len(batches) <= 1 or self.max_concurrency == 1:
+            for batch in batches:
+                results.update(self._extract_batch(batch))
+            return results
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="lightrag-extract") as pool:
+            for batch_result in pool.map(self._extract_batch, batches):
+                results.update(batch_result)
+        return results
+
+    def metrics(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
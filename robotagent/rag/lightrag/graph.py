@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import json
+import threading
+from array import array
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+_GRAPH_FILE = "graph.json"
+_EDGES_FILE = "edges.npz"
+
+
+def normalize_entity(name: str) -> str:
+    return " ".join(str(name or "").split()).upper()
+
+
+class Entity:
+    __slots__ = ("chunk_ids", "descriptions", "id", "name", "type")
+
+    def __init__(self, entity_id: int, name: str, entity_type: str = ""):
+        self.id = entity_id
+        self.name = name
+        self.type = entity_type
+        self.descriptions: list[str] = []
+        self.chunk_ids: set[str] = set()
+
+    @property
+    def description(self) -> str:
+        return "; ".join(self.descriptions)
+
+    def render(self) -> str:
+        return f"{self.name} ({self.type or 'unknown'}): {self.description}"
+
+
+class Relation:
+    __slots__ = ("chunk_ids", "descriptions", "id", "keywords", "source", "target", "weight")
+
+    def __init__(self, relation_id: int, source: int, target: int):
+        self.id = relation_id
+        self.source = source
+        self.target = target
+        self.keywords: list[str] = []
+        self.descriptions: list[str] = []
+        self.weight = 0.0
+        self.chunk_ids: set[str] = set()
+
+    @property
+    def description(self) -> str:
+        return "; ".join(self.descriptions)
+
+
+def _merge_unique(values: list[str], new: Iterable[str], limit: int) -> bool:
+    changed = False
+    for value in new:
+        value = str(value or "").strip()
+        if value and value not in values and len(values) < limit:
+            values.append(value)
+            changed = True
+    return changed
+
+
+class KnowledgeGraph:
+    def __init__(self, *, max_descriptions: int = 8, merge_ratio: float = 0.1):
+        self.max_descriptions = max_descriptions
+        self.merge_ratio = merge_ratio
+        self._lock = threading.RLock()
+        self._entities: list[Entity] = []
+        self._names: dict[str, int] = {}
+        self._relations: list[Relation] = []
+        self._pairs: dict[tuple[int, int], int] = {}
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.zeros(0, dtype=np.int32)
+        self._edge_ids = np.zeros(0, dtype=np.int32)
+        self._csr_nodes = 0
+        self._delta_src = array("i")
+        self._delta_dst = array("i")
+        self._delta_edges = array("i")
+
+    @property
+    def num_entities(self) -> int:
+        return len(self._entities)
+
+    @property
+    def num_relations(self) -> int:
+        return len(self._relations)
+
+    def entity(self, entity_id: int) -> Entity:
+        return self._entities[entity_id]
+
+    def relation(self, relation_id: int) -> Relation:
+        return self._relations[relation_id]
+
+    def find(self, name: str) -> Entity | None:
+        entity_id = self._names.get(normalize_entity(name))
+        return None if entity_id is None else self._entities[entity_id]
+
+    def upsert_entity(
+        self,
+        name: str,
+        entity_type: str = "",
+        description: str = "",
+        chunk_id: str | None = None,
+    ) -> tuple[Entity, bool]:
+        key = normalize_entity(name)
+        if not key:
+            raise ValueError("Entity name must not be empty")
+        with self._lock:
+            entity_id = self._names.get(key)
+            changed = entity_id is None
+            if entity_id is None:
+                entity_id = len(self._entities)
+                self._names[key] = entity_id
+                self._entities.append(Entity(entity_id, key, str(entity_type or "").strip().lower()))
+            entity = self._entities[entity_id]
+            if not entity.type and entity_type:
+                entity.type = str(entity_type).strip().lower()
+                changed = True
+            changed = _merge_unique(entity.descriptions, [description], self.max_descriptions) or changed
+            if chunk_id is not None:
+                entity.chunk_ids.add(chunk_id)
+            return entity, changed
+
+    def add_relation(
+        self,
+        source: str,
+        target: str,
+        description: str = "",
+        keywords: Iterable[str] = (),
+        weight: float = 1.0,
+        chunk_id: str | None = None,
+    ) -> tuple[Relation, bool] | None:
+        with self._lock:
+            src, _ = self.upsert_entity(source, chunk_id=chunk_id)
+            dst, _ = self.upsert_entity(target, chunk_id=chunk_id)
+            if src.id == dst.id:
+                return None
+            pair = (min(src.id, dst.id), max(src.id, dst.id))
+            relation_id = self._pairs.get(pair)
+            changed = relation_id is None
+            if relation_id is None:
+                relation_id = len(self._relations)
+                self._pairs[pair] = relation_id
+                self._relations.append(Relation(relation_id, src.id, dst.id))
+                self._delta_src.append(src.id)
+                self._delta_dst.append(dst.id)
+                self._delta_edges.append(relation_id)
+            relation = self._relations[relation_id]
+            relation.weight += float(weight or 1.0)
+            changed = _merge_unique(relation.descriptions, [description], self.max_descriptions) or changed
+            changed = _merge_unique(relation.keywords, keywords, self.max_descriptions * 2) or changed
+            if chunk_id is not None:
+                relation.chunk_ids.add(chunk_id)
+            if len(self._delta_edges) > max(1024, self.merge_ratio * len(self._edge_ids)):
+                self._merge_delta()
+            return relation, changed
+
+    def _merge_delta(self) -> None:
+        if not len(self._delta_edges) and self._csr_nodes == len(self._entities):
+            return
+        src = np.frombuffer(self._delta_src, dtype=np.int32).copy() if len(self._delta_src) else np.zeros(0, np.int32)
+        dst = np.frombuffer(self._delta_dst, dtype=np.int32).copy() if len(self._delta_dst) else np.zeros(0, np.int32)
+        edges = (
+            np.frombuffer(self._delta_edges, dtype=np.int32).copy() if len(self._delta_edges) else np.zeros(0, np.int32)
+        )
+        old_rows = np.repeat(np.arange(self._csr_nodes, dtype=np.int32), np.diff(self._indptr))
+        rows = np.concatenate([old_rows, src, dst])
+        cols = np.concatenate([self._indices, dst, src])
+        ids = np.concatenate([self._edge_ids, edges, edges])
+        order = np.argsort(rows, kind="stable")
+        nodes = len(self._entities)
+        self._indptr = np.zeros(nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=nodes), out=self._indptr[1:])
+        self._indices = cols[order].astype(np.int32)
+        self._edge_ids = ids[order].astype(np.int32)
+        self._csr_nodes = nodes
+        self._delta_src = array("i")
+        self._delta_dst = array("i")
+        self._delta_edges = array("i")
+
+    def compact(self) -> None:
+        with self._lock:
+            self._merge_delta()
+
+    def neighbors(self, entity_id: int) -> tuple[np.ndarray, np.ndarray]:
+        with self._lock:
+            if entity_id < self._csr_nodes:
+                start, stop = self._indptr[entity_id], self._indptr[entity_id + 1]
+                nodes, edges = self._indices[start:stop], self._edge_ids[start:stop]
+            else:
+                nodes = edges = np.zeros(0, dtype=np.int32)
+            if not len(self._delta_edges):
+                return nodes, edges
+            src = np.frombuffer(self._delta_src, dtype=np.int32)
+            dst = np.frombuffer(self._delta_dst, dtype=np.int32)
+            delta = np.frombuffer(self._delta_edges, dtype=np.int32)
+            outgoing, incoming = src == entity_id, dst == entity_id
+            result = (
+                np.concatenate([nodes, dst[outgoing], src[incoming]]),
+                np.concatenate([edges, delta[outgoing], delta[incoming]]),
+            )
+            del src, dst, delta
+            return result
+
+    def degree(self, entity_id: int) -> int:
+        return len(self.neighbors(entity_id)[0])
+
+    def save(self, path: str | Path) -> Path:
+        target = Path(path)
+        target.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._merge_delta()
+            data: dict[str, Any] = {
+                "entities": [
+                    {
+                        "name": entity.name,
+                        "type": entity.type,
+                        "descriptions": entity.descriptions,
+                        "chunk_ids": sorted(entity.chunk_ids),
+                    }
+                    for entity in self._entities
+                ],
+                "relations": [
+                    {
+                        "source": relation.source,
+                        "target": relation.target,
+                        "keywords": relation.keywords,
+                        "descriptions": relation.descriptions,
+                        "weight": relation.weight,
+                        "chunk_ids": sorted(relation.chunk_ids),
+                    }
+                    for relation in self._relations
+                ],
+            }
+            with (target / _GRAPH_FILE).open("w", encoding="utf-8") as handle:
+                json.dump(data, handle, ensure_ascii=False)
+            np.savez(target / _EDGES_FILE, indptr=self._indptr, indices=self._indices, edge_ids=self._edge_ids)
+        return target
+
+    @classmethod
+    def load(cls, path: str | Path, **kwargs: Any) -> KnowledgeGraph:
+        source = Path(path)
+        graph = cls(**kwargs)
+        with (source / _GRAPH_FILE).open(encoding="utf-8") as handle:
+            data = json.load(handle)
+        for entity_id, item in enumerate(data["entities"]):
+            entity = Entity(entity_id, item["name"], item.get("type", ""))
+            entity.descriptions = list(item.get("descriptions", []))
+            entity.chunk_ids = set(item.get("chunk_ids", []))
+            graph._entities.append(entity)
+            graph._names[entity.name] = entity_id
+        for relation_id, item in enumerate(data["relations"]):
+            relation = Relation(relation_id, int(item["source"]), int(item["target"]))
+            relation.keywords = list(item.get("keywords", []))
+            relation.descriptions = list(item.get("descriptions", []))
+            relation.weight = float(item.get("weight", 1.0))
+            relation.chunk_ids = set(item.get("chunk_ids", []))
+            graph._relations.append(relation)
+            graph._pairs[(min(relation.source, relation.target), max(relation.source, relation.target))] = relation_id
+        with np.load(source / _EDGES_FILE) as edges:
+            graph._indptr = edges["indptr"].astype(np.int64)
+            graph._indices = edges["indices"].astype(np.int32)
+            graph._edge_ids = edges["edge_ids"].astype(np.int32)
+        graph._csr_nodes = len(graph._indptr) - 1
+        return graph
+
+    @classmethod
+    def exists(cls, path: str | Path) -> bool:
+        return (Path(path) / _GRAPH_FILE).exists() and (Path(path) / _EDGES_FILE).exists()
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+from langchain_core.documents import Document
+
+from robotagent.models.embedding_model import EmbeddingModel
+from robotagent.rag.document_loader import DocumentLoader
+from robotagent.rag.text_splitter import TextSplitter
+from robotagent.storage.vector_store import VectorStore
+
+_DONE = object()
+_POLL_SECONDS = 0.1
+
+
+class IngestionStats:
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.finished: float | None = None
+        self.documents = 0
+        self.chunks = 0
+        self.batches_embedded = 0
+        self.chunks_written = 0
+        self._lock = threading.Lock()
+
+    def add(self, field: str, value: int = 1) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + value)
+
+    def snapshot(self) -> dict[str, Any]:
+        end = self.finished or time.perf_counter()
+        elapsed = max(end - self.started, 1e-9)
+        return {
+            "documents": self.documents,
+            "chunks": self.chunks,
+            "batches_embedded": self.batches_embedded,
+            "chunks_written": self.chunks_written,
+            "elapsed_s": elapsed,
+            "documents_per_s": self.documents / elapsed,
+            "chunks_per_s": self.chunks_written / elapsed,
+        }
+
+
+class IngestionPipeline:
+    def __init__(
+        self,
+        embedding: EmbeddingModel,
+        vector_store: VectorStore,
+        splitter: TextSplitter | None = None,
+        *,
+        batch_size: int = 64,
+        queue_size: int = 8,
+        split_workers: int = 1,
+        embed_workers: int = 2,
+        write_workers: int = 1,
+        progress: Callable[[dict[str, Any]], None] | None = None,
+        progress_interval: float = 5.0,
+    ):
+        if min(batch_size, queue_size, split_workers, embed_workers, write_workers) < 1:
+            raise ValueError("batch_size, queue_size and worker counts must be at least 1")
+        self.embedding = embedding
+        self.vector_store = vector_store
+        self.splitter = splitter
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.split_workers = split_workers
+        self.embed_workers = embed_workers
+        self.write_workers = write_workers
+        self.progress = progress
+        self.progress_interval = progress_interval
+
+    def run(self, source: DocumentLoader | Iterable[Document]) -> dict[str, Any]:
+        documents = source.lazy_load() if isinstance(source, DocumentLoader) else iter(source)
+        return _PipelineRun(self, documents).execute()
+
+
+class _PipelineRun:
+    def __init__(self, pipeline: IngestionPipeline, documents: Iterator[Document]):
+        self.pipeline = pipeline
+        self.documents = documents
+        self.stats = IngestionStats()
+        self.stop = threading.Event()
+        self.error: BaseException | None = None
+        self._error_lock = threading.Lock()
+        self._last_report = self.stats.started
+        self._report_lock = threading.Lock()
+        size = pipeline.queue_size
+        self.docs: queue.Queue = queue.Queue(maxsize=size)
+        self.chunks: queue.Queue = queue.Queue(maxsize=size * pipeline.batch_size)
+        self.batches: queue.Queue = queue.Queue(maxsize=size)
+        self.vectors: queue.Queue = queue.Queue(maxsize=size)
+
+    def execute(self) -> dict[str, Any]:
+        p = self.pipeline
+        threads = [threading.Thread(target=self._guard(self._load), name="ingest-load")]
+        threads += self._stage("split", p.split_workers, self.docs, self.chunks, self._split)
+        threads.append(threading.Thread(target=self._guard(self._batch), name="ingest-batch"))
+        threads += self._stage("embed", p.embed_workers, self.batches, self.vectors, self._embed)
+        threads += self._stage("write", p.write_workers, self.vectors, None, self._write)
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.stats.finished = time.perf_counter()
+        if self.error is not None:
+            msg = f"Ingestion failed: {self.error}"
+            raise RuntimeError(msg) from self.error
+        snapshot = self.stats.snapshot()
+        if p.progress is not None:
+            p.progress(snapshot)
+        return snapshot
+
+    def _guard(self, target: Callable[[], None]) -> Callable[[], None]:
+        def run() -> None:
+            try:
+                target()
+            except BaseException as e:  # noqa: BLE001
+                with self._error_lock:
+                    if self.error is None:
+                        self.error = e
+                self.stop.set()
+
+        return run
+
+    def _put(self, q: queue.Queue, item: Any) -> bool:
+        while not self.stop.is_set():
+            try:
+                q.put(item, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue) -> Any:
+        while not self.stop.is_set():
+            try:
+                return q.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _stage(
+        self,
+        name: str,
+        workers: int,
+        inbox: queue.Queue,
+        outbox: queue.Queue | None,
+        handle: Callable[[Any], Any],
+    ) -> list[threading.Thread]:
+        remaining = [workers]
+        lock = threading.Lock()
+        downstream = {
+            "split": 1,
+            "embed": self.pipeline.write_workers,
+            "write": 0,
+        }[name]
+
+        def work() -> None:
+            try:
+                while True:
+                    item = self._get(inbox)
+                    if item is _DONE:
+                        break
+                    result = handle(item)
+                    if outbox is not None and result is not None and not self._put(outbox, result):
+                        break
+            finally:
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last and outbox is not None:
+                    for _ in range(downstream):
+                        self._put(outbox, _DONE)
+
+        return [
+            threading.Thread(target=self._guard(work), name=f"ingest-{name}-{i}")
+            for i in range(workers)
+        ]
+
+    def _load(self) -> None:
+        try:
+            for document in self.documents:
+                if not self._put(self.docs, document):
+                    return
+                self.stats.add("documents")
+        finally:
+            for _ in range(self.pipeline.split_workers):
+                self._put(self.docs, _DONE)
+
+    def _split(self, document: Document) -> None:
+        splitter = self.pipeline.splitter
+        chunks = splitter.split_documents([document]) if splitter is not None else [document]
+        for chunk in chunks:
+            if not self._put(self.chunks, chunk):
+                return
+        self.stats.add("chunks", len(chunks))
+
+    def _batch(self) -> None:
+        batch: list[Document] = []
+        try:
+            while True:
+                chunk = self._get(self.chunks)
+                if chunk is _DONE:
+                    break
+                batch.append(chunk)
+                if len(batch) >= self.pipeline.batch_size:
+                    if not self._put(self.batches, batch):
+                        return
+                    batch = []
+            if batch:
+                self._put(self.batches, batch)
+        finally:
+            for _ in range(self.pipeline.embed_workers):
+                self._put(self.batches, _DONE)
+
+    def _embed(self, batch: list[Document]) -> tuple[list[Document], list[list[float]]]:
+        vectors = self.pipeline.embedding.embed_documents([chunk.page_content for chunk in batch])
+        if len(vectors) != len(batch):
+            msg = f"Embedding model returned {len(vectors)} vectors for {len(batch)} chunks"
+            raise RuntimeError(msg)
+        self.stats.add("batches_embedded")
+        return batch, vectors
+
+    def _write(self, item: tuple[list[Document], list[list[float]]]) -> None:
+        batch, vectors = item
+        ids = [chunk.id for chunk in batch] if all(getattr(chunk, "id", None) for chunk in batch) else None
+        self.pipeline.vector_store.add_embeddings(
+            texts=[chunk.page_content for chunk in batch],
+            embeddings=vectors,
+            metadatas=[dict(chunk.metadata) for chunk in batch],
+            ids=ids,
+        )
+        self.stats.add("chunks_written", len(batch))
+        self._report()
+
+    def _report(self) -> None:
+        progress = self.pipeline.progress
+        if progress is None:
+            return
+        now = time.perf_counter()
+        with self._report_lock:
+            if now - self._last_report < self.pipeline.progress_interval:
+                return
+            self._last_report = now
+        progress(self.stats.snapshot())
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, Literal
+
+from langchain_core.documents import Document
+from langchain_text_splitters.base import TextSplitter as BaseTextSplitter
+
+DEFAULT_SEPARATORS = ["\n\n", "\n", " ", ""]
+_REGEX_LOOKAHEAD = 256
+
+
+class StreamingTextSplitter(BaseTextSplitter):
+    def __init__(
+        self,
+        separators: list[str] | None = None,
+        keep_separator: bool | Literal["start", "end"] = True,
+        is_separator_regex: bool = False,
+        *,
+        block_size: int = 1 << 20,
+        **kwargs: Any,
+    ):
+        super().__init__(keep_separator=keep_separator, **kwargs)
+        self._separators = list(separators) if separators is not None else list(DEFAULT_SEPARATORS)
+        self._is_separator_regex = is_separator_regex
+        self._literals = [separator for separator in self._separators if separator]
+        self._patterns = [
+            re.compile(separator if is_separator_regex else re.escape(separator)) for separator in self._literals
+        ]
+        self._hard_split = "" in self._separators or not self._literals
+        self._mode: Literal["start", "end"] | None = (
+            "start" if keep_separator is True else keep_separator if keep_separator else None
+        )
+        self.block_size = max(1, block_size)
+
+    def _boundary(self, start: int, end: int) -> tuple[int, int]:
+        if self._mode == "start":
+            return start, start
+        if self._mode == "end":
+            return end, end
+        return start, end
+
+    def _last(self, level: int, buffer: str, floor: int, limit: int) -> tuple[int, int] | None:
+        if not self._is_separator_regex:
+            separator = self._literals[level]
+            if self._mode == "end":
+                index = buffer.rfind(separator, max(0, floor - len(separator) + 1), limit)
+            else:
+                index = buffer.rfind(separator, floor + 1, limit + len(separator))
+            return None if index < 0 else self._boundary(index, index + len(separator))
+        last: tuple[int, int] | None = None
+        for match in self._patterns[level].finditer(buffer, max(0, floor - _REGEX_LOOKAHEAD), limit + _REGEX_LOOKAHEAD):
+            end, resume = self._boundary(match.start(), match.end())
+            if end > limit:
+                break
+            if end > floor and match.end() > match.start():
+                last = (end, resume)
+        return last
+
+    def _first(self, level: int, buffer: str, low: int, high: int) -> int | None:
+        if not self._is_separator_regex:
+            separator = self._literals[level]
+            index = buffer.find(separator, low, high)
+            return None if index < 0 else self._boundary(index, index + len(separator))[1]
+        for match in self._patterns[level].finditer(buffer, low, high):
+            if match.end() > match.start():
+                return self._boundary(match.start(), match.end())[1]
+        return None
+
+    def _cut(self, buffer: str, pos: int, floor: int) -> tuple[int, int, int | None]:
+        limit = pos + self._chunk_size
+        for level in range(len(self._literals)):
+            found = self._last(level, buffer, floor, limit)
+            if found is not None:
+                return found[0], found[1], level
+        if self._hard_split:
+            return limit, limit, None
+        match = self._patterns[-1].search(buffer, max(limit, floor + 1))
+        if match is None:
+            return len(buffer), len(buffer), None
+        end, resume = self._boundary(match.start(), match.end())
+        return max(end, floor + 1), max(resume, floor + 1), None
+
+    def _overlap_start(self, buffer: str, pos: int, end: int, resume: int, level: int | None) -> int:
+        if self._chunk_overlap <= 0:
+            return resume
+        target = max(pos + 1, end - self._chunk_overlap)
+        if target >= resume:
+            return resume
+        levels = range(len(self._literals)) if level is None else range(level, len(self._literals))
+        for candidate in levels:
+            start = self._first(candidate, buffer, target, end)
+            if start is not None and pos < start < resume:
+                return start
+        return target if self._hard_split else resume
+
+    def _emit(self, offset: int, chunk: str) -> tuple[int, str] | None:
+        if self._strip_whitespace:
+            stripped = chunk.lstrip()
+            offset += len(chunk) - len(stripped)
+            chunk = stripped.rstrip()
+        if not chunk:
+            return None
+        return offset, chunk
+
+    def iter_chunks(self, stream: Iterable[str]) -> Iterator[tuple[int, str]]:
+        pieces = iter(stream)
+        buffer = ""
+        pos = 0
+        floor = 0
+        offset = 0
+        exhausted = False
+        lookahead = self._chunk_size + max(64, self._chunk_size // 4)
+        while True:
+            if not exhausted and len(buffer) - pos < lookahead:
+                parts = [buffer[pos:]]
+                size = len(parts[0])
+                while size < lookahead + self.block_size:
+                    piece = next(pieces, None)
+                    if piece is None:
+                        exhausted = True
+                        break
+                    parts.append(piece)
+                    size += len(piece)
+                buffer = "".join(parts)
+                offset += pos
+                floor -= pos
+                pos = 0
+            if len(buffer) - pos <= self._chunk_size and exhausted:
+                emitted = self._emit(offset + pos, buffer[pos:])
+                if emitted is not None:
+                    yield emitted
+                return
+            end, resume, level = self._cut(buffer, pos, floor)
+            emitted = self._emit(offset + pos, buffer[pos:end])
+            if emitted is not None:
+                yield emitted
+            pos = self._overlap_start(buffer, pos, end, resume, level)
+            floor = max(end, pos)
+
+    def split_stream(self, stream: Iterable[str]) -> Iterator[str]:
+        for _, chunk in self.iter_chunks(stream):
+            yield chunk
+
+    def split_text(self, text: str) -> list[str]:
+        return list(self.split_stream(text[i : i + self.block_size] for i in range(0, len(text), self.block_size)))
+
+    def _read_blocks(self, path: Path, encoding: str) -> Iterator[str]:
+        with path.open(encoding=encoding, errors="replace", newline="") as handle:
+            while True:
+                block = handle.read(self.block_size)
+                if not block:
+                    return
+                yield block
+
+    def _documents(
+        self, chunks: Iterator[tuple[int, str]], metadata: dict[str, Any]
+    ) -> Iterator[Document]:
+        for start, chunk in chunks:
+            chunk_metadata = dict(metadata)
+            if self._add_start_index:
+                chunk_metadata["start_index"] = start
+            yield Document(page_content=chunk, metadata=chunk_metadata)
+
+    def split_file(
+        self,
+        path: str | Path,
+        *,
+        encoding: str = "utf-8",
+        metadata: dict[str, Any] | None = None,
+    ) -> Iterator[Document]:
+        path = Path(path)
+        base = {"source": str(path), **(metadata or {})}
+        yield from self._documents(self.iter_chunks(self._read_blocks(path, encoding)), base)
+
+    def lazy_split_documents(self, documents: Iterable[Document]) -> Iterator[Document]:
+        for document in documents:
+            text = document.page_content
+            blocks = (text[i : i + self.block_size] for i in range(0, len(text), self.block_size))
+            yield from self._documents(self.iter_chunks(blocks), dict(document.metadata))
+
+    def split_documents(self, documents: Iterable[Document]) -> list[Document]:
+        return list(self.lazy_split_documents(documents))
@@ -1,11 +1,18 @@
+from collections.abc import Iterable, Iterator
+from pathlib import Path
 from typing import Any, Literal, Self
 
+from langchain_core.documents import Document
 from langchain_text_splitters import (
     CharacterTextSplitter,
     RecursiveCharacterTextSplitter,
 )
 from langchain_text_splitters.base import TextSplitter as BaseTextSplitter
 
+from robotagent.rag.streaming_splitter import StreamingTextSplitter
+from robotagent.rag.token_splitter import TokenBudgetTextSplitter
+from robotagent.utils.tokens import DEFAULT_ENCODING, TokenCounter
+
 
 class TextSplitter:
     def __init__(self, text_splitter: BaseTextSplitter):
@@ -23,7 +30,7 @@ class TextSplitter:
             separators=separators,
             keep_separator=keep_separator,
             is_separator_regex=is_separator_regex,
-            kwargs=kwargs,
+            **kwargs,
         )
         return cls(splitter)
 
@@ -37,6 +44,63 @@ class TextSplitter:
         splitter = CharacterTextSplitter(
             separator=separator,
             is_separator_regex=is_separator_regex,
-            kwargs=kwargs,
+            **kwargs,
+        )
+        return cls(splitter)
+
+    @classmethod
+    def from_streaming(
+        cls,
+        separators: list[str] | None = None,
+        keep_separator: bool | Literal["start", "end"] = True,
+        is_separator_regex: bool = False,
+        **kwargs: Any,
+    ) -> Self:
+        splitter = StreamingTextSplitter(
+            separators=separators,
+            keep_separator=keep_separator,
+            is_separator_regex=is_separator_regex,
+            **kwargs,
+        )
+        return cls(splitter)
+
+    @classmethod
+    def from_tokens(
+        cls,
+        separators: list[str] | None = None,
+        keep_separator: bool | Literal["start", "end"] = True,
+        is_separator_regex: bool = False,
+        *,
+        encoding_name: str = DEFAULT_ENCODING,
+        counter: TokenCounter | None = None,
+        **kwargs: Any,
+    ) -> Self:
+        splitter = TokenBudgetTextSplitter(
+            separators=separators,
+            keep_separator=keep_separator,
+            is_separator_regex=is_separator_regex,
+            encoding_name=encoding_name,
+            counter=counter,
+            **kwargs,
         )
-        return splitter
+        return cls(splitter)
+
+    def split_text(self, text: str) -> list[str]:
+        return self._text_splitter.split_text(text)
+
+    def split_documents(self, documents: Iterable[Document]) -> list[Document]:
+        return self._text_splitter.split_documents(documents)
+
+    def lazy_split_documents(self, documents: Iterable[Document]) -> Iterator[Document]:
+        if isinstance(self._text_splitter, StreamingTextSplitter):
+            yield from self._text_splitter.lazy_split_documents(documents)
+            return
+        for document in documents:
+            yield from self._text_splitter.split_documents([document])
+
+    def split_file(self, path: str | Path, *, encoding: str = "utf-8") -> Iterator[Document]:
+        if isinstance(self._text_splitter, StreamingTextSplitter):
+            yield from self._text_splitter.split_file(path, encoding=encoding)
+            return
+        text = Path(path).read_text(encoding=encoding)
+        yield from self._text_splitter.split_documents([Document(page_content=text, metadata={"source": str(path)})])
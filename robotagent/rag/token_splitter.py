@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import re
+from collections import deque
+from typing import Any, Literal
+
+from langchain_text_splitters.base import TextSplitter as BaseTextSplitter
+
+from robotagent.utils.tokens import DEFAULT_ENCODING, TokenCounter
+
+DEFAULT_SEPARATORS = ["\n\n", "\n", "。", "！", "？", ". ", " ", ""]
+
+
+class TokenBudgetTextSplitter(BaseTextSplitter):
+    def __init__(
+        self,
+        separators: list[str] | None = None,
+        keep_separator: bool | Literal["start", "end"] = True,
+        is_separator_regex: bool = False,
+        *,
+        encoding_name: str = DEFAULT_ENCODING,
+        counter: TokenCounter | None = None,
+        **kwargs: Any,
+    ):
+        counter = counter or TokenCounter(encoding_name)
+        kwargs.setdefault("chunk_size", 512)
+        kwargs.setdefault("chunk_overlap", 64)
+        super().__init__(keep_separator=keep_separator, length_function=counter, **kwargs)
+        self.counter = counter
+        self._separators = list(separators) if separators is not None else list(DEFAULT_SEPARATORS)
+        self._is_separator_regex = is_separator_regex
+        self._literals = [separator for separator in self._separators if separator]
+        self._patterns = [
+            re.compile(separator if is_separator_regex else re.escape(separator)) for separator in self._literals
+        ]
+        self._hard_split = "" in self._separators or not self._literals
+
+    def _split(self, text: str, pattern: re.Pattern[str]) -> list[str]:
+        if not self._keep_separator:
+            return [piece for piece in pattern.split(text) if piece]
+        pieces: list[str] = []
+        last = 0
+        for match in pattern.finditer(text):
+            if match.end() == match.start():
+                continue
+            cut = match.start() if self._keep_separator is True or self._keep_separator == "start" else match.end()
+            if cut > last:
+                pieces.append(text[last:cut])
+                last = cut
+        if last < len(text):
+            pieces.append(text[last:])
+        return pieces
+
+    def _merge(self, splits: list[str], counts: list[int], separator: str) -> list[str]:
+        joiner = self.counter(separator) if separator else 0
+        chunks: list[str] = []
+        window: deque[int] = deque()
+        total = 0
+        for i, count in enumerate(counts):
+            if window and total + count + joiner > self._chunk_size:
+                chunk = self._join_docs([splits[j] for j in window], separator)
+                if chunk is not None:
+                    chunks.append(chunk)
+                while window and (total > self._chunk_overlap or total + count + joiner > self._chunk_size):
+                    total -= counts[window[0]] + (joiner if len(window) > 1 else 0)
+                    window.popleft()
+            total += count + (joiner if window else 0)
+            window.append(i)
+        if window:
+            chunk = self._join_docs([splits[j] for j in window], separator)
+            if chunk is not None:
+                chunks.append(chunk)
+        return chunks
+
+    def _split_level(self, text: str, level: int) -> list[str]:
+        if level >= len(self._patterns):
+            if self._hard_split and self.counter(text) > self._chunk_size:
+                pieces = self.counter.split(text, self._chunk_size)
+                return self._merge(pieces, self.counter.count_many(pieces), "")
+            chunk = self._join_docs([text], "")
+            return [chunk] if chunk is not None else []
+        splits = self._split(text, self._patterns[level])
+        if len(splits) <= 1:
+            return self._split_level(text, level + 1)
+        counts = self.counter.count_many(splits)
+        separator = "" if self._keep_separator else self._literals[level]
+        chunks: list[str] = []
+        start = 0
+        for i, count in enumerate(counts):
+            if count <= self._chunk_size:
+                continue
+            if start < i:
+                chunks.extend(self._merge(splits[start:i], counts[start:i], separator))
+            chunks.extend(self._split_level(splits[i], level + 1))
+            start = i + 1
+        if start < len(splits):
+            chunks.extend(self._merge(splits[start:], counts[start:], separator))
+        return chunks
+
+    def split_text(self, text: str) -> list[str]:
+        if not text:
+            return []
+        return self._split_level(text, 0)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from robotagent.rag.document_loader import DocumentLoader
+
+
+def _write_corpus(root: Path, rows: int) -> tuple[Path, Path]:
+    jsonl_path = root / "telemetry.jsonl"
+    csv_path = root / "telemetry.csv"
+    with jsonl_path.open("w", encoding="utf-8") as handle:
+        for i in range(rows):
+            record = {
+                "id": i,
+                "robot": f"arm-{i % 16}",
+                "event": {"text": f"joint {i % 7} torque spike {i * 0.37:.2f} Nm during pick cycle", "level": "warn"},
+            }
+            handle.write(json.dumps(record) + "\n")
+    with csv_path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["id", "robot", "message", "level"])
+        for i in range(rows):
+            writer.writerow([i, f"arm-{i % 16}", f"joint {i % 7} torque spike {i * 0.37:.2f} Nm", "warn"])
+    return jsonl_path, csv_path
+
+
+def _measure(name: str, rows: int, make: Callable[[], DocumentLoader]) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        count = sum(1 for _ in make().lazy_load())
+    except Exception as e:  # noqa: BLE001
+        tracemalloc.stop()
+        print(f"{name:<28} failed: {e}")
+        return
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<28} {count:>9} {elapsed:>9.3f} {rows / elapsed:>12.0f} {peak / 1024 / 1024:>10.2f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare JSONL/CSV loaders")
+    parser.add_argument("--rows", type=int, default=200_000, help="Rows per generated file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl_path, csv_path = _write_corpus(Path(tmp), args.rows)
+        print(f"{'loader':<28} {'docs':>9} {'seconds':>9} {'rows/s':>12} {'peak_mb':>10}")
+        _measure(
+            "JSONLoader (jq)",
+            args.rows,
+            lambda: DocumentLoader.from_json(jsonl_path, jq_schema=".event.text", json_lines=True),
+        )
+        _measure(
+            "JSONLinesLoader (mmap)",
+            args.rows,
+            lambda: DocumentLoader.from_jsonl(jsonl_path, content_key="event.text", metadata_keys=["robot"]),
+        )
+        _measure(
+            "CSVLoader",
+            args.rows,
+            lambda: DocumentLoader.from_csv(csv_path, metadata_columns=["robot"]),
+        )
+        _measure(
+            "ChunkedCSVLoader",
+            args.rows,
+            lambda: DocumentLoader.from_csv_chunked(csv_path, metadata_columns=["robot"]),
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
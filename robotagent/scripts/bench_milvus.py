@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from robotagent.configs.settings import StorageSettings, get_settings
+from robotagent.storage.milvus import MilvusVectorStore
+
+
+class _HashEmbedding:
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def embed_query(self, text: str) -> list[float]:
+        seed = int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+        vector = np.random.default_rng(seed).normal(size=self.dim)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_query(text) for text in texts]
+
+
+def _corpus(size: int, dim: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(64, dim)).astype(np.float32)
+    labels = rng.integers(0, len(centers), size=size)
+    vectors = centers[labels] + rng.normal(scale=0.6, size=(size, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _exact(corpus: np.ndarray, queries: np.ndarray, k: int) -> list[set[str]]:
+    scores = queries @ corpus.T
+    top = np.argpartition(scores, -k, axis=1)[:, -k:]
+    return [{str(i) for i in row} for row in top]
+
+
+def _recall(found: list[list[str]], exact: list[set[str]], k: int) -> float:
+    return sum(len(set(a) & b) for a, b in zip(found, exact)) / (k * len(exact))
+
+
+def _report(name: str, count: int, seconds: float, recall: float | None = None) -> None:
+    recall_text = f"{recall:>10.3f}" if recall is not None else f"{'-':>10}"
+    print(f"{name:<24} {count:>9} {seconds:>9.3f} {count / seconds:>12.0f} {recall_text}")
+
+
+async def _search_async(store: MilvusVectorStore, queries: np.ndarray, k: int, concurrency: int) -> list[list[str]]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(query: np.ndarray) -> list[str]:
+        async with semaphore:
+            return [doc.id for doc in await store.asimilarity_search_by_vector(query.tolist(), k)]
+
+    return await asyncio.gather(*(one(query) for query in queries))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure Milvus insert and search throughput")
+    parser.add_argument("--uri", default=None, help="Milvus URI; defaults to a temporary Milvus Lite file")
+    parser.add_argument("--size", type=int, default=20_000, help="Number of inserted vectors")
+    parser.add_argument("--dim", type=int, default=384, help="Vector dimension")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per query")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[64, 512, 2048], help="Insert batch sizes")
+    parser.add_argument("--search-batch", type=int, default=64, help="Queries per batched search call")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent async searches")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    vectors = _corpus(args.size + args.queries, args.dim, args.seed)
+    corpus, queries = vectors[: args.size], vectors[args.size :]
+    texts = [str(i) for i in range(args.size)]
+    exact = _exact(corpus, queries, args.k)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = get_settings().storage
+        if args.uri is None:
+            settings = StorageSettings(
+                milvus_lite_path=str(Path(tmp) / "bench.db"),
+                milvus_index_type="FLAT",
+                milvus_index_params={},
+                milvus_search_params={},
+            )
+        print(f"{'operation':<24} {'count':>9} {'seconds':>9} {'per_second':>12} {'recall':>10}")
+        store: MilvusVectorStore | None = None
+        for batch_size in args.batch_sizes:
+            store = MilvusVectorStore(
+                _HashEmbedding(args.dim),
+                uri=args.uri,
+                collection_name=f"bench_{batch_size}",
+                insert_batch_size=batch_size,
+                consistency_level="Strong",
+                drop_old=True,
+                settings=settings,
+            )
+            started = time.perf_counter()
+            store.add_embeddings(texts, corpus, ids=texts)
+            _report(f"insert/batch={batch_size}", args.size, time.perf_counter() - started)
+        if store is None:
+            return 0
+
+        started = time.perf_counter()
+        found = [[doc.id for doc in store.similarity_search_by_vector(query.tolist(), args.k)] for query in queries]
+        _report("search/sequential", args.queries, time.perf_counter() - started, _recall(found, exact, args.k))
+
+        started = time.perf_counter()
+        found = []
+        for start in range(0, args.queries, args.search_batch):
+            batch = queries[start : start + args.search_batch].tolist()
+            found.extend([doc.id for doc in hits] for hits in store.similarity_search_by_vectors(batch, args.k))
+        seconds = time.perf_counter() - started
+        _report(f"search/batch={args.search_batch}", args.queries, seconds, _recall(found, exact, args.k))
+
+        started = time.perf_counter()
+        found = asyncio.run(_search_async(store, queries, args.k, args.concurrency))
+        seconds = time.perf_counter() - started
+        _report(f"search/async={args.concurrency}", args.queries, seconds, _recall(found, exact, args.k))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
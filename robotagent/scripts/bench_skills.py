@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from robotagent.skills import SkillIndex
+from robotagent.utils.tokens import count_tokens
+
+_COMMANDS = [
+    "update the intent labels for grasp commands",
+    "add bolts and nuts to the perception object vocabulary",
+    "change the execution plan for placing a box",
+    "wire deepagent memory and skills",
+    "抓取桌子上的瓶子",
+]
+
+
+def _make_corpus(root: Path, count: int) -> None:
+    sources = sorted((Path(__file__).resolve().parents[1] / "skills").glob("*/SKILL.md"))
+    for i in range(count):
+        source = sources[i % len(sources)].parent
+        target = root / f"{source.name}-{i:04d}"
+        shutil.copytree(source, target)
+        skill_file = target / "SKILL.md"
+        text = skill_file.read_text(encoding="utf-8")
+        skill_file.write_text(
+            text.replace(f"name: {source.name}", f"name: {source.name}-{i:04d}", 1),
+            encoding="utf-8",
+        )
+
+
+def _bench(count: int, top_k: int) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _make_corpus(root, count)
+        started = time.perf_counter()
+        index = SkillIndex.load(root)
+        load_ms = (time.perf_counter() - started) * 1000
+
+        wholesale = sum(count_tokens(path.read_text(encoding="utf-8")) for path in root.glob("*/SKILL.md"))
+        descriptors = count_tokens(index.descriptors())
+        selected_tokens = 0
+        select_ms = 0.0
+        for command in _COMMANDS:
+            started = time.perf_counter()
+            rendered = index.render(command, top_k)
+            select_ms += (time.perf_counter() - started) * 1000
+            selected_tokens += count_tokens(rendered)
+    return {
+        "skills": count,
+        "load_ms": load_ms,
+        "wholesale_tokens": wholesale,
+        "indexed_tokens": descriptors + selected_tokens / len(_COMMANDS),
+        "select_ms": select_ms / len(_COMMANDS),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Prompt tokens per request: wholesale vs indexed skills")
+    parser.add_argument("--sizes", default="5,10,20,50,100,200", help="Comma-separated skill counts")
+    parser.add_argument("--top-k", type=int, default=2, help="Skills inlined per request")
+    args = parser.parse_args()
+
+    print(f"{'skills':>7} {'load_ms':>9} {'wholesale':>10} {'indexed':>9} {'select_ms':>10}")
+    for size in (int(value) for value in args.sizes.split(",") if value.strip()):
+        row = _bench(size, args.top_k)
+        print(
+            f"{row['skills']:>7} {row['load_ms']:>9.2f} {row['wholesale_tokens']:>10.0f} "
+            f"{row['indexed_tokens']:>9.0f} {row['select_ms']:>10.3f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from robotagent.rag.text_splitter import TextSplitter
+from robotagent.utils.tokens import count_tokens
+
+_WORDS = (
+    "gripper", "joint", "torque", "servo", "encoder", "calibration", "payload", "trajectory", "collision", "sensor",
+    "firmware", "controller", "axis", "offset", "homing", "vacuum", "conveyor", "pallet", "camera", "lidar",
+)
+
+
+def _write_corpus(path: Path, megabytes: int, seed: int) -> int:
+    rng = random.Random(seed)
+    target = megabytes * 1024 * 1024
+    written = 0
+    with path.open("w", encoding="utf-8") as handle:
+        while written < target:
+            lines = []
+            for _ in range(rng.randint(1, 8)):
+                words = rng.choices(_WORDS, k=rng.randint(4, 40))
+                lines.append(" ".join(words) + f" code E{rng.randint(100, 999)}.")
+            paragraph = "\n".join(lines) + "\n\n"
+            handle.write(paragraph)
+            written += len(paragraph)
+    return written
+
+
+def _measure(name: str, size: int, run: Callable[[], Iterable[object]]) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        count = sum(1 for _ in run())
+    except Exception as e:  # noqa: BLE001
+        tracemalloc.stop()
+        print(f"{name:<28} failed: {e}")
+        return
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<28} {count:>9} {elapsed:>9.3f} {size / elapsed / 1024 / 1024:>10.2f} {peak / 1024 / 1024:>10.2f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare text splitters")
+    parser.add_argument("--megabytes", type=int, default=32, help="Size of the generated corpus")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    parser.add_argument("--chunk-tokens", type=int, default=256)
+    parser.add_argument("--overlap-tokens", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    options = {"chunk_size": args.chunk_size, "chunk_overlap": args.chunk_overlap}
+    token_options = {"chunk_size": args.chunk_tokens, "chunk_overlap": args.overlap_tokens}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "corpus.txt"
+        size = _write_corpus(path, args.megabytes, args.seed)
+        print(f"{'splitter':<28} {'chunks':>9} {'seconds':>9} {'mb/s':>10} {'peak_mb':>10}")
+        _measure(
+            "RecursiveCharacter",
+            size,
+            lambda: TextSplitter.from_recursive_character(**options).split_text(path.read_text(encoding="utf-8")),
+        )
+        _measure(
+            "Character",
+            size,
+            lambda: TextSplitter.from_character(**options).split_text(path.read_text(encoding="utf-8")),
+        )
+        _measure(
+            "Streaming split_text",
+            size,
+            lambda: TextSplitter.from_streaming(**options).split_text(path.read_text(encoding="utf-8")),
+        )
+        _measure(
+            "Streaming split_file",
+            size,
+            lambda: TextSplitter.from_streaming(**options).split_file(path),
+        )
+        _measure(
+            "Recursive (token length)",
+            size,
+            lambda: TextSplitter.from_recursive_character(
+                length_function=count_tokens, **token_options
+            ).split_text(path.read_text(encoding="utf-8")),
+        )
+        _measure(
+            "TokenBudget (cached)",
+            size,
+            lambda: TextSplitter.from_tokens(**token_options).split_text(path.read_text(encoding="utf-8")),
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from robotagent.storage.local import FlatVectorStore, IVFVectorStore
+from robotagent.storage.mmr import maximal_marginal_relevance
+
+
+class _HashEmbedding:
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def embed_query(self, text: str) -> list[float]:
+        seed = int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+        vector = np.random.default_rng(seed).normal(size=self.dim)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_query(text) for text in texts]
+
+
+def _corpus(size: int, dim: int, clusters: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=size)
+    return centers[labels] + rng.normal(scale=0.6, size=(size, dim)).astype(np.float32)
+
+
+def _search_all(store: FlatVectorStore, queries: np.ndarray, k: int, **kwargs) -> tuple[list[set[str]], float]:
+    started = time.perf_counter()
+    results = [
+        {doc.id for doc in store.similarity_search_by_vector(query, k=k, **kwargs)}
+        for query in queries
+    ]
+    return results, time.perf_counter() - started
+
+
+def _resident_mb(store: FlatVectorStore) -> float:
+    return sum(store.memory_usage().values()) / 1024 / 1024
+
+
+def _report(name: str, found: list[set[str]], exact: list[set[str]], seconds: float, k: int, memory_mb: float) -> None:
+    recall = sum(len(a & b) for a, b in zip(found, exact)) / (k * len(exact))
+    print(f"{name:<20} {recall:>10.3f} {len(exact) / seconds:>10.0f} {seconds * 1000 / len(exact):>10.2f} {memory_mb:>10.1f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare exact flat search with IVF approximate search")
+    parser.add_argument("--size", type=int, default=200_000, help="Number of indexed vectors")
+    parser.add_argument("--dim", type=int, default=384, help="Vector dimension")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per query")
+    parser.add_argument("--nlist", type=int, default=1024, help="IVF list count")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32, 64], help="Probe counts to sweep")
+    parser.add_argument("--rerank-factor", type=int, default=4, help="Candidates re-ranked per result when quantized")
+    parser.add_argument("--mmr-fetch-k", type=int, default=200, help="Candidates diversified per query with MMR")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    vectors = _corpus(args.size + args.queries, args.dim, max(64, args.nlist // 4), args.seed)
+    corpus, queries = vectors[: args.size], vectors[args.size :]
+    texts = [str(i) for i in range(args.size)]
+
+    flat = FlatVectorStore(_HashEmbedding(args.dim), initial_capacity=args.size)
+    flat.add_embeddings(texts, corpus, ids=texts)
+
+    ivf = IVFVectorStore(_HashEmbedding(args.dim), nlist=args.nlist, initial_capacity=args.size)
+    ivf.add_embeddings(texts, corpus, ids=texts)
+    started = time.perf_counter()
+    ivf.train()
+    train_seconds = time.perf_counter() - started
+
+    exact, exact_seconds = _search_all(flat, queries, args.k)
+    print(f"vectors={args.size} dim={args.dim} nlist={args.nlist} train_seconds={train_seconds:.2f}")
+    print(f"{'index':<20} {'recall@' + str(args.k):>10} {'qps':>10} {'ms/query':>10} {'ram_mb':>10}")
+    _report("flat", exact, exact, exact_seconds, args.k, _resident_mb(flat))
+    for nprobe in args.nprobe:
+        found, seconds = _search_all(ivf, queries, args.k, nprobe=nprobe)
+        _report(f"ivf/{nprobe}", found, exact, seconds, args.k, _resident_mb(ivf))
+
+    started = time.perf_counter()
+    for query in queries:
+        _, candidates = flat.similarity_search_with_vectors_by_vector(query, k=args.mmr_fetch_k)
+        maximal_marginal_relevance(query, candidates, k=args.k)
+    seconds = time.perf_counter() - started
+    name = f"flat+mmr/{args.mmr_fetch_k}"
+    print(f"{name:<20} {'-':>10} {len(queries) / seconds:>10.0f} {seconds * 1000 / len(queries):>10.2f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for quantization in ("float16", "int8"):
+            store = FlatVectorStore(
+                _HashEmbedding(args.dim),
+                initial_capacity=args.size,
+                quantization=quantization,
+                rerank_factor=args.rerank_factor,
+            )
+            store.add_embeddings(texts, corpus, ids=texts)
+            store.save(Path(tmp) / quantization)
+            found, seconds = _search_all(store, queries, args.k)
+            _report(f"flat/{quantization}", found, exact, seconds, args.k, _resident_mb(store))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
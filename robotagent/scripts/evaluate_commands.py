@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any
+
+_TEXT_KEYS = ("text", "command", "input")
+_SUBAGENTS = ("intent", "perception", "execution")
+
+_AGENT: Any = None
+_RUN_FULL = False
+
+
+def _init_worker(model: str | None, run_full: bool) -> None:
+    global _AGENT, _RUN_FULL
+    from robotagent.agents.robot_agent import RobotAgent
+
+    _AGENT = RobotAgent(model, use_memory=False)
+    _RUN_FULL = run_full
+
+
+def _compare_intent(agent: Any, text: str) -> dict[str, Any]:
+    intent, confidence, entities = agent._heuristic_intent(text)
+    heuristic = {"intent": intent, "confidence": confidence, "entities": entities}
+    llm = agent._model_intent(text) if agent.model is not None else None
+    agree = None
+    if llm is not None:
+        llm_intent = str(llm.get("intent") or "").strip().lower()
+        agree = llm_intent == intent
+    return {"heuristic": heuristic, "llm": llm, "agree": agree}
+
+
+def _compare_perception(agent: Any, text: str) -> dict[str, Any]:
+    objects, scene = agent._heuristic_perception(text)
+    heuristic = {"objects": objects, "scene": scene}
+    llm = agent._model_perception(text) if agent.model is not None else None
+    agree = None
+    if llm is not None:
+        raw_objects = llm.get("objects")
+        llm_objects = raw_objects if isinstance(raw_objects, list) else []
+        agree = {str(item).strip().lower() for item in llm_objects} == set(objects)
+    return {"heuristic": heuristic, "llm": llm, "agree": agree}
+
+
+def _compare_execution(agent: Any, text: str) -> dict[str, Any]:
+    plan, actions = agent._heuristic_plan(text)
+    heuristic = {"plan": plan, "actions": actions}
+    llm = agent._model_plan(text) if agent.model is not None else None
+    agree = None
+    if llm is not None:
+        raw_actions = llm.get("actions")
+        llm_actions = raw_actions if isinstance(raw_actions, list) else []
+        agree = [str(item).strip().lower() for item in llm_actions] == actions
+    return {"heuristic": heuristic, "llm": llm, "agree": agree}
+
+
+def _evaluate(record_id: str, text: str) -> dict[str, Any]:
+    started = time.perf_counter()
+    result: dict[str, Any] = {"id": record_id, "text": text}
+    try:
+        result["intent"] = _compare_intent(_AGENT.intent_agent, text)
+        result["perception"] = _compare_perception(_AGENT.perception_agent, text)
+        result["execution"] = _compare_execution(_AGENT.execution_agent, text)
+        if _RUN_FULL:
+            result["output"] = str(_AGENT(text))
+    except Exception as e:  # noqa: BLE001
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["elapsed_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+class EvaluationSummary:
+    def __init__(self) -> None:
+        self.total = 0
+        self.errors = 0
+        self.compared = dict.fromkeys(_SUBAGENTS, 0)
+        self.agreed = dict.fromkeys(_SUBAGENTS, 0)
+        self.llm_missing = dict.fromkeys(_SUBAGENTS, 0)
+
+    def add(self, result: dict[str, Any]) -> None:
+        self.total += 1
+        if "error" in result:
+            self.errors += 1
+            return
+        for name in _SUBAGENTS:
+            agree = (result.get(name) or {}).get("agree")
+            if agree is None:
+                self.llm_missing[name] += 1
+                continue
+            self.compared[name] += 1
+            if agree:
+                self.agreed[name] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        agreement = {}
+        for name in _SUBAGENTS:
+            compared = self.compared[name]
+            agreement[name] = {
+                "compared": compared,
+                "agreed": self.agreed[name],
+                "llm_missing": self.llm_missing[name],
+                "agreement": self.agreed[name] / compared if compared else None,
+            }
+        return {"total": self.total, "errors": self.errors, "agreement": agreement}
+
+
+def _iter_commands(path: Path) -> Iterator[tuple[str, str]]:
+    with path.open(encoding="utf-8") as handle:
+        for line_no, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"[warn] skipping invalid JSON on line {line_no}", file=sys.stderr)
+                continue
+            if isinstance(data, str):
+                yield str(line_no), data
+                continue
+            if not isinstance(data, dict):
+                continue
+            text = next((data[key] for key in _TEXT_KEYS if isinstance(data.get(key), str)), None)
+            if text is None:
+                print(f"[warn] no command text on line {line_no}", file=sys.stderr)
+                continue
+            yield str(data.get("id", line_no)), text
+
+
+def _load_completed(path: Path, summary: EvaluationSummary) -> set[str]:
+    completed: set[str] = set()
+    if not path.exists():
+        return completed
+    tmp = path.with_name(path.name + ".tmp")
+    with path.open(encoding="utf-8") as handle, tmp.open("w", encoding="utf-8") as kept:
+        for line in handle:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(result, dict) and result.get("error"):
+                continue
+            kept.write(line.rstrip("\n") + "\n")
+            if isinstance(result, dict) and "id" in result:
+                completed.add(str(result["id"]))
+                summary.add(result)
+    os.replace(tmp, path)
+    return completed
+
+
+def _open_output(path: Path, resume: bool):
+    if not resume or not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path.open("w", encoding="utf-8")
+    return path.open("a", encoding="utf-8")
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    input_path = Path(args.input)
+    output_path = Path(args.output)
+    summary = EvaluationSummary()
+    completed = _load_completed(output_path, summary) if args.resume else set()
+    skipped = len(completed)
+    max_pending = max(1, args.workers * args.prefetch)
+
+    started = time.perf_counter()
+    processed = 0
+    last_report = started
+    with _open_output(output_path, args.resume) as out, ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_init_worker,
+        initargs=(args.model, args.full),
+    ) as pool:
+        pending: set[Future] = set()
+
+        def drain(block_until: int) -> None:
+            nonlocal pending, processed, last_report
+            while len(pending) > block_until:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                    summary.add(result)
+                    processed += 1
+                out.flush()
+                now = time.perf_counter()
+                if args.report_every and now - last_report >= args.report_every:
+                    rate = processed / (now - started)
+                    print(f"[progress] {processed} done ({rate:.1f} cmd/s)", file=sys.stderr)
+                    last_report = now
+
+        for record_id, text in _iter_commands(input_path):
+            if record_id in completed:
+                continue
+            if args.limit and processed + len(pending) >= args.limit:
+                break
+            pending.add(pool.submit(_evaluate, record_id, text))
+            drain(max_pending - 1)
+        drain(0)
+
+    elapsed = time.perf_counter() - started
+    report = summary.as_dict()
+    report.update(
+        {
+            "processed": processed,
+            "skipped": skipped,
+            "elapsed_s": elapsed,
+            "throughput_cmd_s": processed / elapsed if elapsed > 0 else 0.0,
+        }
+    )
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Evaluate RobotAgent subagents against a JSONL command log")
+    parser.add_argument("input", help="JSONL file with one command per line ('text', 'command' or 'input' key)")
+    parser.add_argument("--output", required=True, help="JSONL file receiving one result per command")
+    parser.add_argument("--workers", type=int, default=4, help="Number of worker processes")
+    parser.add_argument("--prefetch", type=int, default=4, help="In-flight commands per worker")
+    parser.add_argument("--model", help="Chat model name (default: configured model)")
+    parser.add_argument("--full", action="store_true", help="Also run the full RobotAgent per command")
+    parser.add_argument("--resume", action="store_true", help="Skip ids already completed in --output and retry errored ones")
+    parser.add_argument("--limit", type=int, default=0, help="Stop after this many new commands")
+    parser.add_argument("--report-every", type=float, default=10.0, help="Progress interval in seconds")
+    parser.add_argument("--summary", help="Write the final summary JSON to this path")
+    args = parser.parse_args()
+
+    report = run(args)
+    rendered = json.dumps(report, ensure_ascii=False, indent=2)
+    print(rendered)
+    if args.summary:
+        Path(args.summary).write_text(rendered + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
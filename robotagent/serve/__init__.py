@@ -0,0 +1,16 @@
+from robotagent.serve.app import ServeApp, create_app
+from robotagent.serve.pool import (
+    AgentPool,
+    LatencyTracker,
+    PoolClosedError,
+    QueueFullError,
+)
+
+__all__ = [
+    "AgentPool",
+    "LatencyTracker",
+    "PoolClosedError",
+    "QueueFullError",
+    "ServeApp",
+    "create_app",
+]
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import argparse
+
+from robotagent.serve.app import create_app
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve RobotAgent over HTTP")
+    parser.add_argument("--host", help="Bind host (default: serve.host)")
+    parser.add_argument("--port", type=int, help="Bind port (default: serve.port)")
+    parser.add_argument("--workers", type=int, help="Number of warm agents")
+    parser.add_argument("--max-queue-size", type=int, help="Maximum queued plus running commands")
+    parser.add_argument("--timeout", type=float, help="Per-command timeout in seconds")
+    parser.add_argument("--model", help="Chat model name for every agent")
+    parser.add_argument("--warmup", help="Command sent once to every agent at startup")
+    parser.add_argument("--log-level", default="info", help="Server log level")
+    args = parser.parse_args()
+
+    try:
+        import uvicorn  # type: ignore
+    except Exception as e:
+        raise RuntimeError("uvicorn is required to run the server: pip install 'robotagent[serve]'") from e
+
+    host, port = args.host, args.port
+    if host is None or port is None:
+        from robotagent.configs.settings import get_settings
+
+        serve = get_settings().serve
+        host = host or serve.host
+        port = port or serve.port
+
+    app = create_app(
+        model=args.model,
+        workers=args.workers,
+        max_queue_size=args.max_queue_size,
+        request_timeout=args.timeout,
+        warmup_text=args.warmup,
+    )
+    uvicorn.run(app, host=host, port=port, log_level=args.log_level, lifespan="on")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
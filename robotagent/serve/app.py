@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from robotagent.configs.settings import get_settings
+from robotagent.serve.pool import (
+    AgentFactory,
+    AgentPool,
+    PoolClosedError,
+    QueueFullError,
+)
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict[str, Any]]]
+Send = Callable[[dict[str, Any]], Awaitable[None]]
+
+_MAX_BODY_BYTES = 1 << 20
+
+
+def _default_agent_factory(model: str | None = None) -> AgentFactory:
+    lock = threading.Lock()
+    shared: dict[str, Any] = {}
+
+    def factory():
+        from robotagent.agents.robot_agent import RobotAgent
+
+        with lock:
+            agent = RobotAgent(model, memory=shared.get("memory"), skills=shared.get("skills"))
+            shared.setdefault("memory", agent.memory)
+            shared.setdefault("skills", agent.skills)
+        return agent
+
+    return factory
+
+
+def _to_jsonable(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, dict):
+        return {str(k): _to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(item) for item in value]
+    content = getattr(value, "content", None)
+    if isinstance(content, str):
+        return content
+    return str(value)
+
+
+class ServeApp:
+    def __init__(self, pool: AgentPool):
+        self.pool = pool
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        method = scope.get("method", "GET")
+        path = scope.get("path", "/").rstrip("/") or "/"
+        if path == "/healthz":
+            if method != "GET":
+                await self._json(send, 405, {"error": "method not allowed"})
+                return
+            await self._json(send, 200, {"status": "ok", "ready": self.pool.started})
+            return
+        if path == "/metrics":
+            if method != "GET":
+                await self._json(send, 405, {"error": "method not allowed"})
+                return
+            await self._json(send, 200, self.pool.metrics())
+            return
+        if path == "/v1/commands":
+            if method != "POST":
+                await self._json(send, 405, {"error": "method not allowed"})
+                return
+            await self._handle_command(receive, send)
+            return
+        await self._json(send, 404, {"error": "not found"})
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.pool.start()
+                except Exception as e:  # noqa: BLE001
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.pool.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _handle_command(self, receive: Receive, send: Send) -> None:
+        try:
+            payload = json.loads(await self._read_body(receive) or b"{}")
+        except ValueError as e:
+            await self._json(send, 400, {"error": f"invalid request body: {e}"})
+            return
+        if not isinstance(payload, dict):
+            await self._json(send, 400, {"error": "request body must be a JSON object"})
+            return
+        text = payload.get("text")
+        if not isinstance(text, str) or not text.strip():
+            await self._json(send, 400, {"error": "'text' must be a non-empty string"})
+            return
+        session_id = payload.get("session_id")
+        if session_id is not None:
+            session_id = str(session_id)
+
+        started = time.perf_counter()
+        try:
+            output = await self.pool.submit(text, session_id=session_id)
+        except (QueueFullError, PoolClosedError) as e:
+            await self._json(send, 503, {"error": str(e)})
+            return
+        except TimeoutError:
+            await self._json(send, 504, {"error": "agent timed out"})
+            return
+        except Exception as e:  # noqa: BLE001
+            await self._json(send, 500, {"error": f"agent failed: {e}"})
+            return
+        await self._json(
+            send,
+            200,
+            {
+                "session_id": session_id,
+                "output": _to_jsonable(output),
+                "latency_ms": (time.perf_counter() - started) * 1000,
+            },
+        )
+
+    @staticmethod
+    async def _read_body(receive: Receive) -> bytes:
+        chunks: list[bytes] = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            body = message.get("body", b"")
+            size += len(body)
+            if size > _MAX_BODY_BYTES:
+                raise ValueError("body too large")
+            chunks.append(body)
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    @staticmethod
+    async def _json(send: Send, status: int, data: Any) -> None:
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"application/json; charset=utf-8"),
+                    (b"content-length", str(len(body)).encode("ascii")),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+def create_app(
+    agent_factory: AgentFactory | None = None,
+    *,
+    model: str | None = None,
+    workers: int | None = None,
+    max_queue_size: int | None = None,
+    request_timeout: float | None = None,
+    warmup_text: str | None = None,
+) -> ServeApp:
+    serve = get_settings().serve
+    workers = workers if workers is not None else serve.workers
+    max_queue_size = max_queue_size if max_queue_size is not None else serve.max_queue_size
+    request_timeout = request_timeout if request_timeout is not None else serve.request_timeout
+    pool = AgentPool(
+        agent_factory or _default_agent_factory(model),
+        workers=workers or 4,
+        max_queue_size=max_queue_size or 256,
+        request_timeout=request_timeout,
+        warmup_text=warmup_text,
+    )
+    return ServeApp(pool)
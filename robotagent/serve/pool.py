@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+AgentFactory = Callable[[], Callable[[str], Any]]
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class PoolClosedError(RuntimeError):
+    pass
+
+
+class LatencyTracker:
+    def __init__(self, window: int = 1024):
+        self._samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, q: float) -> float:
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+        return ordered[index]
+
+    def snapshot(self) -> dict[str, float]:
+        mean = self.total / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "mean_ms": mean * 1000,
+            "p50_ms": self.percentile(0.5) * 1000,
+            "p95_ms": self.percentile(0.95) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+        }
+
+
+def _accepts_session_id(agent: Callable[..., Any]) -> bool:
+    try:
+        signature = inspect.signature(agent)
+    except (TypeError, ValueError):
+        return False
+    for parameter in signature.parameters.values():
+        if parameter.kind is inspect.Parameter.VAR_KEYWORD or parameter.name == "session_id":
+            return True
+    return False
+
+
+class _Session:
+    __slots__ = ("lock", "pending", "tail")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.pending = 0
+        self.tail: asyncio.Future | None = None
+
+
+class AgentPool:
+    def __init__(
+        self,
+        agent_factory: AgentFactory,
+        *,
+        workers: int = 4,
+        max_queue_size: int = 256,
+        request_timeout: float | None = None,
+        warmup_text: str | None = None,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.agent_factory = agent_factory
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self.request_timeout = request_timeout
+        self.warmup_text = warmup_text
+        self._executor: ThreadPoolExecutor | None = None
+        self._idle: asyncio.Queue | None = None
+        self._sessions: dict[str, _Session] = {}
+        self._session_aware: dict[int, bool] = {}
+        self._start_lock = asyncio.Lock()
+        self._started = False
+        self._queued = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._queue_latency = LatencyTracker()
+        self._run_latency = LatencyTracker()
+        self._total_latency = LatencyTracker()
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    async def start(self) -> None:
+        async with self._start_lock:
+            if self._started:
+                return
+            loop = asyncio.get_running_loop()
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="robotagent-serve")
+            agents = await asyncio.gather(
+                *(loop.run_in_executor(self._executor, self._build_agent) for _ in range(self.workers))
+            )
+            self._session_aware = {id(agent): _accepts_session_id(agent) for agent in agents}
+            self._idle = asyncio.Queue()
+            for agent in agents:
+                self._idle.put_nowait(agent)
+            self._started = True
+
+    def _build_agent(self) -> Callable[[str], Any]:
+        agent = self.agent_factory()
+        if self.warmup_text:
+            warmup = getattr(agent, "warmup", agent)
+            try:
+                warmup(self.warmup_text)
+            except Exception as e:
+                msg = f"Agent warmup failed: {e}"
+                raise RuntimeError(msg) from e
+        return agent
+
+    async def close(self) -> None:
+        async with self._start_lock:
+            if not self._started:
+                return
+            self._started = False
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            idle, self._idle = self._idle, None
+            if idle is not None:
+                for _ in range(self._queued):
+                    idle.put_nowait(None)
+            self._sessions.clear()
+
+    async def submit(self, text: str, session_id: str | None = None) -> Any:
+        if not self._started:
+            await self.start()
+        if self._queued + self._in_flight >= self.max_queue_size:
+            self._rejected += 1
+            msg = f"Request queue is full ({self.max_queue_size} pending)"
+            raise QueueFullError(msg)
+
+        key = session_id or uuid.uuid4().hex
+        session = self._sessions.get(key)
+        if session is None:
+            session = self._sessions[key] = _Session()
+        session.pending += 1
+        self._queued += 1
+        waiting = True
+        enqueued = time.perf_counter()
+        try:
+            async with session.lock:
+                if session.tail is not None and not session.tail.done():
+                    await asyncio.wait({session.tail})
+                idle = self._idle
+                agent = await idle.get() if idle is not None else None
+                if agent is None or not self._started:
+                    msg = "Agent pool is shutting down"
+                    raise PoolClosedError(msg)
+                waiting = False
+                self._queued -= 1
+                self._in_flight += 1
+                started = time.perf_counter()
+                self._queue_latency.observe(started - enqueued)
+                try:
+                    result = await self._run(agent, text, session, session_id)
+                finally:
+                    self._in_flight -= 1
+            finished = time.perf_counter()
+            self._run_latency.observe(finished - started)
+            self._total_latency.observe(finished - enqueued)
+            self._completed += 1
+            return result
+        except BaseException:
+            if waiting:
+                self._queued -= 1
+            self._failed += 1
+            raise
+        finally:
+            session.pending -= 1
+            if session.tail is None or session.tail.done():
+                self._discard_session(key, session)
+            elif session.pending == 0:
+                session.tail.add_done_callback(lambda _: self._discard_session(key, session))
+
+    def _discard_session(self, key: str, session: _Session) -> None:
+        idle_tail = session.tail is None or session.tail.done()
+        if session.pending == 0 and idle_tail and self._sessions.get(key) is session:
+            del self._sessions[key]
+
+    async def _run(
+        self,
+        agent: Callable[[str], Any],
+        text: str,
+        session: _Session,
+        session_id: str | None,
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        call = functools.partial(agent, text)
+        if session_id is not None and self._session_aware.get(id(agent)):
+            call = functools.partial(agent, text, session_id=session_id)
+        future = loop.run_in_executor(self._executor, call)
+        idle = self._idle
+
+        def _release(_: asyncio.Future) -> None:
+            if idle is not None:
+                idle.put_nowait(agent)
+
+        future.add_done_callback(_release)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.request_timeout)
+        except TimeoutError:
+            session.tail = future
+            self._timed_out += 1
+            raise
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "idle_workers": self._idle.qsize() if self._idle is not None else 0,
+            "queue_depth": self._queued,
+            "in_flight": self._in_flight,
+            "max_queue_size": self.max_queue_size,
+            "active_sessions": len(self._sessions),
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "timed_out": self._timed_out,
+            "queue_latency": self._queue_latency.snapshot(),
+            "run_latency": self._run_latency.snapshot(),
+            "total_latency": self._total_latency.snapshot(),
+        }
@@ -0,0 +1,3 @@
+from robotagent.skills.index import Skill, SkillIndex
+
+__all__ = ["Skill", "SkillIndex"]
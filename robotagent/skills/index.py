@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import math
+import re
+import threading
+from collections.abc import Iterable
+from itertools import pairwise
+from pathlib import Path
+from typing import Any
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover - optional dependency
+    yaml = None
+
+from robotagent.models.embedding_model import EmbeddingModel
+
+_SKILL_FILE = "SKILL.md"
+_INTERFACE_FILE = Path("agents") / "openai.yaml"
+_FRONTMATTER = "---"
+_WORD = re.compile(r"[a-z0-9_]+|[\u3400-\u4dbf\u4e00-\u9fff]")
+_STOPWORDS = frozenset(
+    {"a", "an", "and", "or", "the", "to", "of", "in", "on", "for", "use", "when", "with", "this", "repo", "is", "it"}
+)
+
+
+_SUFFIXES = ("ing", "ed", "es", "s", "e")
+
+
+def _stem(token: str) -> str:
+    if len(token) > 4 and token.isascii():
+        for suffix in _SUFFIXES:
+            if token.endswith(suffix):
+                return token[: -len(suffix)]
+    return token
+
+
+def _tokenize(text: str) -> list[str]:
+    tokens = [_stem(token) for token in _WORD.findall(str(text or "").lower()) if token not in _STOPWORDS]
+    chars = [token for token in tokens if len(token) == 1 and not token.isascii()]
+    return tokens + [a + b for a, b in pairwise(chars)]
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class Skill:
+    __slots__ = ("description", "display_name", "name", "name_terms", "path", "short_description", "terms")
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        path: Path,
+        *,
+        display_name: str | None = None,
+        short_description: str | None = None,
+    ):
+        self.name = name
+        self.description = description
+        self.path = path
+        self.display_name = display_name or name
+        self.short_description = short_description or description
+        self.name_terms = set(_tokenize(f"{name} {self.display_name}"))
+        self.terms = self.name_terms | set(_tokenize(f"{description} {self.short_description}"))
+
+    def descriptor(self) -> str:
+        return f"- {self.name}: {self.short_description}"
+
+
+def _read_frontmatter(path: Path) -> tuple[dict[str, Any], int]:
+    lines: list[str] = []
+    offset = 0
+    with path.open(encoding="utf-8") as handle:
+        first = handle.readline()
+        offset += len(first.encode("utf-8"))
+        if first.strip() != _FRONTMATTER:
+            return {}, 0
+        for line in handle:
+            offset += len(line.encode("utf-8"))
+            if line.strip() == _FRONTMATTER:
+                break
+            lines.append(line)
+    if yaml is None:
+        data = {}
+        for line in lines:
+            key, sep, value = line.partition(":")
+            if sep:
+                data[key.strip()] = value.strip()
+        return data, offset
+    data = yaml.safe_load("".join(lines))
+    return (data if isinstance(data, dict) else {}), offset
+
+
+def _read_interface(skill_dir: Path) -> dict[str, Any]:
+    path = skill_dir / _INTERFACE_FILE
+    if yaml is None or not path.exists():
+        return {}
+    data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    interface = data.get("interface") if isinstance(data, dict) else None
+    return interface if isinstance(interface, dict) else {}
+
+
+class SkillIndex:
+    def __init__(self, skills: Iterable[Skill], embedding: EmbeddingModel | None = None):
+        self.skills: dict[str, Skill] = {skill.name: skill for skill in skills}
+        self.embedding = embedding
+        self._bodies: dict[str, str] = {}
+        self._offsets: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._idf = self._build_idf()
+        self._vectors: dict[str, list[float]] = {}
+        if embedding is not None and self.skills:
+            names = list(self.skills)
+            texts = [f"{self.skills[name].display_name}: {self.skills[name].description}" for name in names]
+            try:
+                self._vectors = dict(zip(names, embedding.embed_documents(texts)))
+            except Exception:  # noqa: BLE001
+                self._vectors = {}
+
+    @classmethod
+    def load(cls, root: str | Path | None = None, *, embedding: EmbeddingModel | None = None) -> SkillIndex:
+        root_path = Path(root) if root is not None else Path(__file__).resolve().parent
+        skills: list[Skill] = []
+        offsets: dict[str, int] = {}
+        for path in sorted(root_path.glob(f"*/{_SKILL_FILE}")):
+            meta, offset = _read_frontmatter(path)
+            interface = _read_interface(path.parent)
+            name = str(meta.get("name") or path.parent.name)
+            skill = Skill(
+                name,
+                str(meta.get("description") or ""),
+                path,
+                display_name=interface.get("display_name"),
+                short_description=interface.get("short_description"),
+            )
+            skills.append(skill)
+            offsets[name] = offset
+        index = cls(skills, embedding=embedding)
+        index._offsets = offsets
+        return index
+
+    def _build_idf(self) -> dict[str, float]:
+        total = len(self.skills)
+        df: dict[str, int] = {}
+        for skill in self.skills.values():
+            for term in skill.terms:
+                df[term] = df.get(term, 0) + 1
+        return {term: math.log(1 + (total - count + 0.5) / (count + 0.5)) for term, count in df.items()}
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def descriptors(self) -> str:
+        return "\n".join(skill.descriptor() for skill in self.skills.values())
+
+    def body(self, name: str) -> str:
+        body = self._bodies.get(name)
+        if body is not None:
+            return body
+        skill = self.skills[name]
+        with self._lock:
+            body = self._bodies.get(name)
+            if body is None:
+                with skill.path.open("rb") as handle:
+                    handle.seek(self._offsets.get(name, 0))
+                    body = handle.read().decode("utf-8").strip()
+                self._bodies[name] = body
+        return body
+
+    def _keyword_score(self, terms: set[str], skill: Skill) -> float:
+        matched = terms & skill.terms
+        if not matched:
+            return 0.0
+        score = sum(self._idf.get(term, 0.0) for term in matched)
+        score += sum(self._idf.get(term, 0.0) for term in matched & skill.name_terms)
+        best = 2 * sum(self._idf.get(term, 0.0) for term in terms) or 1.0
+        return score / best
+
+    def select(self, command: str, k: int = 2, *, min_score: float = 0.05) -> list[tuple[Skill, float]]:
+        if not self.skills or k <= 0:
+            return []
+        terms = set(_tokenize(command))
+        query_vector = None
+        if self._vectors:
+            try:
+                query_vector = self.embedding.embed_query(command)
+            except Exception:  # noqa: BLE001
+                query_vector = None
+        scored: list[tuple[Skill, float]] = []
+        for skill in self.skills.values():
+            score = self._keyword_score(terms, skill)
+            if query_vector is not None and skill.name in self._vectors:
+                score = 0.5 * score + 0.5 * max(0.0, _cosine(query_vector, self._vectors[skill.name]))
+            if score >= min_score:
+                scored.append((skill, score))
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:k]
+
+    def render(self, command: str, k: int = 2) -> str:
+        parts = [f"## Skill: {skill.name}\n{self.body(skill.name)}" for skill, _ in self.select(command, k)]
+        return "\n\n".join(parts)
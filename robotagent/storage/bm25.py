@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import json
+import math
+import re
+import threading
+from array import array
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+import numpy as np
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[-_./][a-z0-9]+)*|[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+_SPLIT = re.compile(r"[-_./]")
+_CJK_RUN = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]")
+_INDEX_FILE = "bm25.npz"
+_META_FILE = "bm25.json"
+
+
+def tokenize(text: str, *, unigrams: bool = True) -> list[str]:
+    tokens: list[str] = []
+    for match in _TOKEN.finditer(text.lower()):
+        token = match.group()
+        if _CJK_RUN.match(token):
+            if len(token) == 1 or unigrams:
+                tokens.extend(token)
+            if len(token) > 1:
+                tokens.extend(token[i : i + 2] for i in range(len(token) - 1))
+            continue
+        tokens.append(token)
+        parts = _SPLIT.split(token)
+        if len(parts) > 1:
+            tokens.extend(part for part in parts if part)
+    return tokens
+
+
+class BM25Index:
+    def __init__(
+        self,
+        k1: float = 1.2,
+        b: float = 0.75,
+        compact_threshold: float = 0.3,
+        max_df_ratio: float | None = None,
+    ):
+        self.k1 = k1
+        self.b = b
+        self.max_df_ratio = max_df_ratio
+        self.compact_threshold = compact_threshold
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._vocab: dict[str, int] = {}
+        self._postings: list[array] = []
+        self._frequencies: list[array] = []
+        self._df = array("i")
+        self._ids: list[str | None] = []
+        self._rows: dict[str, int] = {}
+        self._lengths = np.zeros(0, dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._doc_terms: list[array] = []
+        self._total_length = 0
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _term_id(self, term: str) -> int:
+        term_id = self._vocab.get(term)
+        if term_id is None:
+            term_id = len(self._vocab)
+            self._vocab[term] = term_id
+            self._postings.append(array("i"))
+            self._frequencies.append(array("H"))
+            self._df.append(0)
+        return term_id
+
+    def _reserve(self, extra: int) -> None:
+        needed = len(self._ids) + extra
+        if needed <= len(self._lengths):
+            return
+        capacity = max(needed, len(self._lengths) * 2, 1024)
+        lengths = np.zeros(capacity, dtype=np.float32)
+        lengths[: len(self._ids)] = self._lengths[: len(self._ids)]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: len(self._ids)] = self._alive[: len(self._ids)]
+        self._lengths, self._alive = lengths, alive
+
+    def _remove_row(self, row: int) -> None:
+        doc_id = self._ids[row]
+        if doc_id is None:
+            return
+        self._ids[row] = None
+        self._alive[row] = False
+        for term_id in self._doc_terms[row]:
+            self._df[term_id] -= 1
+        self._total_length -= int(self._lengths[row])
+        self._doc_terms[row] = array("i")
+        self._dead += 1
+
+    def add(self, ids: Sequence[str], texts: Sequence[str]) -> None:
+        tokenized = [tokenize(text) for text in texts]
+        with self._lock:
+            self._reserve(len(tokenized))
+            for doc_id, tokens in zip(ids, tokenized):
+                doc_id = str(doc_id)
+                previous = self._rows.get(doc_id)
+                if previous is not None:
+                    self._remove_row(previous)
+                row = len(self._ids)
+                counts: dict[int, int] = {}
+                for token in tokens:
+                    term_id = self._term_id(token)
+                    counts[term_id] = counts.get(term_id, 0) + 1
+                for term_id, count in counts.items():
+                    self._postings[term_id].append(row)
+                    self._frequencies[term_id].append(min(count, 65_535))
+                    self._df[term_id] += 1
+                self._ids.append(doc_id)
+                self._rows[doc_id] = row
+                self._lengths[row] = len(tokens)
+                self._alive[row] = True
+                self._doc_terms.append(array("i", counts))
+                self._total_length += len(tokens)
+
+    def delete(self, ids: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            for doc_id in ids:
+                row = self._rows.pop(str(doc_id), None)
+                if row is not None:
+                    self._remove_row(row)
+                    removed += 1
+            if self._ids and self._dead / len(self._ids) >= self.compact_threshold:
+                self.compact()
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def compact(self) -> None:
+        with self._lock:
+            keep = [row for row, doc_id in enumerate(self._ids) if doc_id is not None]
+            remap = np.full(len(self._ids), -1, dtype=np.int32)
+            remap[keep] = np.arange(len(keep), dtype=np.int32)
+            for term_id, postings in enumerate(self._postings):
+                rows = np.frombuffer(postings, dtype=np.int32).copy() if len(postings) else np.zeros(0, np.int32)
+                freqs = np.frombuffer(self._frequencies[term_id], dtype=np.uint16).copy() if len(rows) else None
+                mask = remap[rows] >= 0
+                self._postings[term_id] = array("i")
+                self._postings[term_id].frombytes(remap[rows][mask].astype(np.int32).tobytes())
+                self._frequencies[term_id] = array("H")
+                if freqs is not None:
+                    self._frequencies[term_id].frombytes(freqs[mask].tobytes())
+            self._ids = [self._ids[row] for row in keep]
+            self._lengths = self._lengths[keep]
+            self._alive = np.ones(len(keep), dtype=bool)
+            self._doc_terms = [self._doc_terms[row] for row in keep]
+            self._rows = {doc_id: row for row, doc_id in enumerate(self._ids)}
+            self._dead = 0
+
+    def _postings_for(self, term_id: int) -> tuple[np.ndarray, np.ndarray]:
+        rows = np.frombuffer(self._postings[term_id], dtype=np.int32).copy()
+        freqs = np.frombuffer(self._frequencies[term_id], dtype=np.uint16).astype(np.float32)
+        return rows, freqs
+
+    def _term_scores(self, term_id: int, live: int, average: float) -> tuple[np.ndarray, np.ndarray]:
+        df = self._df[term_id]
+        idf = math.log(1.0 + (live - df + 0.5) / (df + 0.5))
+        rows, freqs = self._postings_for(term_id)
+        norm = self.k1 * (1.0 - self.b + self.b * self._lengths[rows] / max(average, 1e-9))
+        return rows, idf * freqs * (self.k1 + 1.0) / (freqs + norm)
+
+    def search(self, query: str, k: int = 4) -> list[tuple[str, float]]:
+        terms = set(tokenize(query, unigrams=False))
+        with self._lock:
+            live = len(self._rows)
+            if not live or k <= 0:
+                return []
+            term_ids = [self._vocab[term] for term in terms if term in self._vocab and self._df[self._vocab[term]] > 0]
+            if not term_ids:
+                return []
+            if self.max_df_ratio is not None:
+                selective = [term_id for term_id in term_ids if self._df[term_id] <= self.max_df_ratio * live]
+                term_ids = selective or term_ids
+            average = self._total_length / live
+            if len(term_ids) == 1:
+                candidates, scores = self._term_scores(term_ids[0], live, average)
+                if self._dead:
+                    mask = self._alive[candidates]
+                    candidates, scores = candidates[mask], scores[mask]
+            else:
+                dense = np.zeros(len(self._ids), dtype=np.float32)
+                for term_id in term_ids:
+                    rows, contributions = self._term_scores(term_id, live, average)
+                    dense[rows] += contributions
+                candidates = np.flatnonzero(dense)
+                if self._dead:
+                    candidates = candidates[self._alive[candidates]]
+                scores = dense[candidates]
+            if len(candidates) > k:
+                top = np.argpartition(-scores, k - 1)[:k]
+                candidates, scores = candidates[top], scores[top]
+            order = np.argsort(-scores, kind="stable")
+            return [(self._ids[candidates[i]], float(scores[i])) for i in order]
+
+    def save(self, path: str | Path) -> Path:
+        target = Path(path)
+        target.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self.compact()
+            terms = sorted(self._vocab, key=self._vocab.__getitem__)
+            offsets = np.cumsum([0] + [len(postings) for postings in self._postings], dtype=np.int64)
+            rows = np.concatenate(
+                [np.frombuffer(p, dtype=np.int32) for p in self._postings if len(p)] or [np.zeros(0, np.int32)]
+            )
+            freqs = np.concatenate(
+                [np.frombuffer(f, dtype=np.uint16) for f in self._frequencies if len(f)] or [np.zeros(0, np.uint16)]
+            )
+            lengths = self._lengths[: len(self._ids)]
+            np.savez(target / _INDEX_FILE, offsets=offsets, rows=rows, freqs=freqs, lengths=lengths)
+            with (target / _META_FILE).open("w", encoding="utf-8") as handle:
+                json.dump(
+                    {"terms": terms, "ids": self._ids, "k1": self.k1, "b": self.b, "max_df_ratio": self.max_df_ratio},
+                    handle,
+                    ensure_ascii=False,
+                )
+        return target
+
+    @classmethod
+    def load(cls, path: str | Path) -> BM25Index:
+        source = Path(path)
+        with (source / _META_FILE).open(encoding="utf-8") as handle:
+            meta = json.load(handle)
+        index = cls(k1=meta["k1"], b=meta["b"], max_df_ratio=meta.get("max_df_ratio"))
+        with np.load(source / _INDEX_FILE) as data:
+            offsets, rows, freqs, lengths = data["offsets"], data["rows"], data["freqs"], data["lengths"]
+        index._ids = list(meta["ids"])
+        index._rows = {doc_id: row for row, doc_id in enumerate(index._ids)}
+        index._lengths = lengths.astype(np.float32)
+        index._alive = np.ones(len(index._ids), dtype=bool)
+        index._total_length = int(lengths.sum())
+        doc_terms: list[list[int]] = [[] for _ in index._ids]
+        for term_id, term in enumerate(meta["terms"]):
+            start, stop = int(offsets[term_id]), int(offsets[term_id + 1])
+            index._vocab[term] = term_id
+            postings = array("i")
+            postings.frombytes(rows[start:stop].astype(np.int32).tobytes())
+            frequencies = array("H")
+            frequencies.frombytes(freqs[start:stop].astype(np.uint16).tobytes())
+            index._postings.append(postings)
+            index._frequencies.append(frequencies)
+            index._df.append(stop - start)
+            for row in rows[start:stop].tolist():
+                doc_terms[row].append(term_id)
+        index._doc_terms = [array("i", terms) for terms in doc_terms]
+        return index
+
+    @classmethod
+    def exists(cls, path: str | Path) -> bool:
+        return (Path(path) / _INDEX_FILE).exists() and (Path(path) / _META_FILE).exists()
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import json
+import operator
+from array import array
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from typing import Any
+
+import numpy as np
+from langchain_core.documents import Document
+
+MetadataFilter = Mapping[str, Any]
+
+_COMPARISONS: dict[str, Callable[[Any, Any], bool]] = {
+    "$eq": operator.eq,
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+    "$lt": operator.lt,
+    "$lte": operator.le,
+}
+_NEGATIONS = {"$ne": "$eq", "$nin": "$in"}
+_MILVUS_OPERATORS = {
+    "$eq": "==",
+    "$ne": "!=",
+    "$gt": ">",
+    "$gte": ">=",
+    "$lt": "<",
+    "$lte": "<=",
+    "$in": "in",
+    "$nin": "not in",
+}
+_EMPTY = np.zeros(0, dtype=np.int64)
+
+
+def _conditions(condition: Any) -> list[tuple[str, Any]]:
+    if isinstance(condition, Mapping) and condition and all(str(key).startswith("$") for key in condition):
+        clauses = list(condition.items())
+    else:
+        clauses = [("$eq", condition)]
+    for op, _ in clauses:
+        if op not in _MILVUS_OPERATORS:
+            msg = f"Unsupported filter operator: {op}. Supported operators are: {', '.join(_MILVUS_OPERATORS)}"
+            raise ValueError(msg)
+    return clauses
+
+
+def _values(value: Any) -> list[Any]:
+    if isinstance(value, (list, tuple, set)):
+        return list(value)
+    return [value]
+
+
+def _intersect(left: np.ndarray, right: np.ndarray, size: int) -> np.ndarray:
+    if len(left) > len(right):
+        left, right = right, left
+    mask = np.zeros(size, dtype=bool)
+    mask[right] = True
+    return left[mask[left]]
+
+
+def _union(parts: Sequence[np.ndarray], size: int) -> np.ndarray:
+    mask = np.zeros(size, dtype=bool)
+    for part in parts:
+        mask[part] = True
+    return np.flatnonzero(mask)
+
+
+def _key(value: Any) -> tuple[str, Any] | None:
+    if value is None:
+        return ("none", None)
+    if isinstance(value, bool):
+        return ("bool", value)
+    if isinstance(value, (int, float)):
+        return ("number", value)
+    if isinstance(value, str):
+        return ("str", value)
+    return None
+
+
+def _same_kind(value: Any, target: Any) -> bool:
+    return isinstance(value, bool) == isinstance(target, bool)
+
+
+def _test(op: str, value: Any, target: Any) -> bool:
+    try:
+        if op == "$in":
+            return any(_same_kind(value, item) and value == item for item in target)
+        return _same_kind(value, target) and bool(_COMPARISONS[op](value, target))
+    except TypeError:
+        return False
+
+
+def _matches_condition(op: str, target: Any, metadata: Mapping[str, Any], field: str) -> bool:
+    value = metadata.get(field)
+    if target is None and op in ("$eq", "$ne"):
+        return (value is None) == (op == "$eq")
+    if value is None:
+        return False
+    if op in _NEGATIONS:
+        return not _matches_condition(_NEGATIONS[op], target, metadata, field)
+    return any(_test(op, item, target) for item in _values(value) if item is not None)
+
+
+def matches(filter: MetadataFilter, metadata: Mapping[str, Any]) -> bool:
+    for key, condition in filter.items():
+        if key == "$and":
+            if not all(matches(sub, metadata) for sub in condition):
+                return False
+        elif key == "$or":
+            if not any(matches(sub, metadata) for sub in condition):
+                return False
+        elif not all(_matches_condition(op, target, metadata, key) for op, target in _conditions(condition)):
+            return False
+    return True
+
+
+def to_callable(filter: MetadataFilter) -> Callable[[Document], bool]:
+    def predicate(document: Document) -> bool:
+        return matches(filter, document.metadata)
+
+    return predicate
+
+
+def _milvus_literal(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (list, tuple, set)):
+        return "[" + ", ".join(_milvus_literal(item) for item in value) + "]"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def to_milvus_expr(filter: MetadataFilter, *, field_template: str = "{field}") -> str:
+    clauses: list[str] = []
+    for key, condition in filter.items():
+        if key in ("$and", "$or"):
+            joiner = " and " if key == "$and" else " or "
+            parts = [to_milvus_expr(sub, field_template=field_template) for sub in condition]
+            clauses.append("(" + joiner.join(part for part in parts if part) + ")")
+            continue
+        field = field_template.format(field=key)
+        for op, target in _conditions(condition):
+            if target is None and op in ("$eq", "$ne"):
+                clauses.append(f"{field} is {'' if op == '$eq' else 'not '}null")
+            else:
+                clauses.append(f"{field} {_MILVUS_OPERATORS[op]} {_milvus_literal(target)}")
+    return " and ".join(clauses)
+
+
+class MetadataIndex:
+    def __init__(self, fields: Sequence[str] | None = None):
+        self.fields = set(fields) if fields is not None else None
+        self._postings: dict[str, dict[tuple[str, Any], array]] = {}
+        self._present: dict[str, array] = {}
+
+    def _indexed(self, field: str) -> bool:
+        return self.fields is None or field in self.fields
+
+    def add(self, row: int, metadata: Mapping[str, Any]) -> None:
+        for field, value in metadata.items():
+            if not self._indexed(field):
+                continue
+            self._present.setdefault(field, array("i")).append(row)
+            postings = self._postings.setdefault(field, {})
+            items = [None] if value is None else [item for item in _values(value) if item is not None]
+            for key in dict.fromkeys(_key(item) for item in items):
+                if key is not None:
+                    postings.setdefault(key, array("i")).append(row)
+
+    def rebuild(self, metadatas: Iterable[Mapping[str, Any]]) -> None:
+        self._postings = {}
+        self._present = {}
+        for row, metadata in enumerate(metadatas):
+            self.add(row, metadata)
+
+    @staticmethod
+    def _rows(parts: Sequence[array], size: int) -> np.ndarray:
+        if not parts:
+            return _EMPTY
+        rows = [np.frombuffer(part, dtype=np.int32).astype(np.int64) for part in parts]
+        merged = rows[0] if len(rows) == 1 else _union(rows, size)
+        return merged[merged < size]
+
+    def _lookup(self, field: str, values: Iterable[Any], size: int) -> np.ndarray:
+        postings = self._postings.get(field, {})
+        keys = [_key(value) for value in values]
+        return self._rows([postings[key] for key in keys if key is not None and key in postings], size)
+
+    def _field_rows(
+        self, field: str, op: str, target: Any, metadatas: Sequence[Mapping[str, Any]], size: int
+    ) -> np.ndarray:
+        if not self._indexed(field):
+            return np.asarray(
+                [row for row in range(size) if _matches_condition(op, target, metadatas[row], field)],
+                dtype=np.int64,
+            )
+        present = self._rows([self._present[field]] if field in self._present else [], size)
+        if op in _NEGATIONS:
+            keep = np.zeros(size, dtype=bool)
+            keep[present] = True
+            keep[self._lookup(field, [None], size)] = False
+            if target is not None:
+                keep[self._field_rows(field, _NEGATIONS[op], target, metadatas, size)] = False
+            return np.flatnonzero(keep)
+        if op == "$eq" and target is None:
+            missing = np.ones(size, dtype=bool)
+            missing[present] = False
+            return _union([np.flatnonzero(missing), self._lookup(field, [None], size)], size)
+        if op == "$eq":
+            return self._lookup(field, [target], size)
+        if op == "$in":
+            return self._lookup(field, [item for item in target if item is not None], size)
+        postings = self._postings.get(field, {})
+        return self._rows([rows for key, rows in postings.items() if _test(op, key[1], target)], size)
+
+    def select(self, filter: MetadataFilter, metadatas: Sequence[Mapping[str, Any]], size: int) -> np.ndarray:
+        result: np.ndarray | None = None
+        for key, condition in filter.items():
+            if key == "$and":
+                parts = [self.select(sub, metadatas, size) for sub in condition]
+            elif key == "$or":
+                subsets = [self.select(sub, metadatas, size) for sub in condition]
+                parts = [_union(subsets, size)]
+            else:
+                parts = [self._field_rows(key, op, target, metadatas, size) for op, target in _conditions(condition)]
+            for part in parts:
+                result = part if result is None else _intersect(result, part, size)
+        return np.arange(size, dtype=np.int64) if result is None else result
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from collections.abc import Hashable, Sequence
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Hashable]],
+    *,
+    k: int = 60,
+    weights: Sequence[float] | None = None,
+) -> list[tuple[Hashable, float]]:
+    if weights is not None and len(weights) != len(rankings):
+        msg = f"Got {len(weights)} weights for {len(rankings)} rankings"
+        raise ValueError(msg)
+    scores: dict[Hashable, float] = {}
+    for index, ranking in enumerate(rankings):
+        weight = 1.0 if weights is None else weights[index]
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + weight / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,4 @@
+from robotagent.storage.local.flat import FlatVectorStore
+from robotagent.storage.local.ivf import IVFVectorStore
+
+__all__ = ["FlatVectorStore", "IVFVectorStore"]
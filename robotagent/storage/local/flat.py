@@ -0,0 +1,616 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import uuid
+from collections.abc import Callable, Iterable, Sequence
+from pathlib import Path
+from typing import Any, Literal, NamedTuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore as BaseVectorStore
+
+from robotagent.models.embedding_model import EmbeddingModel
+from robotagent.storage.filters import MetadataIndex
+
+_VECTORS_FILE = "vectors.npy"
+_ALIVE_FILE = "alive.npy"
+_DOCS_FILE = "docs.json"
+_CODES_FILE = "codes.npy"
+_SCALES_FILE = "scales.npy"
+_SCORE_BLOCK = 4096
+_BATCH_SCORE_CELLS = 4_000_000
+_QUANTIZATIONS = ("int8", "float16")
+
+
+def _atomic_write(path: Path, write: Callable[[Any], None], mode: str = "wb") -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open(mode) as handle:
+        write(handle)
+    os.replace(tmp, path)
+
+
+def _copy_rows(target: np.ndarray, source: np.ndarray, rows: np.ndarray, offset: int = 0) -> None:
+    for start in range(0, len(rows), _SCORE_BLOCK):
+        block = rows[start : start + _SCORE_BLOCK]
+        target[offset + start : offset + start + len(block)] = source[block]
+
+
+class _Snapshot(NamedTuple):
+    vectors: np.ndarray
+    codes: np.ndarray | None
+    scales: np.ndarray | None
+    alive: np.ndarray
+    size: int
+    generation: int
+
+
+class FlatVectorStore(BaseVectorStore):
+    def __init__(
+        self,
+        embedding: EmbeddingModel,
+        *,
+        path: str | Path | None = None,
+        normalize: bool = True,
+        compact_threshold: float = 0.25,
+        initial_capacity: int = 1024,
+        quantization: Literal["int8", "float16"] | None = None,
+        rerank_factor: int = 4,
+        indexed_fields: Sequence[str] | None = None,
+    ):
+        if quantization is not None and quantization not in _QUANTIZATIONS:
+            msg = f"Unsupported quantization: {quantization}. Supported values are: {', '.join(_QUANTIZATIONS)}"
+            raise ValueError(msg)
+        self.embedding = embedding
+        self.path = Path(path) if path is not None else None
+        self.normalize = normalize
+        self.compact_threshold = compact_threshold
+        self.initial_capacity = max(1, initial_capacity)
+        self.quantization = quantization
+        self.rerank_factor = max(1, rerank_factor)
+        self._lock = threading.RLock()
+        self._compactor: threading.Thread | None = None
+        self._vectors: np.ndarray | None = None
+        self._codes: np.ndarray | None = None
+        self._scales: np.ndarray | None = None
+        self._alive = np.zeros(0, dtype=bool)
+        self._size = 0
+        self._dead = 0
+        self._generation = 0
+        self._ids: list[str] = []
+        self._texts: list[str] = []
+        self._metadatas: list[dict] = []
+        self._rows: dict[str, int] = {}
+        self._metadata_index = MetadataIndex(indexed_fields)
+        if self.path is not None and (self.path / _VECTORS_FILE).exists():
+            self.load(self.path)
+
+    @property
+    def embeddings(self) -> EmbeddingModel:
+        return self.embedding
+
+    def __len__(self) -> int:
+        return self._size - self._dead
+
+    @property
+    def dim(self) -> int | None:
+        return None if self._vectors is None else int(self._vectors.shape[1])
+
+    def _prepare(self, vectors: Sequence[Sequence[float]] | np.ndarray) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix[None, :]
+        if self.normalize and matrix.size:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix = matrix / norms
+        return np.ascontiguousarray(matrix, dtype=np.float32)
+
+    def _encode(self, matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray | None]:
+        if self.quantization == "float16":
+            return matrix.astype(np.float16), None
+        peak = np.abs(matrix).max(axis=1) if matrix.size else np.zeros(len(matrix), dtype=np.float32)
+        peak[peak == 0] = 1.0
+        scales = (peak / 127.0).astype(np.float32)
+        codes = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales
+
+    def _encode_all(self) -> None:
+        if self.quantization is None or self._vectors is None:
+            self._codes = self._scales = None
+            return
+        capacity, dim = self._vectors.shape
+        self._codes = np.empty((capacity, dim), dtype=np.float16 if self.quantization == "float16" else np.int8)
+        self._scales = np.ones(capacity, dtype=np.float32) if self.quantization == "int8" else None
+        for start in range(0, self._size, _SCORE_BLOCK):
+            stop = min(self._size, start + _SCORE_BLOCK)
+            codes, scales = self._encode(np.asarray(self._vectors[start:stop], dtype=np.float32))
+            self._codes[start:stop] = codes
+            if scales is not None:
+                self._scales[start:stop] = scales
+
+    def _allocate_vectors(self, capacity: int, dim: int) -> np.ndarray:
+        if self.quantization is None:
+            return np.empty((capacity, dim), dtype=np.float32)
+        directory = self.path if self.path is not None and self.path.is_dir() else None
+        with tempfile.TemporaryFile(dir=directory) as handle:
+            return np.memmap(handle, dtype=np.float32, mode="w+", shape=(capacity, dim))
+
+    def _reserve(self, extra: int, dim: int) -> None:
+        needed = self._size + extra
+        if self._vectors is None:
+            capacity = max(self.initial_capacity, needed)
+            self._vectors = self._allocate_vectors(capacity, dim)
+            self._alive = np.zeros(capacity, dtype=bool)
+            self._encode_all()
+            return
+        if self._vectors.shape[1] != dim:
+            msg = f"Embedding dimension {dim} does not match index dimension {self._vectors.shape[1]}"
+            raise ValueError(msg)
+        if needed <= self._vectors.shape[0] and self._vectors.flags.writeable:
+            return
+        capacity = max(needed, self._vectors.shape[0] * 2, self.initial_capacity)
+        vectors = self._allocate_vectors(capacity, dim)
+        _copy_rows(vectors, self._vectors, np.arange(self._size))
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: self._size] = self._alive[: self._size]
+        self._vectors, self._alive = vectors, alive
+        if self._codes is not None:
+            codes = np.empty((capacity, dim), dtype=self._codes.dtype)
+            codes[: self._size] = self._codes[: self._size]
+            self._codes = codes
+        if self._scales is not None:
+            scales = np.ones(capacity, dtype=np.float32)
+            scales[: self._size] = self._scales[: self._size]
+            self._scales = scales
+
+    def _tombstone(self, row: int) -> None:
+        if self._alive[row]:
+            self._alive[row] = False
+            self._dead += 1
+
+    def add_embeddings(
+        self,
+        texts: Sequence[str],
+        embeddings: Sequence[Sequence[float]] | np.ndarray,
+        metadatas: Sequence[dict] | None = None,
+        ids: Sequence[str] | None = None,
+        **kwargs: Any,
+    ) -> list[str]:
+        texts = list(texts)
+        matrix = self._prepare(embeddings)
+        if len(matrix) != len(texts):
+            msg = f"Got {len(matrix)} embeddings for {len(texts)} texts"
+            raise ValueError(msg)
+        ids = [str(i) for i in ids] if ids is not None else [str(uuid.uuid4()) for _ in texts]
+        metadatas = list(metadatas) if metadatas is not None else [{} for _ in texts]
+        if not texts:
+            return []
+        with self._lock:
+            self._reserve(len(texts), matrix.shape[1])
+            start = self._size
+            self._vectors[start : start + len(texts)] = matrix
+            self._alive[start : start + len(texts)] = True
+            if self._codes is not None:
+                codes, scales = self._encode(matrix)
+                self._codes[start : start + len(texts)] = codes
+                if scales is not None:
+                    self._scales[start : start + len(texts)] = scales
+            for offset, doc_id in enumerate(ids):
+                previous = self._rows.get(doc_id)
+                if previous is not None:
+                    self._tombstone(previous)
+                self._rows[doc_id] = start + offset
+            self._ids.extend(ids)
+            self._texts.extend(texts)
+            for offset, metadata in enumerate(metadatas):
+                metadata = dict(metadata or {})
+                self._metadatas.append(metadata)
+                self._metadata_index.add(start + offset, metadata)
+            self._size += len(texts)
+            self._after_add(start, matrix)
+        self._maybe_compact()
+        return ids
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: list[dict] | None = None,
+        *,
+        ids: list[str] | None = None,
+        **kwargs: Any,
+    ) -> list[str]:
+        texts = list(texts)
+        if not texts:
+            return []
+        return self.add_embeddings(texts, self.embedding.embed_documents(texts), metadatas, ids)
+
+    def add_documents(self, documents: list[Document], **kwargs: Any) -> list[str]:
+        ids = kwargs.pop("ids", None)
+        if ids is None and all(doc.id for doc in documents):
+            ids = [doc.id for doc in documents]
+        return self.add_texts(
+            [doc.page_content for doc in documents],
+            [dict(doc.metadata) for doc in documents],
+            ids=ids,
+        )
+
+    def delete(self, ids: list[str] | None = None, **kwargs: Any) -> bool | None:
+        if ids is None:
+            return False
+        removed = 0
+        with self._lock:
+            for doc_id in ids:
+                row = self._rows.pop(str(doc_id), None)
+                if row is not None:
+                    self._tombstone(row)
+                    removed += 1
+        self._maybe_compact()
+        return removed > 0
+
+    def get_by_ids(self, ids: Sequence[str], /) -> list[Document]:
+        with self._lock:
+            rows = [self._rows.get(str(doc_id)) for doc_id in ids]
+            return [self._document(row) for row in rows if row is not None]
+
+    def _document(self, row: int) -> Document:
+        return Document(id=self._ids[row], page_content=self._texts[row], metadata=dict(self._metadatas[row]))
+
+    def _maybe_compact(self) -> None:
+        if self._size == 0 or self._dead / self._size < self.compact_threshold:
+            return
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            self._compactor = threading.Thread(target=self.compact, name="flat-index-compact", daemon=True)
+            self._compactor.start()
+
+    def compact(self) -> int:
+        with self._lock:
+            if self._dead == 0 or self._vectors is None:
+                return 0
+            generation, size, source = self._generation, self._size, self._vectors
+            codes, scales = self._codes, self._scales
+            ids, texts, metadatas = self._ids, self._texts, self._metadatas
+            keep = np.flatnonzero(self._alive[:size])
+        dim = source.shape[1]
+        capacity = max(self.initial_capacity, len(keep))
+        vectors = self._allocate_vectors(capacity, dim)
+        _copy_rows(vectors, source, keep)
+        if codes is not None:
+            kept_codes = np.empty((capacity, dim), dtype=codes.dtype)
+            _copy_rows(kept_codes, codes, keep)
+            codes = kept_codes
+        if scales is not None:
+            kept_scales = np.ones(capacity, dtype=np.float32)
+            kept_scales[: len(keep)] = scales[keep]
+            scales = kept_scales
+        kept_ids = [ids[i] for i in keep]
+        kept_texts = [texts[i] for i in keep]
+        kept_metadatas = [metadatas[i] for i in keep]
+        rows = {doc_id: row for row, doc_id in enumerate(kept_ids)}
+        metadata_index = MetadataIndex(self._metadata_index.fields)
+        metadata_index.rebuild(kept_metadatas)
+
+        with self._lock:
+            if generation != self._generation:
+                return 0
+            current, current_size = (self._vectors, self._codes, self._scales, self._alive), self._size
+            tail = np.arange(size, current_size)
+            dropped = keep[~self._alive[keep]]
+            alive = np.zeros(capacity, dtype=bool)
+            alive[: len(keep)] = self._alive[keep]
+            self._vectors, self._codes, self._scales, self._alive = vectors, codes, scales, alive
+            self._size = len(keep)
+            if len(tail):
+                self._reserve(len(tail), dim)
+                _copy_rows(self._vectors, current[0], tail, len(keep))
+                if self._codes is not None:
+                    _copy_rows(self._codes, current[1], tail, len(keep))
+                if self._scales is not None:
+                    self._scales[len(keep) : len(keep) + len(tail)] = current[2][tail]
+                self._alive[len(keep) : len(keep) + len(tail)] = current[3][tail]
+                for offset, metadata in enumerate(self._metadatas[size:current_size]):
+                    metadata_index.add(len(keep) + offset, metadata)
+            for doc_id in {self._ids[row] for row in dropped.tolist()} | set(self._ids[size:current_size]):
+                row = self._rows.get(doc_id)
+                if row is None:
+                    rows.pop(doc_id, None)
+                elif row >= size:
+                    rows[doc_id] = len(keep) + row - size
+            self._ids = kept_ids + self._ids[size:current_size]
+            self._texts = kept_texts + self._texts[size:current_size]
+            self._metadatas = kept_metadatas + self._metadatas[size:current_size]
+            self._rows = rows
+            self._metadata_index = metadata_index
+            self._size = len(keep) + len(tail)
+            self._dead = int(self._size - self._alive[: self._size].sum())
+            self._generation += 1
+            self._after_compact(np.concatenate([keep, tail]))
+            return current_size - self._size
+
+    def _after_add(self, start: int, matrix: np.ndarray) -> None:
+        pass
+
+    def _after_compact(self, keep: np.ndarray) -> None:
+        pass
+
+    def _save_extra(self, target: Path) -> None:
+        pass
+
+    def _load_extra(self, source: Path) -> None:
+        pass
+
+    def memory_usage(self) -> dict[str, int]:
+        with self._lock:
+            resident = self._vectors is not None and not isinstance(self._vectors, np.memmap)
+            return {
+                "vectors": int(self._vectors.nbytes) if resident else 0,
+                "codes": int(self._codes.nbytes) if self._codes is not None else 0,
+                "scales": int(self._scales.nbytes) if self._scales is not None else 0,
+            }
+
+    def _snapshot(self) -> _Snapshot:
+        with self._lock:
+            if self._vectors is None:
+                empty = np.zeros((0, 0), dtype=np.float32)
+                return _Snapshot(empty, None, None, np.zeros(0, dtype=bool), 0, self._generation)
+            return _Snapshot(self._vectors, self._codes, self._scales, self._alive, self._size, self._generation)
+
+    def _top_k(self, scores: np.ndarray, k: int) -> np.ndarray:
+        if k >= len(scores):
+            order = np.argsort(-scores, kind="stable")
+        else:
+            candidates = np.argpartition(-scores, k - 1)[:k]
+            order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return order[np.isfinite(scores[order])]
+
+    def _approximate_scores(self, snapshot: _Snapshot, query: np.ndarray, rows: np.ndarray | None) -> np.ndarray:
+        count = snapshot.size if rows is None else len(rows)
+        scores = np.empty(count, dtype=np.float32)
+        for start in range(0, count, _SCORE_BLOCK):
+            stop = min(count, start + _SCORE_BLOCK)
+            block = slice(start, stop) if rows is None else rows[start:stop]
+            scores[start:stop] = snapshot.codes[block].astype(np.float32) @ query
+            if snapshot.scales is not None:
+                scores[start:stop] *= snapshot.scales[block]
+        return scores
+
+    def _rank(
+        self, snapshot: _Snapshot, query: np.ndarray, k: int, rows: np.ndarray | None = None
+    ) -> list[tuple[int, float]]:
+        if snapshot.codes is None:
+            scores = snapshot.vectors[: snapshot.size] @ query if rows is None else snapshot.vectors[rows] @ query
+        else:
+            scores = self._approximate_scores(snapshot, query, rows)
+        if rows is None:
+            scores[~snapshot.alive[: snapshot.size]] = -np.inf
+        if snapshot.codes is None:
+            order = self._top_k(scores, k)
+            positions = order if rows is None else rows[order]
+            return [(int(row), float(score)) for row, score in zip(positions, scores[order])]
+        order = self._top_k(scores, k * self.rerank_factor)
+        candidates = np.sort(order if rows is None else rows[order])
+        exact = np.asarray(snapshot.vectors[candidates], dtype=np.float32) @ query
+        best = self._top_k(exact, k)
+        return [(int(row), float(score)) for row, score in zip(candidates[best], exact[best])]
+
+    def _filter_rows(self, snapshot: _Snapshot, filter: Any) -> np.ndarray | None:
+        if not filter:
+            return None
+        with self._lock:
+            if callable(filter):
+                candidates = np.flatnonzero(snapshot.alive[: snapshot.size])
+                return np.asarray([row for row in candidates if filter(self._document(row))], dtype=np.int64)
+            rows = self._metadata_index.select(filter, self._metadatas, snapshot.size)
+        return rows[snapshot.alive[rows]]
+
+    def _search_vector(self, query: np.ndarray, k: int, **kwargs: Any) -> tuple[int, list[tuple[int, float]]]:
+        snapshot = self._snapshot()
+        if snapshot.size == 0 or k <= 0:
+            return snapshot.generation, []
+        rows = self._filter_rows(snapshot, kwargs.get("filter"))
+        if rows is not None and not len(rows):
+            return snapshot.generation, []
+        if rows is not None and len(rows) * 4 > snapshot.size:
+            alive = np.zeros(snapshot.size, dtype=bool)
+            alive[rows] = True
+            snapshot, rows = snapshot._replace(alive=alive), None
+        return snapshot.generation, self._rank(snapshot, query, k, rows)
+
+    def _search_vectors(
+        self, queries: np.ndarray, k: int, **kwargs: Any
+    ) -> tuple[int, list[list[tuple[int, float]]]]:
+        snapshot = self._snapshot()
+        if snapshot.size == 0 or k <= 0:
+            return snapshot.generation, [[] for _ in queries]
+        rows_filter = self._filter_rows(snapshot, kwargs.get("filter"))
+        total = snapshot.size if rows_filter is None else len(rows_filter)
+        if total == 0:
+            return snapshot.generation, [[] for _ in queries]
+        fetch = min(total, k if snapshot.codes is None else k * self.rerank_factor)
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        best_scores = np.zeros((len(queries), 0), dtype=np.float32)
+        block = max(_SCORE_BLOCK, _BATCH_SCORE_CELLS // max(1, len(queries)))
+        for start in range(0, total, block):
+            stop = min(total, start + block)
+            selected = np.arange(start, stop, dtype=np.int64) if rows_filter is None else rows_filter[start:stop]
+            index = slice(start, stop) if rows_filter is None else selected
+            if snapshot.codes is None:
+                scores = queries @ snapshot.vectors[index].T
+            else:
+                scores = queries @ snapshot.codes[index].astype(np.float32).T
+                if snapshot.scales is not None:
+                    scores *= snapshot.scales[index]
+            if rows_filter is None:
+                dead = np.flatnonzero(~snapshot.alive[start:stop])
+                if len(dead):
+                    scores[:, dead] = -np.inf
+            rows = np.broadcast_to(selected, scores.shape)
+            if best_scores.shape[1]:
+                scores = np.concatenate([best_scores, scores], axis=1)
+                rows = np.concatenate([best_rows, rows], axis=1)
+            if scores.shape[1] > fetch:
+                kth = scores.shape[1] - fetch
+                keep = np.argpartition(scores, kth, axis=1)[:, kth:]
+                scores = np.take_along_axis(scores, keep, axis=1)
+                rows = np.take_along_axis(rows, keep, axis=1)
+            best_scores, best_rows = scores, np.ascontiguousarray(rows)
+        results: list[list[tuple[int, float]]] = []
+        for query, rows, scores in zip(queries, best_rows, best_scores):
+            order = self._top_k(scores, len(scores))
+            rows, scores = rows[order], scores[order]
+            if snapshot.codes is not None and len(rows):
+                candidates = np.sort(rows)
+                exact = np.asarray(snapshot.vectors[candidates], dtype=np.float32) @ query
+                best = self._top_k(exact, k)
+                rows, scores = candidates[best], exact[best]
+            results.append([(int(row), float(score)) for row, score in zip(rows[:k], scores[:k])])
+        return snapshot.generation, results
+
+    def _search_batch(
+        self, embeddings: Sequence[Sequence[float]] | np.ndarray, k: int, **kwargs: Any
+    ) -> list[list[tuple[Document, float]]]:
+        queries = self._prepare(embeddings)
+        if not len(queries):
+            return []
+        generation, hits = self._search_vectors(queries, k, **kwargs)
+        with self._lock:
+            if generation != self._generation:
+                generation, hits = self._search_vectors(queries, k, **kwargs)
+            return [[(self._document(row), score) for row, score in query_hits] for query_hits in hits]
+
+    def _search(
+        self, embedding: Sequence[float] | np.ndarray, k: int, **kwargs: Any
+    ) -> list[tuple[Document, float]]:
+        query = self._prepare(embedding)[0]
+        generation, hits = self._search_vector(query, k, **kwargs)
+        with self._lock:
+            if generation != self._generation:
+                generation, hits = self._search_vector(query, k, **kwargs)
+            return [(self._document(row), score) for row, score in hits]
+
+    def similarity_search_with_score_by_vector(
+        self, embedding: list[float], k: int = 4, **kwargs: Any
+    ) -> list[tuple[Document, float]]:
+        return self._search(embedding, k, **kwargs)
+
+    def similarity_search_by_vector(self, embedding: list[float], k: int = 4, **kwargs: Any) -> list[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k, **kwargs)]
+
+    def similarity_search_with_score_by_vectors(
+        self, embeddings: Sequence[Sequence[float]], k: int = 4, **kwargs: Any
+    ) -> list[list[tuple[Document, float]]]:
+        return self._search_batch(embeddings, k, **kwargs)
+
+    def similarity_search_by_vectors(
+        self, embeddings: Sequence[Sequence[float]], k: int = 4, **kwargs: Any
+    ) -> list[list[Document]]:
+        return [
+            [doc for doc, _ in hits] for hits in self.similarity_search_with_score_by_vectors(embeddings, k, **kwargs)
+        ]
+
+    def similarity_search_with_vectors_by_vector(
+        self, embedding: Sequence[float] | np.ndarray, k: int = 4, **kwargs: Any
+    ) -> tuple[list[Document], np.ndarray]:
+        query = self._prepare(embedding)[0]
+        generation, hits = self._search_vector(query, k, **kwargs)
+        with self._lock:
+            if generation != self._generation:
+                generation, hits = self._search_vector(query, k, **kwargs)
+            rows = np.asarray([row for row, _ in hits], dtype=np.int64)
+            vectors = np.asarray(self._vectors[rows], dtype=np.float32) if len(rows) else np.zeros((0, len(query)))
+            return [self._document(int(row)) for row in rows], vectors
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> list[tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(self.embedding.embed_query(query), k, **kwargs)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> list[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        return self._cosine_relevance_score_fn
+
+    def save(self, path: str | Path | None = None) -> Path:
+        target = Path(path) if path is not None else self.path
+        if target is None:
+            raise ValueError("No path given to save the flat vector index")
+        target.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            if self._dead:
+                self.compact()
+            dim = self.dim or 0
+            vectors = self._vectors[: self._size] if self._vectors is not None else np.zeros((0, dim), np.float32)
+            alive = self._alive[: self._size]
+            docs = {"ids": self._ids, "texts": self._texts, "metadatas": self._metadatas, "normalize": self.normalize}
+            _atomic_write(target / _VECTORS_FILE, lambda handle: np.save(handle, vectors))
+            _atomic_write(target / _ALIVE_FILE, lambda handle: np.save(handle, alive))
+            _atomic_write(
+                target / _DOCS_FILE,
+                lambda handle: json.dump(docs, handle, ensure_ascii=False, default=str),
+                mode="w",
+            )
+            if self._codes is not None:
+                codes = self._codes[: self._size]
+                _atomic_write(target / _CODES_FILE, lambda handle: np.save(handle, codes))
+            if self._scales is not None:
+                scales = self._scales[: self._size]
+                _atomic_write(target / _SCALES_FILE, lambda handle: np.save(handle, scales))
+            self._save_extra(target)
+        self.path = target
+        return target
+
+    def load(self, path: str | Path | None = None, *, mmap: bool = True) -> None:
+        source = Path(path) if path is not None else self.path
+        if source is None:
+            raise ValueError("No path given to load the flat vector index")
+        vectors = np.load(source / _VECTORS_FILE, mmap_mode="r" if mmap else None)
+        alive = np.array(np.load(source / _ALIVE_FILE), dtype=bool)
+        with (source / _DOCS_FILE).open(encoding="utf-8") as handle:
+            docs = json.load(handle)
+        with self._lock:
+            self._vectors = vectors if len(vectors) else None
+            self._alive = alive
+            self._size = len(vectors)
+            self._dead = int(len(alive) - alive.sum())
+            self._ids = list(docs["ids"])
+            self._texts = list(docs["texts"])
+            self._metadatas = list(docs["metadatas"])
+            self.normalize = bool(docs.get("normalize", self.normalize))
+            self._rows = {doc_id: row for row, doc_id in enumerate(self._ids) if alive[row]}
+            self._metadata_index.rebuild(self._metadatas)
+            self._load_codes(source)
+            self._generation += 1
+            self._load_extra(source)
+        self.path = source
+
+    def _load_codes(self, source: Path) -> None:
+        codes_path = source / _CODES_FILE
+        expected = {"int8": np.int8, "float16": np.float16}.get(self.quantization or "")
+        if expected is None or self._vectors is None or not codes_path.exists():
+            self._encode_all()
+            return
+        codes = np.load(codes_path)
+        scales_path = source / _SCALES_FILE
+        if codes.dtype != expected or len(codes) != self._size or (expected is np.int8 and not scales_path.exists()):
+            self._encode_all()
+            return
+        self._codes = codes
+        self._scales = np.load(scales_path) if expected is np.int8 else None
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: list[str],
+        embedding: EmbeddingModel,
+        metadatas: list[dict] | None = None,
+        *,
+        ids: list[str] | None = None,
+        **kwargs: Any,
+    ) -> FlatVectorStore:
+        store = cls(embedding, **kwargs)
+        store.add_texts(texts, metadatas, ids=ids)
+        return store
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from array import array
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from robotagent.models.embedding_model import EmbeddingModel
+from robotagent.storage.local.flat import FlatVectorStore, _atomic_write, _Snapshot
+
+_IVF_FILE = "ivf.npz"
+
+
+def kmeans(
+    vectors: np.ndarray,
+    n_clusters: int,
+    *,
+    iterations: int = 20,
+    seed: int = 0,
+) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    n_clusters = min(n_clusters, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, vectors)
+        counts = np.bincount(assign, minlength=n_clusters)
+        empty = counts == 0
+        if empty.any():
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+            counts[empty] = 1
+        updated = sums / counts[:, None]
+        norms = np.linalg.norm(updated, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        updated = (updated / norms).astype(np.float32)
+        if np.allclose(updated, centroids, atol=1e-5):
+            centroids = updated
+            break
+        centroids = updated
+    return centroids
+
+
+class IVFVectorStore(FlatVectorStore):
+    def __init__(
+        self,
+        embedding: EmbeddingModel,
+        *,
+        nlist: int = 1024,
+        nprobe: int = 16,
+        train_size: int | None = None,
+        max_train_samples: int = 100_000,
+        kmeans_iterations: int = 20,
+        seed: int = 0,
+        **kwargs: Any,
+    ):
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_size = train_size or nlist * 39
+        self.max_train_samples = max_train_samples
+        self.kmeans_iterations = kmeans_iterations
+        self.seed = seed
+        self._centroids: np.ndarray | None = None
+        self._assign = array("i")
+        self._lists: list[array] = []
+        super().__init__(embedding, **kwargs)
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    def _rebuild_lists(self) -> None:
+        self._lists = [array("i") for _ in range(len(self._centroids))]
+        assign = np.frombuffer(self._assign, dtype=np.int32) if len(self._assign) else np.zeros(0, np.int32)
+        order = np.argsort(assign, kind="stable")
+        bounds = np.searchsorted(assign[order], np.arange(len(self._centroids) + 1))
+        for cluster in range(len(self._centroids)):
+            self._lists[cluster].frombytes(order[bounds[cluster] : bounds[cluster + 1]].astype(np.int32).tobytes())
+
+    def _assign_rows(self, matrix: np.ndarray) -> np.ndarray:
+        assign = np.empty(len(matrix), dtype=np.int32)
+        for start in range(0, len(matrix), 65_536):
+            block = matrix[start : start + 65_536]
+            assign[start : start + len(block)] = np.argmax(block @ self._centroids.T, axis=1)
+        return assign
+
+    def train(self) -> None:
+        with self._lock:
+            if self._size == 0:
+                return
+            alive = np.flatnonzero(self._alive[: self._size])
+            rng = np.random.default_rng(self.seed)
+            if len(alive) > self.max_train_samples:
+                alive = rng.choice(alive, self.max_train_samples, replace=False)
+            sample = np.asarray(self._vectors[alive], dtype=np.float32)
+            self._centroids = kmeans(
+                sample,
+                self.nlist,
+                iterations=self.kmeans_iterations,
+                seed=self.seed,
+            )
+            assign = self._assign_rows(np.asarray(self._vectors[: self._size], dtype=np.float32))
+            self._assign = array("i")
+            self._assign.frombytes(assign.tobytes())
+            self._rebuild_lists()
+            self._generation += 1
+
+    def _after_add(self, start: int, matrix: np.ndarray) -> None:
+        if self._centroids is None:
+            self._assign.extend([-1] * len(matrix))
+            if self._size - self._dead >= self.train_size:
+                self.train()
+            return
+        assign = self._assign_rows(matrix)
+        self._assign.frombytes(assign.tobytes())
+        for offset, cluster in enumerate(assign.tolist()):
+            self._lists[cluster].append(start + offset)
+
+    def _after_compact(self, keep: np.ndarray) -> None:
+        assign = np.frombuffer(self._assign, dtype=np.int32)[keep].copy()
+        self._assign = array("i")
+        self._assign.frombytes(assign.tobytes())
+        if self._centroids is not None:
+            self._rebuild_lists()
+
+    def _candidates(self, query: np.ndarray, nprobe: int) -> tuple[_Snapshot, np.ndarray]:
+        with self._lock:
+            snapshot = self._snapshot()
+            probe_scores = self._centroids @ query
+            nprobe = min(max(1, nprobe), len(self._centroids))
+            probes = np.argpartition(-probe_scores, nprobe - 1)[:nprobe]
+            rows = [np.array(self._lists[cluster], dtype=np.int64) for cluster in probes]
+        rows_array = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        return snapshot, rows_array[snapshot.alive[rows_array]]
+
+    def _search_vector(self, query: np.ndarray, k: int, **kwargs: Any) -> tuple[int, list[tuple[int, float]]]:
+        if self._centroids is None or kwargs.get("exact"):
+            return super()._search_vector(query, k, **kwargs)
+        snapshot, rows = self._candidates(query, kwargs.get("nprobe") or self.nprobe)
+        filtered = self._filter_rows(snapshot, kwargs.get("filter"))
+        if filtered is not None:
+            rows = filtered if len(filtered) <= len(rows) else rows[np.isin(rows, filtered, assume_unique=True)]
+        if k <= 0 or len(rows) == 0:
+            return snapshot.generation, []
+        return snapshot.generation, self._rank(snapshot, query, k, rows)
+
+    def _search_vectors(
+        self, queries: np.ndarray, k: int, **kwargs: Any
+    ) -> tuple[int, list[list[tuple[int, float]]]]:
+        if self._centroids is None or kwargs.get("exact"):
+            return super()._search_vectors(queries, k, **kwargs)
+        generation = self._generation
+        results: list[list[tuple[int, float]]] = []
+        for query in queries:
+            query_generation, hits = self._search_vector(query, k, **kwargs)
+            if query_generation != generation:
+                generation = -1
+            results.append(hits)
+        return generation, results
+
+    def _save_extra(self, target: Path) -> None:
+        if self._centroids is None:
+            return
+        assign = np.frombuffer(self._assign, dtype=np.int32)[: self._size]
+        _atomic_write(
+            target / _IVF_FILE,
+            lambda handle: np.savez(handle, centroids=self._centroids, assign=assign),
+        )
+
+    def _load_extra(self, source: Path) -> None:
+        path = source / _IVF_FILE
+        self._assign = array("i")
+        if not path.exists():
+            self._centroids = None
+            self._assign.extend([-1] * self._size)
+            return
+        with np.load(path) as data:
+            self._centroids = np.asarray(data["centroids"], dtype=np.float32)
+            self._assign.frombytes(np.asarray(data["assign"], dtype=np.int32).tobytes())
+        self._rebuild_lists()
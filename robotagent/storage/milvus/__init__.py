@@ -0,0 +1,7 @@
+from robotagent.storage.milvus.milvus import (
+    MilvusVectorStore,
+    close_clients,
+    get_client,
+)
+
+__all__ = ["MilvusVectorStore", "close_clients", "get_client"]
@@ -0,0 +1,443 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import threading
+import uuid
+import weakref
+from collections.abc import Callable, Iterable, Sequence
+from pathlib import Path
+from typing import Any
+
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore as BaseVectorStore
+
+from robotagent.configs.settings import StorageSettings, get_settings
+from robotagent.models.embedding_model import EmbeddingModel
+from robotagent.storage.filters import MetadataFilter, to_milvus_expr
+
+_ID_FIELD = "id"
+_VECTOR_FIELD = "vector"
+_TEXT_FIELD = "text"
+_METADATA_FIELD = "metadata"
+_OUTPUT_FIELDS = [_TEXT_FIELD, _METADATA_FIELD]
+_FILTER_TEMPLATE = _METADATA_FIELD + '["{field}"]'
+_MAX_ID_LENGTH = 512
+_MAX_TEXT_LENGTH = 65535
+
+_clients: dict[tuple[str, str, str], Any] = {}
+_async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple[str, str, str], Any]] = (
+    weakref.WeakKeyDictionary()
+)
+_clients_lock = threading.Lock()
+
+
+def is_lite_uri(uri: str) -> bool:
+    return "://" not in uri
+
+
+def resolve_uri(uri: str | None, lite_path: str) -> str:
+    uri = uri or lite_path
+    if not is_lite_uri(uri):
+        return uri
+    path = Path(uri).expanduser().resolve()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return str(path)
+
+
+def get_client(uri: str, *, token: str | None = None, db_name: str | None = None, timeout: float | None = None) -> Any:
+    key = (uri, token or "", db_name or "")
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            try:
+                from pymilvus import MilvusClient
+            except ImportError as e:
+                msg = "pymilvus is required for the milvus vector store. Install it with `pip install pymilvus`"
+                raise ImportError(msg) from e
+            client = MilvusClient(uri=uri, token=token or "", db_name=db_name or "", timeout=timeout)
+            _clients[key] = client
+        return client
+
+
+def get_async_client(
+    uri: str, *, token: str | None = None, db_name: str | None = None, timeout: float | None = None
+) -> Any:
+    loop = asyncio.get_running_loop()
+    key = (uri, token or "", db_name or "")
+    with _clients_lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            from pymilvus import AsyncMilvusClient
+
+            client = AsyncMilvusClient(uri=uri, token=token or "", db_name=db_name or "", timeout=timeout)
+            clients[key] = client
+        return client
+
+
+def close_clients() -> None:
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    if not clients:
+        return
+    from pymilvus import MilvusException
+
+    for client in clients:
+        with contextlib.suppress(MilvusException):
+            client.close()
+
+
+class MilvusVectorStore(BaseVectorStore):
+    def __init__(
+        self,
+        embedding: EmbeddingModel,
+        *,
+        collection_name: str | None = None,
+        uri: str | None = None,
+        token: str | None = None,
+        db_name: str | None = None,
+        dim: int | None = None,
+        index_type: str | None = None,
+        metric_type: str | None = None,
+        index_params: dict[str, Any] | None = None,
+        search_params: dict[str, Any] | None = None,
+        insert_batch_size: int | None = None,
+        consistency_level: str | None = None,
+        timeout: float | None = None,
+        drop_old: bool = False,
+        settings: StorageSettings | None = None,
+    ):
+        settings = settings or get_settings().storage
+        self.embedding = embedding
+        self.uri = resolve_uri(uri or settings.milvus_uri, settings.milvus_lite_path)
+        self.token = token if token is not None else settings.milvus_token
+        self.db_name = db_name if db_name is not None else settings.milvus_db_name
+        self.collection_name = collection_name or settings.milvus_collection
+        self.index_type = index_type or settings.milvus_index_type
+        self.metric_type = (metric_type or settings.milvus_metric_type).upper()
+        self.index_params = dict(index_params if index_params is not None else settings.milvus_index_params)
+        self.search_params = dict(search_params if search_params is not None else settings.milvus_search_params)
+        self.insert_batch_size = max(1, insert_batch_size or settings.milvus_insert_batch_size)
+        self.consistency_level = consistency_level or settings.milvus_consistency_level
+        self.timeout = timeout if timeout is not None else settings.milvus_timeout
+        self.client = get_client(self.uri, token=self.token, db_name=self.db_name, timeout=self.timeout)
+        self._lock = threading.Lock()
+        self._ready = False
+        if drop_old and self.client.has_collection(self.collection_name):
+            self.client.drop_collection(self.collection_name)
+        if dim is not None or self.client.has_collection(self.collection_name):
+            self._ensure_collection(dim)
+
+    @property
+    def embeddings(self) -> EmbeddingModel:
+        return self.embedding
+
+    @property
+    def is_lite(self) -> bool:
+        return is_lite_uri(self.uri)
+
+    def _ensure_collection(self, dim: int | None) -> None:
+        if self._ready:
+            return
+        with self._lock:
+            if self._ready:
+                return
+            if not self.client.has_collection(self.collection_name):
+                if dim is None:
+                    msg = f"Milvus collection {self.collection_name} does not exist and no vector dimension is known"
+                    raise ValueError(msg)
+                self._create_collection(dim)
+            self.client.load_collection(self.collection_name)
+            self._ready = True
+
+    def _exists(self) -> bool:
+        if not self._ready and self.client.has_collection(self.collection_name):
+            self._ensure_collection(None)
+        return self._ready
+
+    def _create_collection(self, dim: int) -> None:
+        from pymilvus import DataType, MilvusClient
+
+        schema = MilvusClient.create_schema(auto_id=False, enable_dynamic_field=False)
+        schema.add_field(_ID_FIELD, DataType.VARCHAR, is_primary=True, max_length=_MAX_ID_LENGTH)
+        schema.add_field(_VECTOR_FIELD, DataType.FLOAT_VECTOR, dim=dim)
+        schema.add_field(_TEXT_FIELD, DataType.VARCHAR, max_length=_MAX_TEXT_LENGTH)
+        schema.add_field(_METADATA_FIELD, DataType.JSON)
+        index_params = MilvusClient.prepare_index_params()
+        index_params.add_index(
+            field_name=_VECTOR_FIELD,
+            index_type=self.index_type,
+            metric_type=self.metric_type,
+            params=self.index_params,
+        )
+        self.client.create_collection(
+            self.collection_name,
+            schema=schema,
+            index_params=index_params,
+            consistency_level=self.consistency_level,
+            timeout=self.timeout,
+        )
+
+    def _rows(
+        self,
+        texts: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+        metadatas: Sequence[dict] | None,
+        ids: Sequence[str],
+    ) -> list[dict[str, Any]]:
+        return [
+            {
+                _ID_FIELD: ids[i],
+                _VECTOR_FIELD: [float(value) for value in embeddings[i]],
+                _TEXT_FIELD: texts[i],
+                _METADATA_FIELD: dict(metadatas[i] or {}) if metadatas else {},
+            }
+            for i in range(len(texts))
+        ]
+
+    def _write(self, rows: list[dict[str, Any]], upsert: bool) -> None:
+        write = self.client.upsert if upsert else self.client.insert
+        write(self.collection_name, rows, timeout=self.timeout)
+
+    def add_embeddings(
+        self,
+        texts: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+        metadatas: Sequence[dict] | None = None,
+        ids: Sequence[str] | None = None,
+        **kwargs: Any,
+    ) -> list[str]:
+        texts = list(texts)
+        embeddings = list(embeddings)
+        if len(embeddings) != len(texts):
+            msg = f"Got {len(embeddings)} embeddings for {len(texts)} texts"
+            raise ValueError(msg)
+        if not texts:
+            return []
+        upsert = ids is not None
+        ids = [str(i) for i in ids] if ids is not None else [str(uuid.uuid4()) for _ in texts]
+        metadatas = list(metadatas) if metadatas is not None else None
+        self._ensure_collection(len(embeddings[0]))
+        for start in range(0, len(texts), self.insert_batch_size):
+            stop = start + self.insert_batch_size
+            self._write(
+                self._rows(
+                    texts[start:stop],
+                    embeddings[start:stop],
+                    metadatas[start:stop] if metadatas else None,
+                    ids[start:stop],
+                ),
+                upsert,
+            )
+        return ids
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: list[dict] | None = None,
+        *,
+        ids: list[str] | None = None,
+        **kwargs: Any,
+    ) -> list[str]:
+        texts = list(texts)
+        if not texts:
+            return []
+        upsert = ids is not None
+        ids = [str(i) for i in ids] if ids is not None else [str(uuid.uuid4()) for _ in texts]
+        for start in range(0, len(texts), self.insert_batch_size):
+            stop = start + self.insert_batch_size
+            batch = texts[start:stop]
+            embeddings = self.embedding.embed_documents(batch)
+            self._ensure_collection(len(embeddings[0]))
+            self._write(
+                self._rows(batch, embeddings, metadatas[start:stop] if metadatas else None, ids[start:stop]),
+                upsert,
+            )
+        return ids
+
+    def add_documents(self, documents: list[Document], **kwargs: Any) -> list[str]:
+        ids = kwargs.pop("ids", None)
+        if ids is None and all(doc.id for doc in documents):
+            ids = [doc.id for doc in documents]
+        return self.add_texts(
+            [doc.page_content for doc in documents],
+            [dict(doc.metadata) for doc in documents],
+            ids=ids,
+        )
+
+    def delete(self, ids: list[str] | None = None, **kwargs: Any) -> bool | None:
+        if ids is None or not self._exists():
+            return False
+        ids = [str(doc_id) for doc_id in ids]
+        for start in range(0, len(ids), self.insert_batch_size):
+            batch = ids[start : start + self.insert_batch_size]
+            self.client.delete(self.collection_name, ids=batch, timeout=self.timeout)
+        return True
+
+    def get_by_ids(self, ids: Sequence[str], /) -> list[Document]:
+        if not ids or not self._exists():
+            return []
+        rows = self.client.get(
+            self.collection_name,
+            ids=[str(doc_id) for doc_id in ids],
+            output_fields=_OUTPUT_FIELDS,
+            timeout=self.timeout,
+        )
+        return [self._document(row) for row in rows]
+
+    def _document(self, row: dict[str, Any]) -> Document:
+        entity = row.get("entity", row)
+        return Document(
+            id=str(row.get(_ID_FIELD, entity.get(_ID_FIELD))),
+            page_content=entity.get(_TEXT_FIELD, ""),
+            metadata=dict(entity.get(_METADATA_FIELD) or {}),
+        )
+
+    def _expr(self, filter: MetadataFilter | None, expr: str | None) -> str:
+        clauses = [expr] if expr else []
+        if filter:
+            clauses.append(to_milvus_expr(filter, field_template=_FILTER_TEMPLATE))
+        if len(clauses) > 1:
+            return " and ".join(f"({clause})" for clause in clauses)
+        return "".join(clauses)
+
+    def _search_kwargs(
+        self,
+        k: int,
+        filter: MetadataFilter | None,
+        expr: str | None,
+        search_params: dict[str, Any] | None,
+        output_fields: list[str] = _OUTPUT_FIELDS,
+    ) -> dict[str, Any]:
+        return {
+            "collection_name": self.collection_name,
+            "filter": self._expr(filter, expr),
+            "limit": k,
+            "output_fields": output_fields,
+            "search_params": {"metric_type": self.metric_type, "params": dict(search_params or self.search_params)},
+            "anns_field": _VECTOR_FIELD,
+            "timeout": self.timeout,
+        }
+
+    def _hits(self, results: Iterable[Iterable[dict[str, Any]]]) -> list[list[tuple[Document, float]]]:
+        return [[(self._document(hit), float(hit["distance"])) for hit in hits] for hits in results]
+
+    def similarity_search_with_score_by_vectors(
+        self,
+        embeddings: Sequence[Sequence[float]],
+        k: int = 4,
+        *,
+        filter: MetadataFilter | None = None,
+        expr: str | None = None,
+        search_params: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> list[list[tuple[Document, float]]]:
+        embeddings = [[float(value) for value in vector] for vector in embeddings]
+        if not embeddings:
+            return []
+        if not self._exists():
+            return [[] for _ in embeddings]
+        results = self.client.search(data=embeddings, **self._search_kwargs(k, filter, expr, search_params))
+        return self._hits(results)
+
+    def similarity_search_by_vectors(
+        self, embeddings: Sequence[Sequence[float]], k: int = 4, **kwargs: Any
+    ) -> list[list[Document]]:
+        return [
+            [doc for doc, _ in hits] for hits in self.similarity_search_with_score_by_vectors(embeddings, k, **kwargs)
+        ]
+
+    def similarity_search_with_score_by_vector(
+        self, embedding: list[float], k: int = 4, **kwargs: Any
+    ) -> list[tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vectors([embedding], k, **kwargs)[0]
+
+    def similarity_search_by_vector(self, embedding: list[float], k: int = 4, **kwargs: Any) -> list[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k, **kwargs)]
+
+    def similarity_search_with_vectors_by_vector(
+        self,
+        embedding: list[float],
+        k: int = 4,
+        *,
+        filter: MetadataFilter | None = None,
+        expr: str | None = None,
+        search_params: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> tuple[list[Document], list[list[float]]]:
+        if not self._exists():
+            return [], []
+        results = self.client.search(
+            data=[[float(value) for value in embedding]],
+            **self._search_kwargs(k, filter, expr, search_params, [*_OUTPUT_FIELDS, _VECTOR_FIELD]),
+        )
+        hits = list(results[0]) if results else []
+        return [self._document(hit) for hit in hits], [hit["entity"][_VECTOR_FIELD] for hit in hits]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> list[tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(self.embedding.embed_query(query), k, **kwargs)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> list[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    async def asimilarity_search_with_score_by_vector(
+        self,
+        embedding: list[float],
+        k: int = 4,
+        *,
+        filter: MetadataFilter | None = None,
+        expr: str | None = None,
+        search_params: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> list[tuple[Document, float]]:
+        if self.is_lite:
+            return await asyncio.to_thread(
+                self.similarity_search_with_score_by_vector,
+                embedding,
+                k,
+                filter=filter,
+                expr=expr,
+                search_params=search_params,
+            )
+        if not await asyncio.to_thread(self._exists):
+            return []
+        client = get_async_client(self.uri, token=self.token, db_name=self.db_name, timeout=self.timeout)
+        results = await client.search(
+            data=[[float(value) for value in embedding]], **self._search_kwargs(k, filter, expr, search_params)
+        )
+        return self._hits(results)[0]
+
+    async def asimilarity_search_by_vector(self, embedding: list[float], k: int = 4, **kwargs: Any) -> list[Document]:
+        return [doc for doc, _ in await self.asimilarity_search_with_score_by_vector(embedding, k, **kwargs)]
+
+    async def asimilarity_search_with_score(
+        self, query: str, k: int = 4, **kwargs: Any
+    ) -> list[tuple[Document, float]]:
+        embedding = await self.embedding.aembed_query(query)
+        return await self.asimilarity_search_with_score_by_vector(embedding, k, **kwargs)
+
+    async def asimilarity_search(self, query: str, k: int = 4, **kwargs: Any) -> list[Document]:
+        return [doc for doc, _ in await self.asimilarity_search_with_score(query, k, **kwargs)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        if self.metric_type == "L2":
+            return self._euclidean_relevance_score_fn
+        if self.metric_type == "IP":
+            return self._max_inner_product_relevance_score_fn
+        return lambda score: (1.0 + score) / 2.0
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: list[str],
+        embedding: EmbeddingModel,
+        metadatas: list[dict] | None = None,
+        *,
+        ids: list[str] | None = None,
+        **kwargs: Any,
+    ) -> MilvusVectorStore:
+        store = cls(embedding, **kwargs)
+        store.add_texts(texts, metadatas, ids=ids)
+        return store
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def maximal_marginal_relevance(
+    query_embedding: Sequence[float] | np.ndarray,
+    embeddings: Sequence[Sequence[float]] | np.ndarray,
+    *,
+    k: int = 4,
+    lambda_mult: float = 0.5,
+    normalized: bool = False,
+) -> list[int]:
+    candidates = np.asarray(embeddings, dtype=np.float32)
+    if candidates.ndim != 2 or not len(candidates) or k <= 0:
+        return []
+    query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+    if not normalized:
+        candidates = _normalize(candidates)
+        query = _normalize(query)
+    count = min(k, len(candidates))
+    relevance = candidates @ query
+    redundancy = np.full(len(candidates), -np.inf, dtype=np.float32)
+    scores = relevance.copy()
+    selected: list[int] = []
+    for _ in range(count):
+        best = int(np.argmax(scores))
+        selected.append(best)
+        if len(selected) == count:
+            break
+        np.maximum(redundancy, candidates @ candidates[best], out=redundancy)
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * redundancy
+        scores[selected] = -np.inf
+    return selected
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any
+
+from robotagent.utils.lru import LRUCache
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(str(query or "").split()).casefold()
+
+
+def _freeze(value: Any) -> str:
+    if not value:
+        return ""
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+
+
+class QueryCache:
+    def __init__(
+        self,
+        *,
+        max_embeddings: int = 4096,
+        max_results: int = 1024,
+        embedding_ttl: float | None = None,
+        result_ttl: float | None = 600.0,
+    ):
+        self._embeddings = LRUCache(max_embeddings, embedding_ttl)
+        self._results = LRUCache(max_results, result_ttl)
+        self._lock = threading.Lock()
+        self._stats = {
+            "embedding_hits": 0,
+            "embedding_misses": 0,
+            "result_hits": 0,
+            "result_misses": 0,
+        }
+
+    def result_key(
+        self,
+        version: int,
+        query: str,
+        k: int,
+        filter: Mapping[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> tuple[Any, ...]:
+        return (version, normalize_query(query), k, _freeze(filter), _freeze(kwargs))
+
+    def get_results(self, key: tuple[Any, ...]) -> list[str] | None:
+        with self._lock:
+            ids = self._results.get(key)
+            self._stats["result_hits" if ids is not None else "result_misses"] += 1
+            return ids
+
+    def put_results(self, key: tuple[Any, ...], ids: Sequence[str]) -> None:
+        with self._lock:
+            self._results.put(key, list(ids))
+
+    def embed_queries(
+        self,
+        queries: Sequence[str],
+        embed: Callable[[list[str]], list[list[float]]],
+        method: str = "query",
+    ) -> list[list[float]]:
+        keys = [(method, normalize_query(query)) for query in queries]
+        found: dict[tuple[str, str], list[float]] = {}
+        with self._lock:
+            for key in keys:
+                if key not in found:
+                    vector = self._embeddings.get(key)
+                    if vector is not None:
+                        found[key] = vector
+            missing = [key for key in dict.fromkeys(keys) if key not in found]
+            self._stats["embedding_hits"] += len(keys) - len(missing)
+            self._stats["embedding_misses"] += len(missing)
+        if missing:
+            originals = dict(zip(keys, queries))
+            vectors = embed([originals[key] for key in missing])
+            found.update(zip(missing, vectors))
+            with self._lock:
+                for key, vector in zip(missing, vectors):
+                    self._embeddings.put(key, vector)
+        return [found[key] for key in keys]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._embeddings.clear()
+            self._results.clear()
+
+    def metrics(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._stats, "embeddings": len(self._embeddings), "results": len(self._results)}
@@ -1,23 +1,82 @@
-from typing import Any, Iterable
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Iterable, Sequence
 
+import numpy as np
 from langchain_core.documents import Document
 from langchain_core.vectorstores import VectorStore as BaseVectorStore
 from langchain_core.vectorstores import InMemoryVectorStore
-from langchain_milvus import Milvus
 
-from robotagent.models.embedding_model import EmbeddingModel
+from robotagent.configs.settings import StorageSettings, get_settings
+from robotagent.models.embedding_model import EmbeddingModel, embed_query_batch
+from robotagent.storage.bm25 import BM25Index
+from robotagent.storage.filters import MetadataFilter, matches, to_callable
+from robotagent.storage.fusion import reciprocal_rank_fusion
+from robotagent.storage.local import FlatVectorStore, IVFVectorStore
+from robotagent.storage.milvus import MilvusVectorStore
+from robotagent.storage.mmr import maximal_marginal_relevance
+from robotagent.storage.query_cache import QueryCache
 
 _SUPPORTED_VECTOR_STORE_TYPES = [
     "memory",
     "milvus",
+    "flat",
+    "ivf",
 ]
 
 class VectorStore:
-    def __init__(self, vector_store_type: str):
+    def __init__(
+        self,
+        vector_store_type: str,
+        embedding: EmbeddingModel | None = None,
+        *,
+        lexical: bool = False,
+        query_cache: QueryCache | bool = False,
+        **kwargs: Any,
+    ):
         self.vector_store_type = vector_store_type
-        self.store = self._get_vector_store(vector_store_type)
+        self.embedding = embedding
+        self.store = self._get_vector_store(vector_store_type, embedding, **kwargs)
+        self.lexical = self._load_lexical_index() if lexical else None
+        self.query_cache = QueryCache() if query_cache is True else query_cache or None
+        self.version = 0
+        self._version_lock = threading.Lock()
+
+    @classmethod
+    def from_settings(
+        cls,
+        embedding: EmbeddingModel | None = None,
+        settings: StorageSettings | None = None,
+        **kwargs: Any,
+    ) -> "VectorStore":
+        settings = settings or get_settings().storage
+        if settings.vector_store == "milvus":
+            kwargs.setdefault("settings", settings)
+        return cls(settings.vector_store, embedding, **kwargs)
+
+    def _load_lexical_index(self) -> BM25Index:
+        path = getattr(self.store, "path", None)
+        if path is not None and BM25Index.exists(path):
+            return BM25Index.load(path)
+        return BM25Index()
+
+    def _record_write(self, ids: list[str], texts: Sequence[str]) -> list[str]:
+        if self.lexical is not None:
+            self.lexical.add(ids, texts)
+        self._bump_version()
+        return ids
 
-    def _get_vector_store(self, vector_store_type: str) -> BaseVectorStore:
+    def _bump_version(self) -> None:
+        with self._version_lock:
+            self.version += 1
+
+    def _get_vector_store(
+        self,
+        vector_store_type: str,
+        embedding: EmbeddingModel | None = None,
+        **kwargs: Any,
+    ) -> BaseVectorStore:
         if vector_store_type not in _SUPPORTED_VECTOR_STORE_TYPES:
             supported_vector_store_types = ", ".join(_SUPPORTED_VECTOR_STORE_TYPES)
             msg = (
@@ -27,9 +86,13 @@ class VectorStore:
             raise ValueError(msg)
 
         if vector_store_type == "memory":
-            return InMemoryVectorStore()
+            return InMemoryVectorStore(embedding=embedding, **kwargs)
         elif vector_store_type == "milvus":
-            return Milvus()
+            return MilvusVectorStore(embedding=embedding, **kwargs)
+        elif vector_store_type == "flat":
+            return FlatVectorStore(embedding=embedding, **kwargs)
+        elif vector_store_type == "ivf":
+            return IVFVectorStore(embedding=embedding, **kwargs)
         else:
             supported_vector_store_types = ", ".join(_SUPPORTED_VECTOR_STORE_TYPES)
             msg = (
@@ -42,7 +105,17 @@ class VectorStore:
         return _SUPPORTED_VECTOR_STORE_TYPES
 
     def embedding_model(self) -> EmbeddingModel | None:
-        return self.store.embedding_model()
+        return getattr(self.store, "embeddings", None) or self.embedding
+
+    def save(self, path: str | None = None) -> Any:
+        save = getattr(self.store, "save", None)
+        if not callable(save):
+            msg = f"Vector storage type {self.vector_store_type} does not support save()"
+            raise NotImplementedError(msg)
+        saved = save(path)
+        if self.lexical is not None:
+            self.lexical.save(Path(path) if path is not None else saved)
+        return saved
 
     def add_texts(
         self,
@@ -51,15 +124,228 @@ class VectorStore:
         ids: list[str] | None = None,
         **kwargs: Any,
     ) -> list[str]:
-        return self.store.add_texts(texts=texts, metadatas=metadatas, ids=ids, **kwargs)
+        texts = list(texts)
+        ids = self.store.add_texts(texts=texts, metadatas=metadatas, ids=ids, **kwargs)
+        return self._record_write(ids, texts)
+
+    def add_embeddings(
+        self,
+        texts: Sequence[str],
+        embeddings: Sequence[list[float]],
+        metadatas: list[dict] | None = None,
+        ids: list[str] | None = None,
+        **kwargs: Any,
+    ) -> list[str]:
+        texts = list(texts)
+        add_embeddings = getattr(self.store, "add_embeddings", None)
+        if callable(add_embeddings):
+            ids = add_embeddings(
+                texts=texts,
+                embeddings=list(embeddings),
+                metadatas=metadatas,
+                ids=ids,
+                **kwargs,
+            )
+            return self._record_write(ids, texts)
+        if isinstance(self.store, InMemoryVectorStore):
+            ids = list(ids) if ids is not None else [str(uuid.uuid4()) for _ in texts]
+            for i, (text, vector) in enumerate(zip(texts, embeddings)):
+                self.store.store[ids[i]] = {
+                    "id": ids[i],
+                    "vector": list(vector),
+                    "text": text,
+                    "metadata": metadatas[i] if metadatas else {},
+                }
+            return self._record_write(ids, texts)
+        ids = self.store.add_texts(texts=texts, metadatas=metadatas, ids=ids, **kwargs)
+        return self._record_write(ids, texts)
 
     def add_documents(self, documents: list[Document], **kwargs: Any) -> list[str]:
-        return self.store.add_documents(documents=documents, **kwargs)
+        ids = self.store.add_documents(documents=documents, **kwargs)
+        return self._record_write(ids, [doc.page_content for doc in documents])
 
     def delete(self, ids: list[str] | None = None, **kwargs: Any) -> bool | None:
-        return self.store.delete(ids=ids, **kwargs)
+        deleted = self.store.delete(ids=ids, **kwargs)
+        if self.lexical is not None:
+            if ids is None:
+                self.lexical.clear()
+            else:
+                self.lexical.delete(ids)
+        self._bump_version()
+        return deleted
+
+    def _filter_kwargs(self, filter: MetadataFilter | None) -> dict[str, Any]:
+        if not filter:
+            return {}
+        if isinstance(self.store, InMemoryVectorStore):
+            return {"filter": to_callable(filter)}
+        return {"filter": filter}
+
+    def _require_embedding(self) -> EmbeddingModel:
+        embedding = self.embedding_model()
+        if embedding is None:
+            msg = f"Vector storage type {self.vector_store_type} has no embedding model for query embedding"
+            raise ValueError(msg)
+        return embedding
+
+    def _embed_query(self, query: str) -> list[float]:
+        embedding = self._require_embedding()
+        if self.query_cache is None:
+            return embedding.embed_query(query)
+        return self.query_cache.embed_queries([query], lambda texts: [embedding.embed_query(texts[0])])[0]
+
+    def _embed_queries(self, queries: list[str]) -> list[list[float]]:
+        return embed_query_batch(self._require_embedding(), queries)
+
+    def _search_by_vectors(self, vectors: list[list[float]], k: int, **kwargs: Any) -> list[list[Document]]:
+        search_by_vectors = getattr(self.store, "similarity_search_by_vectors", None)
+        if callable(search_by_vectors):
+            return search_by_vectors(vectors, k=k, **kwargs)
+        return [self.store.similarity_search_by_vector(vector, k=k, **kwargs) for vector in vectors]
+
+    def _cached_results(self, key: tuple[Any, ...]) -> list[Document] | None:
+        ids = self.query_cache.get_results(key)
+        if ids is None:
+            return None
+        documents = self._documents_by_ids(ids)
+        if len(documents) != len(set(ids)):
+            return None
+        return [documents[doc_id] for doc_id in ids]
+
+    def _cache_results(self, key: tuple[Any, ...], documents: list[Document]) -> list[Document]:
+        if all(doc.id is not None for doc in documents):
+            self.query_cache.put_results(key, [str(doc.id) for doc in documents])
+        return documents
 
     def similarity_search(
-        self, query: str, k: int = 4, **kwargs: Any
+        self, query: str, k: int = 4, filter: MetadataFilter | None = None, **kwargs: Any
+    ) -> list[Document]:
+        if self.query_cache is None:
+            return self.store.similarity_search(query=query, k=k, **self._filter_kwargs(filter), **kwargs)
+        key = self.query_cache.result_key(self.version, query, k, filter, **kwargs)
+        cached = self._cached_results(key)
+        if cached is not None:
+            return cached
+        vector = self._embed_query(query)
+        documents = self.store.similarity_search_by_vector(vector, k=k, **self._filter_kwargs(filter), **kwargs)
+        return self._cache_results(key, documents)
+
+    def similarity_search_batch(
+        self, queries: Sequence[str], k: int = 4, filter: MetadataFilter | None = None, **kwargs: Any
+    ) -> list[list[Document]]:
+        queries = list(queries)
+        if not queries:
+            return []
+        search_kwargs = {**kwargs, **self._filter_kwargs(filter)}
+        if self.query_cache is None:
+            return self._search_by_vectors(self._embed_queries(queries), k, **search_kwargs)
+        keys = [self.query_cache.result_key(self.version, query, k, filter, **kwargs) for query in queries]
+        results: list[list[Document] | None] = [self._cached_results(key) for key in keys]
+        pending = [i for i, result in enumerate(results) if result is None]
+        if pending:
+            vectors = self.query_cache.embed_queries([queries[i] for i in pending], self._embed_queries)
+            for i, documents in zip(pending, self._search_by_vectors(vectors, k, **search_kwargs)):
+                results[i] = self._cache_results(keys[i], documents)
+        return [result or [] for result in results]
+
+    def _candidates_with_vectors(
+        self, vector: list[float], fetch_k: int, filter: MetadataFilter | None, **kwargs: Any
+    ) -> tuple[list[Document], np.ndarray] | None:
+        kwargs.update(self._filter_kwargs(filter))
+        search_with_vectors = getattr(self.store, "similarity_search_with_vectors_by_vector", None)
+        if callable(search_with_vectors):
+            documents, vectors = search_with_vectors(vector, k=fetch_k, **kwargs)
+            return documents, np.asarray(vectors, dtype=np.float32)
+        if not isinstance(self.store, InMemoryVectorStore):
+            return None
+        documents = self.store.similarity_search_by_vector(vector, k=fetch_k, **kwargs)
+        vectors = [self.store.store[str(doc.id)]["vector"] for doc in documents]
+        return documents, np.asarray(vectors, dtype=np.float32)
+
+    def max_marginal_relevance_search_by_vector(
+        self,
+        embedding: list[float],
+        k: int = 4,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        filter: MetadataFilter | None = None,
+        **kwargs: Any,
+    ) -> list[Document]:
+        candidates = self._candidates_with_vectors(embedding, max(fetch_k, k), filter, **kwargs)
+        if candidates is None:
+            return self.store.max_marginal_relevance_search_by_vector(
+                embedding, k=k, fetch_k=fetch_k, lambda_mult=lambda_mult, **self._filter_kwargs(filter), **kwargs
+            )
+        documents, vectors = candidates
+        if not documents:
+            return []
+        selected = maximal_marginal_relevance(embedding, vectors, k=k, lambda_mult=lambda_mult)
+        return [documents[i] for i in selected]
+
+    def max_marginal_relevance_search(
+        self,
+        query: str,
+        k: int = 4,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        filter: MetadataFilter | None = None,
+        **kwargs: Any,
+    ) -> list[Document]:
+        return self.max_marginal_relevance_search_by_vector(
+            self._embed_query(query), k, fetch_k, lambda_mult, filter, **kwargs
+        )
+
+    def _require_lexical(self) -> BM25Index:
+        if self.lexical is None:
+            msg = f"Lexical search requires creating the {self.vector_store_type} vector store with lexical=True"
+            raise ValueError(msg)
+        return self.lexical
+
+    def _documents_by_ids(self, ids: Sequence[str]) -> dict[str, Document]:
+        if not ids:
+            return {}
+        documents = self.store.get_by_ids(list(ids))
+        return {str(doc.id): doc for doc in documents if doc.id is not None}
+
+    def _lexical_hits(self, query: str, k: int, filter: MetadataFilter | None) -> list[Document]:
+        lexical = self._require_lexical()
+        fetch = k if not filter else k * 4
+        while True:
+            hits = lexical.search(query, fetch)
+            documents = self._documents_by_ids([doc_id for doc_id, _ in hits])
+            found = [documents[doc_id] for doc_id, _ in hits if doc_id in documents]
+            if filter:
+                found = [doc for doc in found if matches(filter, doc.metadata)]
+            if len(found) >= k or len(hits) < fetch:
+                return found[:k]
+            fetch *= 2
+
+    def lexical_search(self, query: str, k: int = 4, filter: MetadataFilter | None = None) -> list[Document]:
+        return self._lexical_hits(query, k, filter)
+
+    def hybrid_search(
+        self,
+        query: str,
+        k: int = 4,
+        *,
+        fetch_k: int | None = None,
+        rrf_k: int = 60,
+        dense_weight: float = 1.0,
+        lexical_weight: float = 1.0,
+        filter: MetadataFilter | None = None,
+        **kwargs: Any,
     ) -> list[Document]:
-        return self.store.similarity_search(query=query, k=k, **kwargs)
+        self._require_lexical()
+        fetch_k = fetch_k or max(k * 4, 20)
+        dense_docs = self.similarity_search(query, fetch_k, filter, **kwargs)
+        documents = {str(doc.id or doc.page_content): doc for doc in dense_docs}
+        dense_ids = list(documents)
+        lexical_docs = self._lexical_hits(query, fetch_k, filter)
+        for doc in lexical_docs:
+            documents.setdefault(str(doc.id), doc)
+        fused = reciprocal_rank_fusion(
+            [dense_ids, [str(doc.id) for doc in lexical_docs]],
+            k=rrf_k,
+            weights=[dense_weight, lexical_weight],
+        )[:k]
+        return [documents[key] for key, _ in fused]
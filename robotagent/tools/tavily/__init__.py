@@ -0,0 +1,6 @@
+from robotagent.tools.tavily.tavily_search import (
+    TavilySearch,
+    create_tavily_search_tool,
+)
+
+__all__ = ["TavilySearch", "create_tavily_search_tool"]
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any
+
+from langchain_core.tools import BaseTool, StructuredTool
+
+from robotagent.configs.settings import TavilySettings, get_settings
+from robotagent.storage.query_cache import normalize_query
+
+
+class TavilySearch:
+    def __init__(
+        self,
+        api_key: str | None = None,
+        *,
+        base_url: str | None = None,
+        client: Any | None = None,
+        max_results: int | None = None,
+        search_depth: str | None = None,
+        cache_ttl: float | None = None,
+        stale_ttl: float | None = None,
+        cache_size: int | None = None,
+        max_concurrency: int | None = None,
+        timeout: float | None = None,
+        settings: TavilySettings | None = None,
+    ):
+        settings = settings or get_settings().tavily
+        self.max_results = max_results or settings.max_results
+        self.search_depth = search_depth or settings.search_depth
+        self.cache_ttl = settings.cache_ttl if cache_ttl is None else cache_ttl
+        self.stale_ttl = settings.stale_ttl if stale_ttl is None else stale_ttl
+        self.cache_size = settings.cache_size if cache_size is None else cache_size
+        self.timeout = settings.timeout if timeout is None else timeout
+        self.client = client or self._create_client(api_key or settings.api_key, base_url or settings.base_url)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_concurrency or settings.max_concurrency), thread_name_prefix="tavily-search"
+        )
+        self._cache: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "requests": 0, "errors": 0, "timeouts": 0, "stale": 0}
+
+    @staticmethod
+    def _create_client(api_key: str | None, base_url: str | None) -> Any:
+        try:
+            from tavily import TavilyClient
+        except ImportError as e:
+            msg = "tavily-python is required for web search. Install it with `pip install tavily-python`"
+            raise ImportError(msg) from e
+        return TavilyClient(api_key=api_key, api_base_url=base_url)
+
+    def _options(self, options: dict[str, Any]) -> dict[str, Any]:
+        return {"max_results": self.max_results, "search_depth": self.search_depth, **options}
+
+    def _key(self, query: str, options: dict[str, Any]) -> str:
+        return json.dumps([normalize_query(query), options], sort_keys=True, ensure_ascii=False, default=str)
+
+    def _record(self, **deltas: int) -> None:
+        with self._lock:
+            for key, value in deltas.items():
+                self._stats[key] += value
+
+    def _lookup(self, key: str, max_age: float) -> dict[str, Any] | None:
+        entry = self._cache.get(key)
+        if entry is None or time.monotonic() - entry[0] > max_age:
+            return None
+        self._cache.move_to_end(key)
+        return entry[1]
+
+    def _store(self, key: str, result: dict[str, Any]) -> None:
+        with self._lock:
+            self._cache[key] = (time.monotonic(), result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _fetch(self, key: str, query: str, options: dict[str, Any]) -> dict[str, Any]:
+        try:
+            self._record(requests=1)
+            result = self.client.search(query, timeout=self.timeout, **options)
+            self._store(key, result)
+            return result
+        except Exception:
+            self._record(errors=1)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def search(self, query: str, **options: Any) -> dict[str, Any]:
+        if not normalize_query(query):
+            raise ValueError("Search query must not be empty")
+        options = self._options(options)
+        key = self._key(query, options)
+        with self._lock:
+            cached = self._lookup(key, self.cache_ttl)
+            if cached is not None:
+                self._stats["hits"] += 1
+                return cached
+            future = self._inflight.get(key)
+            if future is None:
+                self._stats["misses"] += 1
+                future = self._executor.submit(self._fetch, key, query, options)
+                self._inflight[key] = future
+            else:
+                self._stats["coalesced"] += 1
+        try:
+            return future.result(timeout=self.timeout)
+        except Exception as e:
+            if isinstance(e, FutureTimeoutError):
+                self._record(timeouts=1)
+            with self._lock:
+                stale = self._lookup(key, self.stale_ttl)
+            if stale is None:
+                msg = f"Tavily search failed for query {query!r}: {e or type(e).__name__}"
+                raise RuntimeError(msg) from e
+            self._record(stale=1)
+            return {**stale, "stale": True}
+
+    def render(self, query: str, **options: Any) -> str:
+        result = self.search(query, **options)
+        lines: list[str] = []
+        if result.get("answer"):
+            lines.append(str(result["answer"]))
+        for item in result.get("results") or []:
+            lines.append(f"- {item.get('title', '')} ({item.get('url', '')})\n  {item.get('content', '')}")
+        if result.get("stale"):
+            lines.append("(cached result; live search unavailable)")
+        return "\n".join(lines) or "No results."
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def metrics(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._stats, "size": len(self._cache), "inflight": len(self._inflight)}
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def create_tavily_search_tool(searcher: TavilySearch | None = None, **kwargs: Any) -> BaseTool:
+    searcher = searcher or TavilySearch(**kwargs)
+
+    def tavily_search(query: str) -> str:
+        try:
+            return searcher.render(query)
+        except (RuntimeError, ValueError) as e:
+            return f"Web search unavailable: {e}"
+
+    return StructuredTool.from_function(
+        func=tavily_search,
+        name="tavily_search",
+        description="Search the web for up-to-date information about robots, parts, and procedures.",
+    )
@@ -5,10 +5,24 @@ from .env import (
     get_float_env,
     get_str_env,
 )
+from .lru import LRUCache
+from .tokens import (
+    TokenCounter,
+    count_tokens,
+    count_tokens_batch,
+    estimate_tokens,
+    get_tokenizer,
+)
 
 __all__ = [
     "get_bool_env",
     "get_int_env",
     "get_float_env",
     "get_str_env",
+    "LRUCache",
+    "TokenCounter",
+    "count_tokens",
+    "count_tokens_batch",
+    "estimate_tokens",
+    "get_tokenizer",
 ]
\ No newline at end of file
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Any
+
+DEFAULT_ENCODING = "cl100k_base"
+
+_CJK = re.compile(r"[\u3000-\u303f\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff00-\uffef]")
+
+
+_TOKENIZERS: dict[str, Any] = {}
+_FAILURES: dict[str, float] = {}
+_RETRY_AFTER = 60.0
+_TOKENIZER_LOCK = threading.Lock()
+
+
+def get_tokenizer(encoding_name: str = DEFAULT_ENCODING) -> Any | None:
+    tokenizer = _TOKENIZERS.get(encoding_name)
+    if tokenizer is not None:
+        return tokenizer
+    with _TOKENIZER_LOCK:
+        tokenizer = _TOKENIZERS.get(encoding_name)
+        if tokenizer is not None:
+            return tokenizer
+        failed = _FAILURES.get(encoding_name)
+        if failed is not None and time.monotonic() - failed < _RETRY_AFTER:
+            return None
+        try:
+            import tiktoken
+
+            tokenizer = tiktoken.get_encoding(encoding_name)
+        except (ImportError, OSError, ValueError):
+            _FAILURES[encoding_name] = time.monotonic()
+            return None
+        _FAILURES.pop(encoding_name, None)
+        _TOKENIZERS[encoding_name] = tokenizer
+        return tokenizer
+
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    cjk = len(_CJK.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def count_tokens(text: str, encoding_name: str = DEFAULT_ENCODING) -> int:
+    if not text:
+        return 0
+    tokenizer = get_tokenizer(encoding_name)
+    if tokenizer is None:
+        return estimate_tokens(text)
+    return len(tokenizer.encode(text, disallowed_special=()))
+
+
+def count_tokens_batch(texts: Sequence[str], encoding_name: str = DEFAULT_ENCODING) -> list[int]:
+    tokenizer = get_tokenizer(encoding_name)
+    if tokenizer is None:
+        return [estimate_tokens(text) for text in texts]
+    return [len(tokens) for tokens in tokenizer.encode_batch(list(texts), disallowed_special=())]
+
+
+def _decode_utf8(pieces: Sequence[bytes]) -> str | None:
+    try:
+        return b"".join(pieces).decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+
+class TokenCounter:
+    def __init__(self, encoding_name: str = DEFAULT_ENCODING, *, cache_size: int = 65536):
+        self.encoding_name = encoding_name
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, int] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "batches": 0}
+
+    @property
+    def _tokenizer(self) -> Any | None:
+        return get_tokenizer(self.encoding_name)
+
+    def _encode(self, texts: list[str]) -> list[int]:
+        if self._tokenizer is None:
+            return [estimate_tokens(text) for text in texts]
+        if len(texts) == 1:
+            return [len(self._tokenizer.encode(texts[0], disallowed_special=()))]
+        return [len(tokens) for tokens in self._tokenizer.encode_batch(texts, disallowed_special=())]
+
+    def __call__(self, text: str) -> int:
+        return self.count_many([text])[0]
+
+    def count_many(self, texts: Sequence[str]) -> list[int]:
+        if self._tokenizer is None:
+            return [estimate_tokens(text) for text in texts]
+        known: dict[str, int] = {}
+        with self._lock:
+            for text in texts:
+                if text in known:
+                    continue
+                cached = self._cache.get(text)
+                if cached is not None:
+                    self._cache.move_to_end(text)
+                    known[text] = cached
+            missing = [text for text in dict.fromkeys(texts) if text not in known]
+            self._stats["hits"] += len(texts) - len(missing)
+            self._stats["misses"] += len(missing)
+        if missing:
+            encoded = self._encode(missing)
+            known.update(zip(missing, encoded))
+            with self._lock:
+                self._stats["batches"] += 1
+                for text, count in zip(missing, encoded):
+                    self._cache[text] = count
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return [known[text] for text in texts]
+
+    def split(self, text: str, size: int) -> list[str]:
+        if size <= 0:
+            raise ValueError("size must be positive")
+        if self._tokenizer is None:
+            return [text[i : i + size] for i in range(0, len(text), size)]
+        tokens = self._tokenizer.encode(text, disallowed_special=())
+        pieces = self._tokenizer.decode_tokens_bytes(tokens)
+        chunks: list[str] = []
+        start = 0
+        while start < len(pieces):
+            cut = min(len(pieces), start + size)
+            while cut > start + 1 and _decode_utf8(pieces[start:cut]) is None:
+                cut -= 1
+            while cut < len(pieces) and _decode_utf8(pieces[start:cut]) is None:
+                cut += 1
+            chunk = _decode_utf8(pieces[start:cut])
+            chunks.append(chunk if chunk is not None else b"".join(pieces[start:cut]).decode("utf-8", "replace"))
+            start = cut
+        return chunks
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def metrics(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._stats, "size": len(self._cache)}